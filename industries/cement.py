@@ -1,8 +1,11 @@
 """ Meta archivo de la industria del cemento """
 from math import inf
 
+import numpy as np
+
 # Constants
 NAME = "Cement industry"
+VERSION = "1.0.0"
 # Cement industry's constants
 LIMESTONE_PROPORTION = 1.035  # limestone proportion
 CLAY_PROPORTION = 0.375  # Clay proportion
@@ -37,6 +40,115 @@ UNITS = {
     "pm10_overall_emission": "kt"
 }
 
+# guaranteed bounds (min, max) of the values
+BOUNDS = {
+    "total_cement_production": (-inf, inf),
+    "limestone_demand": (-inf, inf),
+    "clay_demand": (-inf, inf),
+    "fuel_demand": (-inf, inf),
+    "water_demand": (-inf, inf),
+    "gypsum_demand": (-inf, inf),
+    "mechanical_energy": (-inf, inf),
+    "co2_overall_emissions": (-inf, inf),
+    "heat_overall_losses": (-inf, inf),
+    "pm10_overall_emission": (-inf, inf)
+}
+
+
+def _any(condition) -> bool:
+    """ whether a condition holds for a value or for any value of an array """
+    return bool(condition.any()) if hasattr(condition, "any") else bool(condition)
+
+
+def evaluate(
+    total_cement_production,
+    *,
+    LIMESTONE_PROPORTION=LIMESTONE_PROPORTION,
+    CLAY_PROPORTION=CLAY_PROPORTION,
+    MECHANICAL_ENERGY_PRE_PROPORTION=MECHANICAL_ENERGY_PRE_PROPORTION,
+    WATER_PROPORTION=WATER_PROPORTION,
+    FUEL_PROPORTION=FUEL_PROPORTION,
+    MECHANICAL_ENERGY_OVEN_PROPORTION=MECHANICAL_ENERGY_OVEN_PROPORTION,
+    GYPSUM_PROPORTION=GYPSUM_PROPORTION,
+    MECHANICAL_ENERGY_MILLING_PROPORTION=MECHANICAL_ENERGY_MILLING_PROPORTION,
+    CO2_EMISSIONS_PROPORTION=CO2_EMISSIONS_PROPORTION,
+    LIMESTONE_LOSSES=LIMESTONE_LOSSES,
+    CLAY_LOSSES=CLAY_LOSSES,
+    CEMENT_LOSSES=CEMENT_LOSSES,
+    CLINKER_LOSSES=CLINKER_LOSSES,
+    FUEL_HC=FUEL_HC,
+    ENERGY_LOSSES=ENERGY_LOSSES,
+) -> dict:
+    """ evaluate the Cement industry without creating an instance
+
+    The arguments can be floats or arrays of the same shape (e.g. NumPy
+    arrays), to evaluate many scenarios in one pass. The constants can be
+    replaced by keyword, also with arrays (e.g. a value per year).
+    """
+    if _any(total_cement_production < -inf) or _any(total_cement_production > inf):
+        raise ValueError(
+            "The production should be a value between -inf and inf"
+        )
+    limestone_demand = LIMESTONE_PROPORTION*total_cement_production
+    clay_demand = CLAY_PROPORTION*total_cement_production
+    mechanical_energy_pre = MECHANICAL_ENERGY_PRE_PROPORTION*total_cement_production
+    pm10_emission_pre = CLAY_LOSSES*clay_demand + LIMESTONE_LOSSES*limestone_demand
+    raw_mix = clay_demand + limestone_demand - pm10_emission_pre
+    fuel_demand = FUEL_PROPORTION*total_cement_production
+    water_demand = WATER_PROPORTION*total_cement_production
+    mechanical_energy_oven = MECHANICAL_ENERGY_OVEN_PROPORTION*total_cement_production
+    pm10_emission_oven = pm10_emission_pre
+    heat_losses_oven = ENERGY_LOSSES*FUEL_HC*fuel_demand
+    clinker_production_oven = raw_mix*(1 - CLINKER_LOSSES)
+    gypsum_demand = GYPSUM_PROPORTION*clinker_production_oven
+    mechanical_energy_milling = MECHANICAL_ENERGY_MILLING_PROPORTION*total_cement_production
+    cement_emission = CEMENT_LOSSES*(clinker_production_oven + gypsum_demand)
+    cement_production = (1 - CEMENT_LOSSES)*(clinker_production_oven + gypsum_demand)
+    mechanical_energy = mechanical_energy_milling + mechanical_energy_oven + mechanical_energy_pre
+    co2_overall_emissions = CO2_EMISSIONS_PROPORTION*total_cement_production
+    heat_overall_losses = heat_losses_oven
+    pm10_overall_emission = cement_emission + pm10_emission_oven + pm10_emission_pre
+    return {
+        "total_cement_production": total_cement_production,
+        "limestone_demand": limestone_demand,
+        "clay_demand": clay_demand,
+        "fuel_demand": fuel_demand,
+        "water_demand": water_demand,
+        "gypsum_demand": gypsum_demand,
+        "mechanical_energy": mechanical_energy,
+        "co2_overall_emissions": co2_overall_emissions,
+        "heat_overall_losses": heat_overall_losses,
+        "pm10_overall_emission": pm10_overall_emission,
+    }
+
+
+def profile(total_cement_production, dtype="float64", axis=-1, **constants) -> dict:
+    """ evaluate the Cement industry over time series
+
+    The arguments can be 1-D (e.g. 8760 hours or years) or 2-D (e.g. years
+    by hours) arrays, and every value is computed over the whole arrays at
+    once. With dtype="float32", the memory of the series is halved.
+
+    Returns the series of every value, with the same shape as the
+    arguments, and their totals and peaks along the time axis. The
+    constants can be replaced by keyword, as in evaluate.
+    """
+    args = [np.asarray(arg, dtype=dtype) for arg in (total_cement_production,)]
+    shape = np.broadcast_shapes(*(arg.shape for arg in args))
+    series = {
+        name: np.broadcast_to(np.asarray(value, dtype=dtype), shape)
+        for name, value in evaluate(*args, **constants).items()
+    }
+    return {
+        "series": series,
+        "totals": {
+            name: value.sum(axis=axis, dtype=dtype)
+            for name, value in series.items()
+        },
+        "peaks": {name: value.max(axis=axis) for name, value in series.items()},
+    }
+
+
 class Cement:
     """ Cement industry """
 
@@ -61,7 +173,7 @@ class Cement:
         self.__pm10_overall_emission = (self.__pm10_emission_pre + self.__pm10_emission_oven + self.__cement_emission)
 
     def __validate_total_production(self, total_cement_production) -> None:
-        if total_cement_production < -inf or total_cement_production > inf:
+        if _any(total_cement_production < -inf) or _any(total_cement_production > inf):
             raise ValueError(
                 "The production should be a value between -inf and inf"
             )
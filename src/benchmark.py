@@ -0,0 +1,480 @@
+"""IDR-IISIM benchmarks
+
+Measures the build time of the industries, per phase, and the throughput
+and the memory of the generated models, and compares the results with a
+baseline to find regressions:
+
+    python src/benchmark.py run --output results.json
+    python src/benchmark.py compare results.json
+"""
+
+import argparse
+import inspect
+import json
+import math
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from types import ModuleType
+from typing import Any, Callable, Optional
+
+import numpy as np
+
+from idr_iisim.utils.discovery import discover_industries
+from idr_iisim.utils.models_dict import Industry
+from idr_iisim.utils.synthetic import (
+    SyntheticSpec,
+    write_synthetic_industry,
+)
+from idr_iisim.utils.timing import PhaseTimer, timed
+from idr_iisim.utils.verification import load_module
+from main import generate_industry, load_industry
+
+# Baseline committed with the repository
+DEFAULT_BASELINE = os.path.join("tests", "benchmarks", "baseline.json")
+# Processes of the synthetic industries
+DEFAULT_SIZES = [10, 100, 1000]
+# Relative change of a measure reported as a regression
+DEFAULT_THRESHOLD = 0.25
+# Timings shorter than this are too noisy to be compared
+MIN_SECONDS = 0.005
+# Seconds every throughput is measured for, at least
+DEFAULT_MIN_TIME = 0.2
+# Scenarios evaluated at once in the batch path
+BATCH_SIZE = 100_000
+
+
+@dataclass
+class Measure:
+    """Result of a benchmark.
+
+    Attributes:
+        value (float): The measured value.
+        unit (str): The unit of the value ('s', 'evaluations/s' or 'bytes').
+        higher_is_better (bool): Whether a higher value is an improvement.
+    """
+
+    value: float
+    unit: str
+    higher_is_better: bool = False
+
+
+@dataclass
+class Regression:
+    """Measure worse than in the baseline.
+
+    Attributes:
+        name (str): The name of the measure.
+        baseline (float): The value in the baseline.
+        current (float): The current value.
+        change (float): The relative change, positive when worse.
+    """
+
+    name: str
+    baseline: float
+    current: float
+    change: float
+
+
+def synthetic_spec(size: int) -> SyntheticSpec:
+    """Get the shape of the synthetic industry of a size.
+
+    Args:
+        size (int): The number of processes.
+
+    Returns:
+        SyntheticSpec: A DAG of layers of 10 processes, with a fan-in and a
+        fan-out of 3, 2 constants per process and 3 operations per output.
+    """
+    return SyntheticSpec(
+        processes=size,
+        depth=max(1, size // 10),
+        fan_in=3,
+        fan_out=3,
+        constants=2,
+        complexity=3,
+    )
+
+
+def _generate(
+    industry: Industry, directory: str, timer: PhaseTimer
+) -> tuple[str, float]:
+    """Generate the module of a loaded industry in a directory.
+
+    The module is generated as in a build, without optimization.
+
+    Args:
+        industry (Industry): The loaded industry.
+        directory (str): The directory of the module.
+        timer (PhaseTimer): The timer of the phases.
+
+    Returns:
+        tuple[str, float]: The path of the module and the seconds spent.
+    """
+    assert industry.meta is not None
+    start = time.perf_counter()
+    with timed(timer):
+        module_path = generate_industry(
+            industry.meta.config.short_name,
+            industry,
+            optimize=False,
+            directory=directory,
+        )
+    return module_path, time.perf_counter() - start
+
+
+def measure_build(
+    name: str, industry_path: str, directory: str
+) -> tuple[dict[str, Measure], Industry, str]:
+    """Measure the build of an industry, per phase.
+
+    The YAML cache is disabled, so that the files are parsed. The peak of
+    memory is measured in a second build, as tracing the memory slows it.
+
+    Args:
+        name (str): The name of the industry.
+        industry_path (str): The directory of its YAML files.
+        directory (str): The directory of the generated module.
+
+    Returns:
+        tuple[dict[str, Measure], Industry, str]: The measures by name, the
+        industry and the path of its generated module.
+    """
+    cache_path = os.environ.get("YAML_CACHE_PATH")
+    os.environ["YAML_CACHE_PATH"] = ""
+    try:
+        timer = PhaseTimer(trace_memory=False)
+        start = time.perf_counter()
+        with timed(timer):
+            industry = load_industry(name, industry_path)
+        load_seconds = time.perf_counter() - start
+        module_path, generate_seconds = _generate(industry, directory, timer)
+
+        tracemalloc.start()
+        try:
+            _generate(
+                load_industry(name, industry_path), directory, PhaseTimer()
+            )
+            peak_memory = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    finally:
+        if cache_path is None:
+            del os.environ["YAML_CACHE_PATH"]
+        else:
+            os.environ["YAML_CACHE_PATH"] = cache_path
+
+    measures = {
+        f"build/{name}/{phase_name}": Measure(total.wall, "s")
+        for phase_name, total in timer.totals().items()
+    }
+    measures[f"build/{name}/total"] = Measure(
+        load_seconds + generate_seconds, "s"
+    )
+    measures[f"build/{name}/peak_memory"] = Measure(peak_memory, "bytes")
+    return measures, industry, module_path
+
+
+def _throughput(
+    call: Callable[[], Any], evaluations: int, min_time: float
+) -> float:
+    """Get the evaluations per second of a call.
+
+    Args:
+        call (Callable[[], Any]): The call to measure.
+        evaluations (int): The evaluations done by every call.
+        min_time (float): The seconds the calls are measured for, at least.
+
+    Returns:
+        float: The evaluations per second.
+    """
+    calls = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(calls):
+            call()
+        seconds = time.perf_counter() - start
+        if seconds >= min_time:
+            return calls * evaluations / seconds
+        calls *= 2
+
+
+def _arguments(module: ModuleType) -> list[float]:
+    """Get valid scalar arguments of a generated industry.
+
+    Args:
+        module (ModuleType): The generated module.
+
+    Returns:
+        list[float]: A value of the outcome within its range, and of every
+        input taken from other industries.
+    """
+    names = [
+        name
+        for name, parameter in inspect.signature(
+            module.evaluate
+        ).parameters.items()
+        if parameter.kind == inspect.Parameter.POSITIONAL_OR_KEYWORD
+    ]
+    low, high = module.BOUNDS.get(names[0], (-math.inf, math.inf))
+    if math.isfinite(low) and math.isfinite(high):
+        value = (low + high) / 2
+    elif math.isfinite(low):
+        value = low + 1.0
+    else:
+        value = min(1.0, high)
+    return [value] * len(names)
+
+
+def measure_model(
+    name: str, module_path: str, class_name: str, min_time: float
+) -> dict[str, Measure]:
+    """Measure the throughput and the memory of a generated industry.
+
+    Args:
+        name (str): The name of the industry.
+        module_path (str): The path of its generated module.
+        class_name (str): The name of its generated class.
+        min_time (float): The seconds every throughput is measured for.
+
+    Returns:
+        dict[str, Measure]: The measures by name.
+    """
+    module = load_module(module_path, f"benchmark_{class_name.lower()}")
+    industry_class = getattr(module, class_name)
+    args = _arguments(module)
+    arrays = [np.full(BATCH_SIZE, value) for value in args]
+
+    tracemalloc.start()
+    try:
+        module.evaluate(*arrays)
+        peak_memory = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    rate = "evaluations/s"
+    return {
+        f"model/{name}/scalar": Measure(
+            _throughput(lambda: industry_class(*args), 1, min_time), rate, True
+        ),
+        f"model/{name}/function": Measure(
+            _throughput(lambda: module.evaluate(*args), 1, min_time),
+            rate,
+            True,
+        ),
+        f"model/{name}/batch": Measure(
+            _throughput(
+                lambda: module.evaluate(*arrays), BATCH_SIZE, min_time
+            ),
+            rate,
+            True,
+        ),
+        f"model/{name}/batch_peak_memory": Measure(peak_memory, "bytes"),
+    }
+
+
+def run_benchmarks(
+    industries_path: Optional[str],
+    sizes: list[int],
+    min_time: float = DEFAULT_MIN_TIME,
+) -> dict[str, Measure]:
+    """Run the benchmarks of the compiler and the generated models.
+
+    Args:
+        industries_path (Optional[str]): The directory of the industries,
+            or None to only benchmark the synthetic industries.
+        sizes (list[int]): The processes of the synthetic industries.
+        min_time (float): The seconds every throughput is measured for.
+
+    Returns:
+        dict[str, Measure]: The measures by name.
+    """
+    measures: dict[str, Measure] = {}
+    with tempfile.TemporaryDirectory() as directory:
+        sources = {}
+        if industries_path is not None:
+            sources = {
+                name: source.path
+                for name, source in discover_industries(
+                    industries_path
+                ).items()
+            }
+        for size in sizes:
+            name = f"Synthetic{size}"
+            sources[name] = os.path.join(directory, "sources", name)
+            write_synthetic_industry(sources[name], name, synthetic_spec(size))
+        for name, path in sources.items():
+            build, industry, module_path = measure_build(name, path, directory)
+            measures.update(build)
+            assert industry.meta is not None
+            measures.update(
+                measure_model(
+                    name,
+                    module_path,
+                    industry.meta.config.short_name,
+                    min_time,
+                )
+            )
+    return measures
+
+
+def write_results(measures: dict[str, Measure], path: str) -> None:
+    """Write the results of the benchmarks as JSON.
+
+    Args:
+        measures (dict[str, Measure]): The measures by name.
+        path (str): The path of the results.
+    """
+    results = {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "measures": {name: asdict(m) for name, m in measures.items()},
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+        f.write("\n")
+
+
+def read_results(path: str) -> dict[str, Measure]:
+    """Read the results of the benchmarks.
+
+    Args:
+        path (str): The path of the results.
+
+    Returns:
+        dict[str, Measure]: The measures by name.
+    """
+    with open(path, encoding="utf-8") as f:
+        results = json.load(f)
+    return {
+        name: Measure(**measure)
+        for name, measure in results["measures"].items()
+    }
+
+
+def compare_results(
+    baseline: dict[str, Measure],
+    current: dict[str, Measure],
+    threshold: float = DEFAULT_THRESHOLD,
+) -> list[Regression]:
+    """Find the measures worse than in the baseline.
+
+    The measures missing in either results are skipped, as well as the
+    timings too short to be compared.
+
+    Args:
+        baseline (dict[str, Measure]): The measures of the baseline.
+        current (dict[str, Measure]): The current measures.
+        threshold (float): The relative change reported as a regression.
+
+    Returns:
+        list[Regression]: The regressions, the worst first.
+    """
+    regressions = []
+    for name, measure in current.items():
+        reference = baseline.get(name)
+        if reference is None or reference.value <= 0:
+            continue
+        if measure.unit == "s" and max(measure.value, reference.value) < (
+            MIN_SECONDS
+        ):
+            continue
+        change = measure.value / reference.value - 1
+        if measure.higher_is_better:
+            change = reference.value / max(measure.value, 1e-300) - 1
+        if change > threshold:
+            regressions.append(
+                Regression(name, reference.value, measure.value, change)
+            )
+    return sorted(regressions, key=lambda r: r.change, reverse=True)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """Benchmarks entry point.
+
+    Args:
+        argv (Optional[list[str]]): The command line arguments.
+
+    Returns:
+        int: The exit status, 1 if any regression was found.
+    """
+    parser = argparse.ArgumentParser(description="IDR-IISIM benchmarks")
+    commands = parser.add_subparsers(dest="command", required=True)
+    run = commands.add_parser("run", help="run the benchmarks")
+    run.add_argument(
+        "--output",
+        default="benchmark.json",
+        help="path of the JSON results (default benchmark.json)",
+    )
+    run.add_argument(
+        "--sizes",
+        type=int,
+        nargs="*",
+        default=DEFAULT_SIZES,
+        help="processes of the synthetic industries (default 10 100 1000)",
+    )
+    run.add_argument(
+        "--no-sources",
+        dest="sources",
+        action="store_false",
+        help="only benchmark the synthetic industries",
+    )
+    run.add_argument(
+        "--min-time",
+        type=float,
+        default=DEFAULT_MIN_TIME,
+        help="seconds every throughput is measured for, at least",
+    )
+    compare = commands.add_parser(
+        "compare", help="compare results with a baseline"
+    )
+    compare.add_argument("results", help="path of the JSON results")
+    compare.add_argument(
+        "--baseline",
+        default=DEFAULT_BASELINE,
+        help=f"path of the baseline (default {DEFAULT_BASELINE})",
+    )
+    compare.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="relative change reported as a regression (default 0.25)",
+    )
+    args = parser.parse_args(argv or [])
+
+    if args.command == "run":
+        industries_path = os.environ.get("INDUSTRIES_PATH", "Sources")
+        measures = run_benchmarks(
+            industries_path if args.sources else None,
+            args.sizes,
+            args.min_time,
+        )
+        write_results(measures, args.output)
+        for name, measure in measures.items():
+            print(f"{name:<48}{measure.value:>16.6g} {measure.unit}")
+        return 0
+
+    regressions = compare_results(
+        read_results(args.baseline),
+        read_results(args.results),
+        args.threshold,
+    )
+    for regression in regressions:
+        print(
+            f"{regression.name:<48}{regression.baseline:>14.6g} -> "
+            + f"{regression.current:<14.6g}({regression.change:+.0%} worse)"
+        )
+    if regressions:
+        print(f"{len(regressions)} regressions", file=sys.stderr)
+        return 1
+    print("No regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
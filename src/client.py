@@ -0,0 +1,62 @@
+"""IDR-IISIM compile client
+
+Sends build requests to the compile daemon started with
+'python src/main.py --daemon', without loading the compiler.
+"""
+
+import argparse
+import sys
+from typing import Optional
+
+from idr_iisim.utils.daemon import (
+    DEFAULT_DAEMON_ADDRESS,
+    DEFAULT_TIMEOUT,
+    send_request,
+)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """Client entry point.
+
+    Args:
+        argv (Optional[list[str]]): The command line arguments.
+
+    Returns:
+        int: The exit status, 1 if any build failed.
+    """
+    parser = argparse.ArgumentParser(description="IDR-IISIM compile client")
+    parser.add_argument(
+        "industries", nargs="*", help="names of the industries to build"
+    )
+    parser.add_argument(
+        "--address",
+        default=DEFAULT_DAEMON_ADDRESS,
+        help="HOST:PORT or Unix socket path of the daemon",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=DEFAULT_TIMEOUT,
+        help="seconds to wait for every answer of the daemon (default "
+        + f"{DEFAULT_TIMEOUT:g})",
+    )
+    parser.add_argument(
+        "--stop", action="store_true", help="stop the daemon after the builds"
+    )
+    args = parser.parse_args(argv or [])
+
+    status = 0
+    for name in args.industries:
+        answer = send_request({"build": name}, args.address, args.timeout)
+        if answer["ok"]:
+            print(f"{name}: {answer['module']} ({answer['seconds']:.3f} s)")
+        else:
+            print(f"{name}: {answer['error']}", file=sys.stderr)
+            status = 1
+    if args.stop:
+        send_request({"stop": True}, args.address, args.timeout)
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
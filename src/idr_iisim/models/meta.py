@@ -1,8 +1,13 @@
 """Module to process the meta.yaml, the industry's configuration"""
 
-from typing import Any
+from fractions import Fraction
+from typing import Any, Optional
 
-from idr_iisim.models.model import Model
+from idr_iisim.models.model import (
+    Model,
+    compile_operation,
+    conversion_replacements,
+)
 from idr_iisim.utils.logger import i_logger
 from idr_iisim.utils.structs import (
     DemandStruct,
@@ -56,6 +61,32 @@ class Meta(Model):
         # Parse outcome
         self.outcome[self.config.outcome.name] = self.config.outcome
 
+    def fold_conversions(
+        self,
+        conversions: dict[str, Fraction],
+        items: Optional[set[str]] = None,
+    ) -> None:
+        """Multiply symbols by factors in the operations of the meta.
+
+        The operations of the demands, meta-demands and outputs are
+        rewritten, as the code of the meta is generated from them.
+
+        Args:
+            conversions (dict[str, Fraction]): Factor to multiply each
+                symbol by.
+            items (Optional[set[str]]): Names of the items to convert. All
+                the items are converted if not provided.
+        """
+        super().fold_conversions(conversions, items)
+        replacements = conversion_replacements(conversions)
+        structs: list[ItemStruct] = list(self.demands.values())
+        structs += list(self.meta_demands.values())
+        structs += list(self.outputs.values())
+        for struct in structs:
+            if items is None or struct.name in items:
+                expression = compile_operation(struct.operation).expression
+                struct.operation = str(expression.xreplace(replacements))
+
     def get_getter_items(self) -> list[tuple[str, str]]:
         """Generate a list of item descriptions for getter configuration.
 
@@ -74,18 +105,22 @@ class Meta(Model):
 
         return getter_items
 
-    def constructor_pre_generator(self, process: str) -> str:
+    def constructor_pre_generator(
+        self, process: str, exclude: Optional[set[str]] = None
+    ) -> str:
         """Generate initialization code for demands used in a specified process.
 
         Args:
             process (str): The name of the process for which initializations are generated.
+            exclude (Optional[set[str]]): Names of the demands to leave out.
 
         Returns:
             str: The generated initialization code as a string.
         """
+        exclude = exclude or set()
         items: list[tuple[str, ItemStruct]] = []
         for variable_name, values in self.demands.items():
-            if values.used == process:
+            if values.used == process and variable_name not in exclude:
                 items.append((variable_name, values))
 
         process_methods = _process_items(items)
@@ -2,12 +2,13 @@
 
 import os
 from abc import ABC, abstractmethod
-from functools import partial
-from typing import Any, Callable, TypedDict, Union
+from fractions import Fraction
+from functools import lru_cache
+from typing import Any, Callable, Optional, TypedDict, Union
 
-from sympy import parse_expr
+from sympy import Expr, Rational, Symbol, lambdify, parse_expr
 
-from idr_iisim.templates import load_template
+from idr_iisim.templates import get_template
 from idr_iisim.utils.structs import (
     ConstantStruct,
     InputStruct,
@@ -18,19 +19,107 @@ from idr_iisim.utils.structs import (
 )
 
 
+class CompiledFunction:  # pylint: disable=too-few-public-methods
+    """Callable that evaluates a SymPy expression using float arithmetic.
+
+    The expression is lambdified the first time the function is called,
+    and the resulting function is shared by every item with the same
+    expression.
+
+    Attributes:
+        expression (Expr): The SymPy expression to evaluate.
+        arguments (tuple[str, ...]): Names of the free symbols of the
+            expression, in the order expected by the lambdified function.
+    """
+
+    def __init__(self, expression: Expr):
+        """Initialize the function with the expression to evaluate.
+
+        Args:
+            expression (Expr): The SymPy expression to evaluate.
+        """
+        self.expression = expression
+        self.arguments = tuple(
+            sorted(str(symbol) for symbol in expression.free_symbols)
+        )
+
+    def __call__(self, **kwargs: Any) -> Any:
+        """Evaluate the expression.
+
+        Args:
+            **kwargs (Any): Values of the symbols of the expression. Extra
+                values are ignored.
+
+        Returns:
+            Any: The result of the expression.
+
+        Raises:
+            TypeError: If the value of any symbol is missing.
+        """
+        missing = [name for name in self.arguments if name not in kwargs]
+        if missing:
+            raise TypeError(
+                f"Missing values for {missing} to evaluate "
+                + f"'{self.expression}'"
+            )
+        function = _lambdify(self.expression)
+        return function(*(kwargs[name] for name in self.arguments))
+
+
+@lru_cache(maxsize=None)
+def _lambdify(expression: Expr) -> Callable[..., Any]:
+    symbols = sorted(expression.free_symbols, key=str)
+    # evaluated with NumPy, so that the functions also accept arrays
+    function: Callable[..., Any] = lambdify(
+        symbols, expression, modules="numpy"
+    )
+    return function
+
+
+@lru_cache(maxsize=None)
+def compile_operation(operation: str) -> CompiledFunction:
+    """Parse an operation and compile it into a callable.
+
+    Args:
+        operation (str): Valid SymPy operation.
+
+    Returns:
+        CompiledFunction: The function evaluating the operation.
+    """
+    return CompiledFunction(parse_expr(operation))
+
+
+def conversion_replacements(
+    conversions: dict[str, Fraction]
+) -> dict[Symbol, Expr]:
+    """Build the replacements that fold unit conversions into expressions.
+
+    Args:
+        conversions (dict[str, Fraction]): Factor to multiply each symbol by.
+
+    Returns:
+        dict[Symbol, Expr]: The scaled symbol for each symbol.
+    """
+    return {
+        Symbol(name): Rational(factor.numerator, factor.denominator)
+        * Symbol(name)
+        for name, factor in conversions.items()
+    }
+
+
 class FunctionsMapType(TypedDict):
     """Type definition for FunctionsMap.
 
     Attributes:
-        function (Callable[..., Any]): The function to be called.
+        function (CompiledFunction): The function to be called.
         args (list[dict[str, Any]]): List of arguments for the function.
-        expression (str): The expression associated with this function.
+        expression (Expr): The expression associated with this function.
         description (str): Description of the function.
     """
 
-    function: Callable[..., Any]
+    function: CompiledFunction
     args: list[dict[str, Any]]
-    expression: str
+    expression: Expr
     description: str
 
 
@@ -46,6 +135,9 @@ class Model(ABC):
         constants (dict[str, ConstantStruct]): Dictionary holding constant structures.
         functions_map (dict[str, FunctionsMapType]): Map of functions.
         config (Union[ModelStruct, MetaStruct]): Configuration of the model.
+        conversions (dict[tuple[str, Optional[frozenset[str]]], Fraction]):
+            Unit conversion factors folded into the operations, by symbol
+            and converted items (None for all of them).
     """
 
     def __init__(self, path: str):
@@ -60,6 +152,9 @@ class Model(ABC):
         self.constants: dict[str, ConstantStruct] = {}
         self.functions_map: dict[str, FunctionsMapType] = {}
         self.config: Union[ModelStruct, MetaStruct]
+        self.conversions: dict[
+            tuple[str, Optional[frozenset[str]]], Fraction
+        ] = {}
 
     def process_config(
         self, items: list[ItemStruct], config: ModelStruct
@@ -74,13 +169,12 @@ class Model(ABC):
             ValueError: If any constant or input value is out of its valid range.
         """
         for item in items:
-            operation = parse_expr(item.operation)
-            f = partial(lambda op, **kwargs: op.subs(kwargs), op=operation)
+            function = compile_operation(item.operation)
             key = item.name
             self.functions_map[key] = {
-                "function": f,
+                "function": function,
                 "args": item.args,
-                "expression": operation,
+                "expression": function.expression,
                 "description": item.description,
             }
 
@@ -115,6 +209,53 @@ class Model(ABC):
                             + f" ({input_field.value} not inside {input_field.range})"
                         )
 
+    def apply_conversions(
+        self,
+        conversions: dict[str, Fraction],
+        items: Optional[set[str]] = None,
+    ) -> None:
+        """Fold unit conversion factors into the operations of the model.
+
+        The factors already folded are recorded, so that checking the types
+        again (e.g. when another industry is rebuilt) leaves the operations
+        unchanged, and a factor that changed is corrected.
+
+        Args:
+            conversions (dict[str, Fraction]): Factor to multiply each
+                symbol by, to convert it into the units expected by the model.
+            items (Optional[set[str]]): Names of the items to convert. All
+                the items are converted if not provided.
+        """
+        key = None if items is None else frozenset(items)
+        pending = {}
+        for symbol, factor in conversions.items():
+            applied = self.conversions.get((symbol, key), Fraction(1))
+            if factor != applied:
+                pending[symbol] = factor / applied
+                self.conversions[(symbol, key)] = factor
+        if pending:
+            self.fold_conversions(pending, items)
+
+    def fold_conversions(
+        self,
+        conversions: dict[str, Fraction],
+        items: Optional[set[str]] = None,
+    ) -> None:
+        """Multiply symbols by factors in the operations of the model.
+
+        Args:
+            conversions (dict[str, Fraction]): Factor to multiply each
+                symbol by.
+            items (Optional[set[str]]): Names of the items to convert. All
+                the items are converted if not provided.
+        """
+        replacements = conversion_replacements(conversions)
+        for name, item in self.functions_map.items():
+            if items is None or name in items:
+                expression = item["expression"].xreplace(replacements)
+                item["function"] = CompiledFunction(expression)
+                item["expression"] = expression
+
     def constants_generator(self) -> str:
         """Generate code for constants defined in the model configuration.
 
@@ -154,7 +295,7 @@ class Model(ABC):
 
         # Load the template content
         template_path = "templates/template_generated_getter.txt"
-        getter_template = load_template(template_path)
+        getter_template = get_template(template_path)
 
         # outputs
         for variable_name, description in self.get_getter_items():
@@ -1,9 +1,9 @@
 """Module to parse industry's processes"""
 
-from typing import Any
+from typing import Any, Optional
 
-from idr_iisim.models.model import Model
-from idr_iisim.templates import load_template
+from idr_iisim.models.model import FunctionsMapType, Model
+from idr_iisim.templates import get_template
 from idr_iisim.utils.logger import i_logger
 from idr_iisim.utils.structs import (
     ItemStruct,
@@ -55,14 +55,38 @@ class Process(Model):
 
         return getter_items
 
-    def operations_generator(self) -> str:
+    def _selected_items(
+        self, exclude: Optional[set[str]]
+    ) -> list[tuple[str, FunctionsMapType]]:
+        exclude = exclude or set()
+        return [
+            (variable_name, outputs)
+            for variable_name, outputs in self.functions_map.items()
+            if variable_name not in exclude
+        ]
+
+    def has_outputs(self, exclude: Optional[set[str]] = None) -> bool:
+        """Check whether the process computes any output.
+
+        Args:
+            exclude (Optional[set[str]]): Names of the outputs to leave out.
+
+        Returns:
+            bool: True if any output is not excluded.
+        """
+        return len(self._selected_items(exclude)) > 0
+
+    def operations_generator(self, exclude: Optional[set[str]] = None) -> str:
         """Generate operations methods for the model.
 
+        Args:
+            exclude (Optional[set[str]]): Names of the outputs to leave out.
+
         Returns:
             str: The generated operations as a string.
         """
         process_methods = []
-        for variable_name, outputs in self.functions_map.items():
+        for variable_name, outputs in self._selected_items(exclude):
             expression = str(outputs["expression"])
             for arg in outputs["args"]:
                 if arg["type"] == "outputs":
@@ -73,18 +97,25 @@ class Process(Model):
             process_methods.append(method_script)
         return "\n        ".join(process_methods)
 
-    def process_methods_generator(self) -> str:
+    def process_methods_generator(
+        self, exclude: Optional[set[str]] = None, instrument: bool = False
+    ) -> str:
         """Generate the methods for the industry's class.
 
+        Args:
+            exclude (Optional[set[str]]): Names of the outputs to leave out.
+            instrument (bool): If true, the calls of the method and the
+                seconds spent in it are counted.
+
         Returns:
             str: The generated methods as a formatted string.
         """
         # Load the template content
         template_path = "templates/template_generated_process_method.txt"
-        method_template = load_template(template_path)
+        method_template = get_template(template_path)
 
         args = []
-        for outputs in self.functions_map.values():
+        for _, outputs in self._selected_items(exclude):
             for arg in outputs["args"]:
                 if arg["type"] == "inputs":
                     if arg["name"] not in args:
@@ -95,23 +126,33 @@ class Process(Model):
             args_script += ", "
             args_script += ", ".join(args)
 
+        decorator = ""
+        if instrument:
+            decorator = f'@_timed("{self.config.short_name}")\n    '
+
         return method_template.substitute(
             name=self.config.short_name,
+            decorator=decorator,
             args=args_script,
             description=self.config.description,
-            operation=self.operations_generator(),
+            operation=self.operations_generator(exclude),
         )
 
-    def process_call_method_generator(self) -> str:
+    def process_call_method_generator(
+        self, exclude: Optional[set[str]] = None
+    ) -> str:
         """Generate the code to call the different methods.
 
+        Args:
+            exclude (Optional[set[str]]): Names of the outputs to leave out.
+
         Returns:
             str: The generated method call as a string.
         """
         script = f"self.__{self.config.short_name}("
 
         args = []
-        for outputs in self.functions_map.values():
+        for _, outputs in self._selected_items(exclude):
             for arg in outputs["args"]:
                 if arg["type"] == "inputs":
                     name = f"self.__{arg['name']}"
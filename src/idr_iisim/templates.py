@@ -1,9 +1,13 @@
 """module to load templates"""
 
+import os
 from string import Template  # Use Template for substitution
 
 from idr_iisim.utils.logger import i_logger
 
+# Templates already loaded, with the modification time of their files
+_REGISTRY: dict[str, tuple[int, Template]] = {}
+
 
 def load_template(template_path: str) -> Template:
     """Load a template from the specified file path.
@@ -31,3 +35,26 @@ def load_template(template_path: str) -> Template:
         i_logger.error("Error reading template file: %r", e)
         raise
     return Template(template_content)
+
+
+def get_template(template_path: str) -> Template:
+    """Get a template, reading its file only when it changed.
+
+    The templates are kept in a registry, so that a long-running process
+    (e.g. the compile daemon) does not read them on every build.
+
+    Args:
+        template_path (str): Path to the template file.
+
+    Returns:
+        Template: A Template object containing the template content.
+
+    Raises:
+        FileNotFoundError: If the specified template file does not exist.
+    """
+    mtime = os.stat(template_path).st_mtime_ns
+    cached = _REGISTRY.get(template_path)
+    if cached is None or cached[0] != mtime:
+        cached = (mtime, load_template(template_path))
+        _REGISTRY[template_path] = cached
+    return cached[1]
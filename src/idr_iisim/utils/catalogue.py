@@ -0,0 +1,255 @@
+"""Catalogue of industries that depend on each other"""
+
+from typing import Callable, Iterable, Optional
+
+from idr_iisim.templates import get_template
+from idr_iisim.utils.models_dict import Industry, model_conversion_factor
+
+
+class Catalogue:
+    """Set of industries whose inputs may come from other industries.
+
+    An input of a process or meta of an industry can take its value from
+    an output of another industry, setting its 'from' field to the id of
+    the other industry's meta. The input must have the name of any value
+    of the other industry (its outcome, demands, meta-demands or outputs).
+
+    Attributes:
+        industries (dict[str, Industry]): The industries by their meta's id.
+    """
+
+    def __init__(self) -> None:
+        self.industries: dict[str, Industry] = {}
+
+    def add_industry(self, industry: Industry) -> None:
+        """Add an industry to the catalogue.
+
+        Args:
+            industry (Industry): The industry, with its types checked.
+        """
+        assert industry.meta is not None
+        self.industries[industry.meta.config.id] = industry
+
+    def dependencies(self) -> dict[str, set[str]]:
+        """Get the industries each industry takes inputs from.
+
+        Returns:
+            dict[str, set[str]]: The ids of the industries each industry
+            depends on, by industry id.
+        """
+        return {
+            key: {
+                input_field.input_from
+                for _, input_field in industry.external_inputs
+            }
+            for key, industry in self.industries.items()
+        }
+
+    def check_types(self, keys: Optional[Iterable[str]] = None) -> None:
+        """Check the inputs that come from other industries.
+
+        The units only need to be compatible: the conversion factors are
+        folded into the operations of the models that receive the values,
+        so the inputs of an industry are checked only once after loading it.
+
+        Args:
+            keys (Optional[Iterable[str]]): The ids of the industries whose
+                inputs are checked, all of them by default.
+
+        Raises:
+            ValueError: If an input comes from an unknown industry, from a
+                value that does not exist or if the units are not compatible.
+        """
+        for key in self.industries if keys is None else keys:
+            industry = self.industries[key]
+            for model, input_field in industry.external_inputs:
+                source = self.industries.get(input_field.input_from)
+                if source is None or source.meta is None:
+                    raise ValueError(
+                        f"'{input_field.input_from}' of '{input_field.name}' "
+                        + f"in '{model.config.name}' is not a process of "
+                        + f"'{key}' or a known industry"
+                    )
+                units = source.meta.get_units()
+                if input_field.name not in units:
+                    raise ValueError(
+                        f"'{input_field.name}' does not exist in "
+                        + f"'{source.meta.config.name}'"
+                    )
+                factor = model_conversion_factor(
+                    input_field.name,
+                    (model.config.name, input_field.units),
+                    (source.meta.config.name, units[input_field.name]),
+                )
+                if factor != 1:
+                    model.apply_conversions({input_field.name: factor})
+
+    def generate_schedule(self) -> list[str]:
+        """Generate the order in which the industries are evaluated.
+
+        Every industry is evaluated after the industries it depends on.
+
+        Returns:
+            list[str]: The ids of the industries in order.
+
+        Raises:
+            ValueError: If there are circular dependencies.
+        """
+        pending = self.dependencies()
+        schedule: list[str] = []
+        while pending:
+            ready = [
+                key
+                for key, dependencies in pending.items()
+                if not dependencies - set(schedule)
+            ]
+            if not ready:
+                raise ValueError(
+                    "Circular dependencies among the industries: "
+                    + ", ".join(sorted(pending))
+                )
+            for key in ready:
+                schedule.append(key)
+                del pending[key]
+        return schedule
+
+    def dependents(self, keys: Iterable[str]) -> set[str]:
+        """Get the industries that take inputs, directly or not, from some.
+
+        Args:
+            keys (Iterable[str]): The ids of the industries.
+
+        Returns:
+            set[str]: The ids of the industries and all their dependents.
+        """
+        dependencies = self.dependencies()
+        found = set(keys)
+        pending = list(found)
+        while pending:
+            source = pending.pop()
+            for key, sources in dependencies.items():
+                if source in sources and key not in found:
+                    found.add(key)
+                    pending.append(key)
+        return found
+
+    def is_coupled(self) -> bool:
+        """Check whether any industry takes inputs from another one.
+
+        Returns:
+            bool: True if there are dependencies between industries.
+        """
+        return any(self.dependencies().values())
+
+    def _schedule_calls(
+        self, outcome: Callable[[int, str], str], values: str
+    ) -> list[tuple[Industry, str]]:
+        """Generate the calls to the evaluate functions of the industries.
+
+        Args:
+            outcome (Callable[[int, str], str]): Generates the expression of
+                the outcome of an industry from its position and its name.
+            values (str): Name of the dictionary, indexed by industry name,
+                with the values of the industries already evaluated.
+
+        Returns:
+            list[tuple[Industry, str]]: Every industry, in order, with the
+            call of the evaluate function of its generated module.
+        """
+        calls = []
+        for index, key in enumerate(self.generate_schedule()):
+            industry = self.industries[key]
+            assert industry.meta is not None
+            name = industry.meta.config.short_name
+
+            sources = {
+                input_field.name: self.industries[input_field.input_from]
+                for _, input_field in industry.external_inputs
+            }
+            args = [outcome(index, name)]
+            for input_name in industry.external_input_names():
+                source = sources[input_name].meta
+                assert source is not None
+                args.append(
+                    f'{values}["{source.config.short_name}"]["{input_name}"]'
+                )
+            calls.append(
+                (
+                    industry,
+                    f"{name.lower()}.evaluate(\n        "
+                    + ",\n        ".join(args)
+                    + ",\n    )",
+                )
+            )
+        return calls
+
+    def script_generator(self) -> str:
+        """Generate the module that evaluates all the industries together.
+
+        The module imports the generated module of every industry and
+        evaluates them following the schedule, passing the values of each
+        industry to the industries that depend on it.
+
+        Returns:
+            str: The generated module.
+        """
+        template_path = "templates/template_generated_coupled_module.txt"
+        module_template = get_template(template_path)
+
+        calls = self._schedule_calls(
+            lambda _, name: f'outcomes["{name}"]', "results"
+        )
+        names = [_short_name(industry) for industry, _ in calls]
+
+        return module_template.substitute(
+            names=", ".join(names),
+            imports="\n".join(f"from . import {n.lower()}" for n in names),
+            order=repr(names),
+            calls="\n    ".join(
+                f'results["{name}"] = {call}'
+                for name, (_, call) in zip(names, calls)
+            ),
+        )
+
+    def portfolio_generator(self) -> str:
+        """Generate the module that evaluates all the industries at once.
+
+        The module takes a table of outcomes, with a row per scenario and a
+        column per industry, and evaluates every industry for all the rows
+        in a single call of its evaluate function. The values are laid out
+        in a single matrix, with a column per industry and value.
+
+        Returns:
+            str: The generated module.
+        """
+        template_path = "templates/template_generated_portfolio_module.txt"
+        module_template = get_template(template_path)
+
+        calls = self._schedule_calls(
+            lambda index, _: f"drivers[:, {index}]", "values"
+        )
+        names = [_short_name(industry) for industry, _ in calls]
+        columns: list[str] = []
+        lines = ["values = {}"]
+        for name, (industry, call) in zip(names, calls):
+            assert industry.meta is not None
+            lines.append(f'values["{name}"] = {call}')
+            for value in industry.meta.get_units():
+                lines.append(
+                    f"results[:, {len(columns)}] = "
+                    + f'values["{name}"]["{value}"]'
+                )
+                columns.append(f'("{name}", "{value}"),')
+
+        return module_template.substitute(
+            names=", ".join(names),
+            imports="\n".join(f"from . import {n.lower()}" for n in names),
+            industries=repr(names),
+            columns="\n    ".join(columns),
+            calls="\n    ".join(lines),
+        )
+
+
+def _short_name(industry: Industry) -> str:
+    assert industry.meta is not None
+    return industry.meta.config.short_name
@@ -0,0 +1,211 @@
+"""Asynchronous evaluations of the generated industries, in batches"""
+
+import asyncio
+import inspect
+from concurrent.futures import Executor
+from dataclasses import dataclass, field
+from types import ModuleType
+from typing import Any, Optional
+
+import numpy as np
+
+from idr_iisim.utils.verification import load_module
+
+# Seconds that the first request of a batch waits for others
+DEFAULT_WINDOW = 0.002
+# Maximum number of requests of a batch
+DEFAULT_MAX_BATCH = 4096
+
+# Requests waiting for a batch: the industry and the names of the arguments
+_BatchKey = tuple[str, tuple[str, ...]]
+
+
+@dataclass
+class _Batch:
+    """Requests of an industry with the same arguments, to run together.
+
+    Attributes:
+        values (list[tuple[float, ...]]): The arguments of every request.
+        futures (list[asyncio.Future[dict[str, float]]]): The results
+            awaited by every request.
+        timer (Optional[asyncio.TimerHandle]): The end of the window.
+    """
+
+    values: list[tuple[float, ...]] = field(default_factory=list)
+    futures: list["asyncio.Future[dict[str, float]]"] = field(
+        default_factory=list
+    )
+    timer: Optional[asyncio.TimerHandle] = None
+
+
+def _evaluate_batch(
+    module: ModuleType, names: tuple[str, ...], rows: list[tuple[float, ...]]
+) -> list[dict[str, float]]:
+    """Evaluate a batch of requests in one vectorised call.
+
+    Args:
+        module (ModuleType): The generated module of the industry.
+        names (tuple[str, ...]): The names of the arguments.
+        rows (list[tuple[float, ...]]): The arguments of every request.
+
+    Returns:
+        list[dict[str, float]]: The values of every request.
+    """
+    columns = np.array(rows, dtype=float).reshape(len(rows), len(names)).T
+    values = module.evaluate(**dict(zip(names, columns)))
+    arrays = {
+        name: np.broadcast_to(np.asarray(value, dtype=float), (len(rows),))
+        for name, value in values.items()
+    }
+    return [
+        {name: float(array[i]) for name, array in arrays.items()}
+        for i in range(len(rows))
+    ]
+
+
+class AsyncEvaluator:  # pylint: disable=too-many-instance-attributes
+    """Asyncio façade of the generated industries.
+
+    The concurrent requests of an industry that arrive within a short window
+    are evaluated together, in one vectorised call run in an executor (off
+    the event loop), and their values are handed back to every request. If a
+    batch fails (e.g. an outcome is out of range), its requests are
+    evaluated one by one, so that only the failing ones raise.
+
+    Attributes:
+        modules (dict[str, ModuleType]): The generated modules by name.
+        window (float): The seconds that the first request of a batch
+            waits for others.
+        max_batch (int): The maximum number of requests of a batch.
+        executor (Optional[Executor]): The executor of the batches, the
+            default one of the event loop if None.
+        requests (int): The number of requests evaluated.
+        batches (int): The number of batches evaluated.
+    """
+
+    def __init__(
+        self,
+        modules: dict[str, ModuleType],
+        window: float = DEFAULT_WINDOW,
+        max_batch: int = DEFAULT_MAX_BATCH,
+        executor: Optional[Executor] = None,
+    ):
+        """Create an evaluator of some industries.
+
+        Args:
+            modules (dict[str, ModuleType]): The generated modules by name.
+            window (float): The seconds that the first request of a batch
+                waits for others.
+            max_batch (int): The maximum number of requests of a batch.
+            executor (Optional[Executor]): The executor of the batches.
+        """
+        self.modules = modules
+        self.window = window
+        self.max_batch = max_batch
+        self.executor = executor
+        self.requests = 0
+        self.batches = 0
+        self._pending: dict[_BatchKey, _Batch] = {}
+        # the running batches, referenced until they finish
+        self._tasks: set["asyncio.Task[None]"] = set()
+
+    @classmethod
+    def from_paths(
+        cls, paths: dict[str, str], **kwargs: Any
+    ) -> "AsyncEvaluator":
+        """Create an evaluator of some generated modules.
+
+        Args:
+            paths (dict[str, str]): The paths of the modules by name.
+            **kwargs (Any): The other arguments of the evaluator.
+
+        Returns:
+            AsyncEvaluator: The evaluator.
+        """
+        return cls(
+            {name: load_module(path, name) for name, path in paths.items()},
+            **kwargs,
+        )
+
+    async def evaluate(
+        self, name: str, outcome: float, **arguments: float
+    ) -> dict[str, float]:
+        """Evaluate an industry for a single scenario.
+
+        Args:
+            name (str): The name of the industry.
+            outcome (float): The outcome of the industry.
+            **arguments (float): The inputs from other industries and the
+                constants to replace, by name.
+
+        Returns:
+            dict[str, float]: The values of the industry.
+
+        Raises:
+            KeyError: If the industry does not exist.
+            ValueError: If the arguments are not valid.
+        """
+        module = self.modules[name]
+        first = next(iter(inspect.signature(module.evaluate).parameters))
+        names = (first, *sorted(arguments))
+        key = (name, names)
+        loop = asyncio.get_running_loop()
+
+        batch = self._pending.setdefault(key, _Batch())
+        future: asyncio.Future[dict[str, float]] = loop.create_future()
+        batch.values.append(
+            (float(outcome), *(float(arguments[n]) for n in names[1:]))
+        )
+        batch.futures.append(future)
+        if len(batch.values) >= self.max_batch:
+            self._flush(key)
+        elif batch.timer is None:
+            batch.timer = loop.call_later(self.window, self._flush, key)
+        return await future
+
+    def _flush(self, key: _BatchKey) -> None:
+        """Start the evaluation of the pending requests of a batch.
+
+        Args:
+            key (_BatchKey): The industry and the names of the arguments.
+        """
+        batch = self._pending.pop(key, None)
+        if batch is None:
+            return
+        if batch.timer is not None:
+            batch.timer.cancel()
+        self.requests += len(batch.values)
+        self.batches += 1
+        task = asyncio.get_running_loop().create_task(self._run(key, batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, key: _BatchKey, batch: _Batch) -> None:
+        """Evaluate a batch and hand its values back to the requests.
+
+        Args:
+            key (_BatchKey): The industry and the names of the arguments.
+            batch (_Batch): The requests.
+        """
+        loop = asyncio.get_running_loop()
+        module = self.modules[key[0]]
+        try:
+            results = await loop.run_in_executor(
+                self.executor, _evaluate_batch, module, key[1], batch.values
+            )
+        except Exception as err:  # pylint: disable=broad-exception-caught
+            if len(batch.values) == 1:
+                if not batch.futures[0].done():
+                    batch.futures[0].set_exception(err)
+                return
+            # evaluate the requests one by one to find the failing ones
+            await asyncio.gather(
+                *(
+                    self._run(key, _Batch([row], [future]))
+                    for row, future in zip(batch.values, batch.futures)
+                )
+            )
+            return
+        for future, result in zip(batch.futures, results):
+            if not future.done():
+                future.set_result(result)
@@ -0,0 +1,246 @@
+"""Technical coefficients (input-output) matrices of linear industries"""
+
+from dataclasses import dataclass
+from typing import Any, Optional
+
+import numpy as np
+from sympy import Dummy, Expr, Symbol, sympify
+
+from idr_iisim.utils.catalogue import Catalogue
+from idr_iisim.utils.models_dict import Industry
+
+
+@dataclass
+class CoefficientMatrix:
+    """Values of industries per unit of their outcomes.
+
+    The value of every row is the product of the matrix and the vector of
+    outcomes of the industries, so that linear models of many sectors can
+    be solved with linear algebra instead of evaluating each industry.
+
+    Attributes:
+        industries (list[str]): The industries whose outcomes are the
+            columns of the matrix.
+        column_units (list[str]): The units of the outcome of each column.
+        rows (list[tuple[str, str]]): The industry and the name of the
+            value (demand, meta-demand or output) of each row.
+        row_units (list[str]): The units of the value of each row.
+        matrix (np.ndarray): The coefficients, with a row per value and a
+            column per industry. The coefficient of a row and a column is
+            in units of the row per units of the column.
+    """
+
+    industries: list[str]
+    column_units: list[str]
+    rows: list[tuple[str, str]]
+    row_units: list[str]
+    matrix: np.ndarray
+
+    def coo(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Get the matrix in coordinate (COO) format.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray, np.ndarray]: The row, the column
+            and the value of every non-zero coefficient.
+        """
+        row, col = np.nonzero(self.matrix)
+        return row, col, self.matrix[row, col]
+
+    def save(self, path: str, sparse: bool = False) -> None:
+        """Save the matrix in a NumPy .npz file.
+
+        The file has the labels of the matrix ('industries', 'column_units',
+        'row_industries', 'row_names' and 'row_units') and either the dense
+        'matrix' or its 'row', 'col', 'data' and 'shape' in COO format.
+
+        Args:
+            path (str): The path of the file.
+            sparse (bool): Whether to save the matrix in COO format.
+        """
+        arrays: dict[str, Any] = {
+            "industries": np.array(self.industries),
+            "column_units": np.array(self.column_units),
+            "row_industries": np.array([i for i, _ in self.rows]),
+            "row_names": np.array([name for _, name in self.rows]),
+            "row_units": np.array(self.row_units),
+        }
+        if sparse:
+            arrays["row"], arrays["col"], arrays["data"] = self.coo()
+            arrays["shape"] = np.array(self.matrix.shape)
+        else:
+            arrays["matrix"] = self.matrix
+        np.savez(path, **arrays)
+
+
+def compose_expressions(
+    industry: Industry, inputs: dict[str, Expr]
+) -> dict[str, Expr]:
+    """Compose the operations of an industry into a single expression.
+
+    Args:
+        industry (Industry): The industry.
+        inputs (dict[str, Expr]): The expressions of the outcome and of the
+            inputs taken from other industries.
+
+    Returns:
+        dict[str, Expr]: The expression of every value of the industry's
+        units in terms of the given inputs, with the constants replaced by
+        their values.
+    """
+    assert industry.meta is not None
+    values: dict[Symbol, Expr] = {}
+    for model in [industry.meta, *industry.models.values()]:
+        for constant in model.config.constants:
+            values[Symbol(constant.name)] = sympify(constant.value)
+    for name, expression in inputs.items():
+        values[Symbol(name)] = expression
+    for name, function in industry.evaluation_sequence():
+        values[Symbol(name)] = function.expression.xreplace(values)
+    return {name: values[Symbol(name)] for name in industry.meta.get_units()}
+
+
+def affine_terms(
+    expression: Expr, variables: list[Symbol]
+) -> Optional[tuple[list[float], float]]:
+    """Get the terms of an affine expression of some variables.
+
+    Args:
+        expression (Expr): The expression.
+        variables (list[Symbol]): The variables.
+
+    Returns:
+        Optional[tuple[list[float], float]]: The coefficient of each
+        variable and the constant term, or None if the expression is not
+        affine in the variables or depends on other symbols.
+    """
+    if expression.free_symbols - set(variables):
+        return None
+    coefficients = [expression.diff(variable) for variable in variables]
+    if any(c.free_symbols for c in coefficients):
+        return None
+    constant = expression.xreplace({variable: 0 for variable in variables})
+    return [float(c) for c in coefficients], float(constant)
+
+
+def _coefficients(
+    name: str, expression: Expr, outcomes: list[Dummy]
+) -> list[float]:
+    """Get the coefficients of a linear expression of the outcomes.
+
+    Args:
+        name (str): The name of the value, for the error messages.
+        expression (Expr): The expression of the value.
+        outcomes (list[Dummy]): The symbols of the outcomes.
+
+    Returns:
+        list[float]: The coefficient of each outcome.
+
+    Raises:
+        ValueError: If the value is not proportional to the outcomes.
+    """
+    unknown = expression.free_symbols - set(outcomes)
+    if unknown:
+        raise ValueError(
+            f"'{name}' depends on unknown values: "
+            + ", ".join(sorted(str(s) for s in unknown))
+        )
+    terms = affine_terms(expression, list(outcomes))
+    if terms is None or terms[1] != 0:
+        raise ValueError(f"'{name}' is not linear in the outcomes")
+    return terms[0]
+
+
+def _coefficient_matrix(
+    industries: list[Industry], sources: dict[str, dict[str, str]]
+) -> CoefficientMatrix:
+    """Build the coefficient matrix of a list of industries, in order.
+
+    Args:
+        industries (list[Industry]): The industries, sorted so that every
+            industry comes after the industries it takes inputs from.
+        sources (dict[str, dict[str, str]]): The meta id of the industry
+            each external input comes from, by input name, for every
+            industry by meta id.
+
+    Returns:
+        CoefficientMatrix: The matrix of the industries.
+    """
+    outcomes = [Dummy(str(i)) for i in range(len(industries))]
+    composed: dict[str, dict[str, Expr]] = {}
+    matrix = CoefficientMatrix([], [], [], [], np.zeros((0, len(outcomes))))
+    rows = []
+    for industry, outcome in zip(industries, outcomes):
+        assert industry.meta is not None
+        meta = industry.meta
+        outcome_name = meta.config.outcome.name
+        values: dict[str, Expr] = {outcome_name: outcome}
+        for input_name, source in sources[meta.config.id].items():
+            values[input_name] = composed[source][input_name]
+        composed[meta.config.id] = compose_expressions(industry, values)
+
+        matrix.industries.append(meta.config.short_name)
+        matrix.column_units.append(meta.get_units()[outcome_name])
+        for name, expression in composed[meta.config.id].items():
+            if name == outcome_name:
+                continue
+            rows.append(
+                _coefficients(
+                    f"{meta.config.short_name}.{name}", expression, outcomes
+                )
+            )
+            matrix.rows.append((meta.config.short_name, name))
+            matrix.row_units.append(meta.get_units()[name])
+
+    matrix.matrix = np.array(rows, dtype=float).reshape(-1, len(outcomes))
+    return matrix
+
+
+def industry_coefficients(industry: Industry) -> CoefficientMatrix:
+    """Get the technical coefficients of a linear industry.
+
+    Every demand, meta-demand and output of a linear industry is
+    proportional to its outcome: the matrix has a single column with
+    these proportions.
+
+    Args:
+        industry (Industry): The industry, with its types checked.
+
+    Returns:
+        CoefficientMatrix: The coefficients of the industry.
+
+    Raises:
+        ValueError: If the industry is not linear or takes inputs from
+            other industries.
+    """
+    assert industry.meta is not None
+    return _coefficient_matrix([industry], {industry.meta.config.id: {}})
+
+
+def catalogue_coefficients(catalogue: Catalogue) -> CoefficientMatrix:
+    """Get the technical coefficients of all the industries of a catalogue.
+
+    The inputs that an industry takes from other industries are replaced
+    by their coefficients, so that every value is expressed per unit of
+    the outcomes of all the industries.
+
+    Args:
+        catalogue (Catalogue): The catalogue, with its types checked.
+
+    Returns:
+        CoefficientMatrix: The coefficients of the industries, with a column
+        per industry in the order of the catalogue's schedule.
+
+    Raises:
+        ValueError: If any industry is not linear.
+    """
+    industries = [
+        catalogue.industries[key] for key in catalogue.generate_schedule()
+    ]
+    sources = {
+        key: {
+            input_field.name: str(input_field.input_from)
+            for _, input_field in industry.external_inputs
+        }
+        for key, industry in catalogue.industries.items()
+    }
+    return _coefficient_matrix(industries, sources)
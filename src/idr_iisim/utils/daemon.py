@@ -0,0 +1,185 @@
+"""Compile daemon that keeps the compiler warm between builds
+
+This module only imports the standard library, the logger and the socket
+helpers of the package, not the compiler, so that the client starts quickly:
+the compiler itself is given to the daemon by the caller.
+"""
+
+import json
+import os
+import socket
+import threading
+import time
+from socketserver import (
+    BaseServer,
+    StreamRequestHandler,
+    ThreadingTCPServer,
+    ThreadingUnixStreamServer,
+)
+from typing import Any, Callable, Optional
+
+from idr_iisim.utils.logger import i_logger
+from idr_iisim.utils.sockets import is_unix_address, remove_stale_socket
+
+# Default address of the daemon
+DEFAULT_DAEMON_ADDRESS = "127.0.0.1:8001"
+# Seconds the client waits for the daemon, a build included
+DEFAULT_TIMEOUT = 300.0
+
+
+class CompileDaemon:
+    """Compiler kept in memory, that builds industries on request.
+
+    The requests are JSON lines: {"build": "<industry>"} builds an industry
+    and {"stop": true} stops the daemon. Every request is answered with a
+    JSON line, {"ok": true, ...} or {"ok": false, "error": "..."}. The
+    builds run one at a time.
+    """
+
+    def __init__(self, build: Callable[[str], str]):
+        """Create a daemon.
+
+        Args:
+            build (Callable[[str], str]): The function that generates the
+                module of an industry from its name, and returns its path.
+        """
+        self.build = build
+        self.builds = 0
+        self._lock = threading.Lock()
+        self._server: BaseServer
+        self._socket: Optional[os.stat_result] = None
+
+    def handle(self, request: dict[str, Any]) -> dict[str, Any]:
+        """Answer a request.
+
+        Args:
+            request (dict[str, Any]): The request.
+
+        Returns:
+            dict[str, Any]: The answer.
+        """
+        if request.get("stop"):
+            threading.Thread(target=self._server.shutdown).start()
+            return {"ok": True}
+        name = request.get("build")
+        if not isinstance(name, str):
+            return {"ok": False, "error": "Unknown request"}
+        start = time.perf_counter()
+        with self._lock:
+            try:
+                module_path = self.build(name)
+            except Exception as err:  # pylint: disable=broad-exception-caught
+                i_logger.error("Industry '%s' not built: %s", name, err)
+                return {"ok": False, "error": f"{type(err).__name__}: {err}"}
+            self.builds += 1
+        seconds = time.perf_counter() - start
+        i_logger.info("Industry '%s' built in %.3f s", name, seconds)
+        return {"ok": True, "module": module_path, "seconds": seconds}
+
+    def make_server(self, address: str) -> BaseServer:
+        """Create the server of the daemon.
+
+        Args:
+            address (str): 'host:port' on localhost, or the path of a Unix
+                socket.
+
+        Returns:
+            BaseServer: The server, to be run with serve_forever.
+
+        Raises:
+            ValueError: If the path of the Unix socket is another file.
+        """
+        daemon = self
+
+        class Handler(StreamRequestHandler):
+            """JSON lines of a client."""
+
+            def handle(self) -> None:
+                for line in self.rfile:
+                    try:
+                        request = json.loads(line)
+                        if not isinstance(request, dict):
+                            raise ValueError("The request should be an object")
+                        answer = daemon.handle(request)
+                    except ValueError as err:
+                        answer = {"ok": False, "error": str(err)}
+                    self.wfile.write(json.dumps(answer).encode() + b"\n")
+
+        if is_unix_address(address):
+            remove_stale_socket(address)
+            unix_server = ThreadingUnixStreamServer(address, Handler)
+            unix_server.daemon_threads = True
+            self._socket = os.stat(address)
+            self._server = unix_server
+        else:
+            host, port = address.rsplit(":", 1)
+            tcp_server = ThreadingTCPServer((host, int(port)), Handler)
+            tcp_server.daemon_threads = True
+            self._server = tcp_server
+        return self._server
+
+    def serve(self, address: str = DEFAULT_DAEMON_ADDRESS) -> None:
+        """Answer the build requests until stopped.
+
+        Args:
+            address (str): 'host:port' on localhost, or the path of a Unix
+                socket.
+        """
+        with self.make_server(address) as server:
+            i_logger.info("Compile daemon listening on %s", address)
+            try:
+                server.serve_forever()
+            except KeyboardInterrupt:
+                pass
+        self._remove_socket(address)
+        i_logger.info("Compile daemon stopped")
+
+    def _remove_socket(self, address: str) -> None:
+        """Remove the Unix socket of the daemon, if it is still there.
+
+        Args:
+            address (str): The address the daemon listened on.
+        """
+        try:
+            current = os.stat(address)
+        except OSError:
+            return
+        # another daemon may have replaced it
+        if self._socket is not None and os.path.samestat(
+            current, self._socket
+        ):
+            os.remove(address)
+
+
+def send_request(
+    request: dict[str, Any],
+    address: str = DEFAULT_DAEMON_ADDRESS,
+    timeout: Optional[float] = DEFAULT_TIMEOUT,
+) -> dict[str, Any]:
+    """Send a request to a compile daemon.
+
+    Args:
+        request (dict[str, Any]): The request, e.g. {"build": "Cement"}.
+        address (str): The address of the daemon.
+        timeout (Optional[float]): The seconds to wait for the answer, or
+            None to wait forever.
+
+    Returns:
+        dict[str, Any]: The answer of the daemon.
+
+    Raises:
+        OSError: If the daemon is not running, or does not answer in time
+            (TimeoutError).
+    """
+    if is_unix_address(address):
+        connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        connection.settimeout(timeout)
+        connection.connect(address)
+    else:
+        host, port = address.rsplit(":", 1)
+        connection = socket.create_connection((host, int(port)), timeout)
+    with connection, connection.makefile("rwb") as stream:
+        stream.write(json.dumps(request).encode() + b"\n")
+        stream.flush()
+        answer: dict[str, Any] = json.loads(stream.readline())
+    return answer
@@ -0,0 +1,163 @@
+"""Discovery of the industries and their YAML files"""
+
+import os
+from dataclasses import dataclass
+from fnmatch import fnmatchcase
+from pathlib import Path
+from typing import Optional
+
+from idr_iisim.utils.documents import default_cache, load_documents
+from idr_iisim.utils.models_dict import load_yaml
+
+# Name of the manifest looked for in the directory of the industries
+MANIFEST_NAME = "manifest.yaml"
+
+
+@dataclass
+class IndustrySource:
+    """Location of the YAML files of an industry.
+
+    Attributes:
+        name (str): The name of the industry.
+        path (str): The directory of the industry.
+        files (Optional[list[str]]): The paths of its YAML files, or None if
+            they are found walking the directory.
+    """
+
+    name: str
+    path: str
+    files: Optional[list[str]] = None
+
+    def yaml_files(self) -> list[str]:
+        """Get the YAML files of the industry.
+
+        Returns:
+            list[str]: The paths of the files, from the manifest or walking
+            the directory of the industry.
+        """
+        if self.files is not None:
+            return self.files
+        return [str(file) for file in Path(self.path).rglob("*.yaml")]
+
+
+def load_manifest(path: str) -> dict[str, IndustrySource]:
+    """Load a manifest of industries.
+
+    The manifest maps every industry name to its directory ('path',
+    the name by default) and its YAML files ('files', relative to the
+    directory; all the YAML files of the directory by default), both
+    relative to the manifest:
+
+        Cement:
+          path: Cement
+          files: [meta.yaml, pre.yaml, oven.yaml, milling.yaml]
+
+    Args:
+        path (str): The path of the manifest.
+
+    Returns:
+        dict[str, IndustrySource]: The industries, by name.
+
+    Raises:
+        ValueError: If the manifest is not valid.
+    """
+    data = load_yaml(path) or {}
+    if not isinstance(data, dict):
+        raise ValueError(f"'{path}' should map industry names to files")
+    root = os.path.dirname(path)
+    sources = {}
+    for name, entry in data.items():
+        entry = entry or {}
+        if not isinstance(entry, dict) or not set(entry) <= {"path", "files"}:
+            raise ValueError(
+                f"'{name}' in '{path}' should only have a path and files"
+            )
+        directory = os.path.join(root, entry.get("path", name))
+        files = entry.get("files")
+        sources[str(name)] = IndustrySource(
+            str(name),
+            directory,
+            None
+            if files is None
+            else [os.path.join(directory, file) for file in files],
+        )
+    return sources
+
+
+def select_industries(names: list[str], only: Optional[list[str]]) -> set[str]:
+    """Select industries by name or glob pattern.
+
+    Args:
+        names (list[str]): The names of the industries.
+        only (Optional[list[str]]): The names or glob patterns (e.g.
+            'Cem*') of the industries to select, all of them if None.
+
+    Returns:
+        set[str]: The selected names.
+    """
+    if only is None:
+        return set(names)
+    return {
+        name
+        for name in names
+        if any(fnmatchcase(name, pattern) for pattern in only)
+    }
+
+
+def discover_industries(
+    industries_path: str,
+    manifest: Optional[str] = None,
+    only: Optional[list[str]] = None,
+) -> dict[str, IndustrySource]:
+    """Find the industries to build.
+
+    The industries and their YAML files are taken from the manifest, or
+    from 'manifest.yaml' in the directory of the industries if it exists.
+    Otherwise, every subdirectory is an industry, and only the directories
+    of the selected industries are walked to find their YAML files.
+
+    Args:
+        industries_path (str): The directory of the industries.
+        manifest (Optional[str]): The path of the manifest.
+        only (Optional[list[str]]): The names or glob patterns of the
+            industries to build, all of them if None.
+
+    Returns:
+        dict[str, IndustrySource]: The selected industries, by name.
+    """
+    default_manifest = os.path.join(industries_path, MANIFEST_NAME)
+    if manifest is None and os.path.isfile(default_manifest):
+        manifest = default_manifest
+    if manifest is not None:
+        sources = load_manifest(manifest)
+    else:
+        with os.scandir(industries_path) as entries:
+            sources = {
+                entry.name: IndustrySource(entry.name, entry.path)
+                for entry in entries
+                if entry.is_dir()
+            }
+    selected = select_industries(list(sources), only)
+    return {name: s for name, s in sources.items() if name in selected}
+
+
+def industry_ids(sources: dict[str, IndustrySource]) -> dict[str, str]:
+    """Find the industries by the id of their meta file.
+
+    The YAML files are only parsed, neither validated nor loaded.
+
+    Args:
+        sources (dict[str, IndustrySource]): The industries, by name.
+
+    Returns:
+        dict[str, str]: The names of the industries, by the id of their
+        meta file.
+    """
+    ids = {}
+    for name, source in sources.items():
+        for document in load_documents(source.yaml_files(), default_cache()):
+            if isinstance(document, dict) and document.get("type") == (
+                "industry"
+            ):
+                ids[str(document.get("id"))] = name
+    return ids
@@ -0,0 +1,165 @@
+"""Fast loading of the YAML files, with a cache of the parsed documents"""
+
+import contextlib
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Optional
+
+import yaml
+
+from idr_iisim.utils.timing import phase
+
+# Loader of the YAML files, the one of libyaml if it is available
+YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+# Threads reading the files of an industry
+DEFAULT_MAX_WORKERS = 8
+
+
+def parse_yaml(content: bytes) -> Any:
+    """Parse a YAML document.
+
+    Args:
+        content (bytes): The content of the YAML file.
+
+    Returns:
+        Any: The parsed document.
+    """
+    return yaml.load(content, Loader=YamlLoader)
+
+
+class DocumentCache:
+    """Parsed YAML documents stored on disk.
+
+    The documents are pickled in a file named after the hash and the size of
+    the YAML file, so an unchanged file is never parsed twice, even when it
+    is moved or another build runs. Loading a pickle can run arbitrary code,
+    so the directory should only be writable by the user of the compiler.
+
+    Attributes:
+        path (str): The directory of the cache.
+        hits (int): The documents taken from the cache.
+        misses (int): The documents parsed.
+    """
+
+    def __init__(self, path: str):
+        """Create a cache.
+
+        Args:
+            path (str): The directory of the cache, created on the first
+                write.
+        """
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def key(self, content: bytes) -> str:
+        """Get the key of the document of a YAML file.
+
+        Args:
+            content (bytes): The content of the YAML file.
+
+        Returns:
+            str: The key, made of the hash and the size of the content and
+            the version of the parser.
+        """
+        digest = hashlib.sha256(content).hexdigest()
+        return f"{digest}-{len(content)}-{yaml.__version__}"
+
+    def load(self, path: str) -> Any:
+        """Load a YAML file, from the cache if it was parsed before.
+
+        Args:
+            path (str): The path of the YAML file.
+
+        Returns:
+            Any: The parsed document.
+        """
+        with open(path, "rb") as file:
+            content = file.read()
+        cache_path = os.path.join(self.path, f"{self.key(content)}.pickle")
+        try:
+            with open(cache_path, "rb") as file:
+                data = pickle.load(file)
+            with self._lock:
+                self.hits += 1
+            return data
+        except Exception:  # pylint: disable=broad-exception-caught
+            # a corrupted pickle can raise almost anything when it is loaded
+            pass
+        data = parse_yaml(content)
+        with self._lock:
+            self.misses += 1
+        self._store(cache_path, data)
+        return data
+
+    def _store(self, cache_path: str, data: Any) -> None:
+        """Write a document to the cache, atomically.
+
+        Args:
+            cache_path (str): The path of the cached document.
+            data (Any): The parsed document.
+        """
+        temp_path = None
+        try:
+            os.makedirs(self.path, exist_ok=True)
+            with tempfile.NamedTemporaryFile(
+                dir=self.path, suffix=".tmp", delete=False
+            ) as file:
+                temp_path = file.name
+                pickle.dump(data, file, pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, cache_path)
+        except Exception:  # pylint: disable=broad-exception-caught
+            # the cache is only an optimization
+            if temp_path is not None:
+                with contextlib.suppress(OSError):
+                    os.remove(temp_path)
+
+
+def default_cache() -> Optional[DocumentCache]:
+    """Get the cache set in the environment.
+
+    The cache is only used if YAML_CACHE_PATH sets its directory.
+
+    Returns:
+        Optional[DocumentCache]: The cache, or None if it is not set.
+    """
+    path = os.environ.get("YAML_CACHE_PATH")
+    return DocumentCache(path) if path else None
+
+
+def load_documents(
+    paths: list[str],
+    cache: Optional[DocumentCache] = None,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+) -> list[Any]:
+    """Load some YAML files concurrently.
+
+    Every file is measured as a 'load_yaml' phase, in the thread that loads
+    it, if the compiler is being timed.
+
+    Args:
+        paths (list[str]): The paths of the YAML files.
+        cache (Optional[DocumentCache]): The cache of the parsed documents,
+            none by default.
+        max_workers (int): The maximum number of threads reading the files.
+
+    Returns:
+        list[Any]: The parsed documents, in the order of the paths.
+    """
+
+    def load(path: str) -> Any:
+        with phase("load_yaml", path):
+            if cache is not None:
+                return cache.load(path)
+            with open(path, "rb") as file:
+                return parse_yaml(file.read())
+
+    if len(paths) <= 1:
+        return [load(path) for path in paths]
+    with ThreadPoolExecutor(min(max_workers, len(paths))) as executor:
+        return list(executor.map(load, paths))
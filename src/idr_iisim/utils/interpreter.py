@@ -0,0 +1,43 @@
+"""Reference interpreter for industries"""
+
+from typing import Any, Optional
+
+from idr_iisim.utils.models_dict import Industry
+
+
+def evaluate_industry(
+    industry: Industry,
+    outcome: Any,
+    external: Optional[dict[str, Any]] = None,
+) -> dict[str, Any]:
+    """Evaluate an industry straight from its parsed models.
+
+    The items are evaluated in the same order as in the generated class,
+    but no code is generated: every operation runs through its compiled
+    function. This makes it possible to validate a model without compiling
+    and importing it.
+
+    Args:
+        industry (Industry): The industry to evaluate.
+        outcome (Any): The value of the industry's outcome.
+        external (Optional[dict[str, Any]]): The values of the inputs that
+            come from other industries, by input name.
+
+    Returns:
+        dict[str, Any]: The values of the outcome, demands, meta-demands
+        and outputs of the industry, i.e. the entries of its units.
+    """
+    assert industry.meta is not None
+    meta = industry.meta
+
+    values: dict[str, Any] = {}
+    for model in [meta, *industry.models.values()]:
+        for constant in model.config.constants:
+            values[constant.name] = constant.value
+    values[meta.config.outcome.name] = outcome
+    values.update(external or {})
+
+    for name, function in industry.evaluation_sequence():
+        values[name] = function(**values)
+
+    return {name: values[name] for name in meta.get_units()}
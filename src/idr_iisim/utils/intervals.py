@@ -0,0 +1,171 @@
+"""Interval arithmetic over the operations of the models"""
+
+import math
+from dataclasses import dataclass
+from functools import reduce
+from typing import Callable
+
+from sympy import Abs, Expr, Max, Min, exp, log
+
+
+@dataclass(frozen=True)
+class Interval:
+    """Closed interval of real values.
+
+    Attributes:
+        low (float): Lower bound of the interval.
+        high (float): Upper bound of the interval.
+    """
+
+    low: float
+    high: float
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "low", float(self.low))
+        object.__setattr__(self, "high", float(self.high))
+
+    def __add__(self, other: "Interval") -> "Interval":
+        return Interval(self.low + other.low, self.high + other.high)
+
+    def __mul__(self, other: "Interval") -> "Interval":
+        products = [
+            _multiply(a, b)
+            for a in (self.low, self.high)
+            for b in (other.low, other.high)
+        ]
+        return Interval(min(products), max(products))
+
+    def __pow__(self, exponent: "Interval") -> "Interval":
+        if exponent.low == exponent.high and exponent.low.is_integer():
+            return self._integer_power(int(exponent.low))
+        if self.low < 0 or (self.low == 0 and exponent.low < 0):
+            return UNBOUNDED
+        # For non-negative bases, the power is monotonic in each argument
+        powers = [
+            _power(a, b)
+            for a in (self.low, self.high)
+            for b in (exponent.low, exponent.high)
+        ]
+        return Interval(min(powers), max(powers))
+
+    def _integer_power(self, exponent: int) -> "Interval":
+        if exponent < 0:
+            return self._integer_power(-exponent).reciprocal()
+        first, last = _power(self.low, exponent), _power(self.high, exponent)
+        if exponent % 2 == 1 or self.low >= 0:
+            return Interval(first, last)
+        if self.high <= 0:
+            return Interval(last, first)
+        return Interval(0.0, max(first, last))
+
+    def reciprocal(self) -> "Interval":
+        """Get the interval of the inverse values.
+
+        Returns:
+            Interval: The interval of 1/x, which is unbounded if the
+            interval contains zero.
+        """
+        if self.low > 0 or self.high < 0:
+            return Interval(1 / self.high, 1 / self.low)
+        return UNBOUNDED
+
+    def absolute(self) -> "Interval":
+        """Get the interval of the absolute values.
+
+        Returns:
+            Interval: The interval of |x|.
+        """
+        if self.low >= 0:
+            return self
+        if self.high <= 0:
+            return Interval(-self.high, -self.low)
+        return Interval(0.0, max(-self.low, self.high))
+
+    def map_increasing(self, function: Callable[[float], float]) -> "Interval":
+        """Apply a non-decreasing function to the interval.
+
+        Args:
+            function (Callable[[float], float]): The function to apply.
+
+        Returns:
+            Interval: The interval of the values of the function.
+        """
+        return Interval(
+            _apply(function, self.low), _apply(function, self.high)
+        )
+
+
+UNBOUNDED = Interval(-math.inf, math.inf)
+
+
+def _multiply(a: float, b: float) -> float:
+    # Bounds are limits: zero times an infinite bound is zero
+    if a == 0 or b == 0:
+        return 0.0
+    return a * b
+
+
+def _power(base: float, exponent: float) -> float:
+    try:
+        return float(base**exponent)
+    except OverflowError:
+        return math.inf
+    except ZeroDivisionError:
+        return math.inf
+
+
+def _apply(function: Callable[[float], float], value: float) -> float:
+    try:
+        return function(value)
+    except OverflowError:
+        return math.inf
+
+
+def _log(value: float) -> float:
+    return math.log(value) if value > 0 else -math.inf
+
+
+def expression_bounds(
+    expression: Expr, bounds: dict[str, Interval]
+) -> Interval:
+    """Compute the bounds of an expression from the bounds of its symbols.
+
+    The bounds are guaranteed, but not necessarily tight: an operation that
+    is not supported yields an unbounded interval.
+
+    Args:
+        expression (Expr): The SymPy expression.
+        bounds (dict[str, Interval]): Bounds of the symbols. Symbols without
+            bounds are unbounded.
+
+    Returns:
+        Interval: The bounds of the expression.
+    """
+    if expression.is_Number or expression.is_NumberSymbol:
+        value = float(expression)
+        return Interval(value, value)
+    if expression.is_Symbol:
+        return bounds.get(str(expression), UNBOUNDED)
+
+    args = [expression_bounds(arg, bounds) for arg in expression.args]
+    if expression.is_Add:
+        return reduce(Interval.__add__, args)
+    if expression.is_Mul:
+        return reduce(Interval.__mul__, args)
+    if expression.is_Pow:
+        return args[0] ** args[1]
+    return _function_bounds(expression, args)
+
+
+def _function_bounds(expression: Expr, args: list[Interval]) -> Interval:
+    if isinstance(expression, exp):
+        return args[0].map_increasing(math.exp)
+    if isinstance(expression, log) and args[0].high > 0:
+        return args[0].map_increasing(_log)
+    if isinstance(expression, Abs):
+        return args[0].absolute()
+    if isinstance(expression, Min):
+        return Interval(min(a.low for a in args), min(a.high for a in args))
+    if isinstance(expression, Max):
+        return Interval(max(a.low for a in args), max(a.high for a in args))
+    return UNBOUNDED
@@ -0,0 +1,207 @@
+"""Linear constraints of affine industries in LP and MPS formats"""
+
+import math
+from dataclasses import dataclass
+
+from sympy import Expr, Symbol
+
+from idr_iisim.utils.coefficients import affine_terms, compose_expressions
+from idr_iisim.utils.intervals import UNBOUNDED
+from idr_iisim.utils.models_dict import Industry
+
+
+@dataclass
+class AffineRelation:
+    """Affine relationship of a value of an industry with its variables.
+
+    The value is the sum of the products of the coefficients and the
+    variables (the outcome and the inputs taken from other industries)
+    plus a constant term.
+
+    Attributes:
+        name (str): The name of the value.
+        coefficients (dict[str, float]): The coefficient of each variable.
+        constant (float): The constant term.
+    """
+
+    name: str
+    coefficients: dict[str, float]
+    constant: float
+
+
+def affine_relations(industry: Industry) -> list[AffineRelation]:
+    """Get the affine relationships of the values of an industry.
+
+    Args:
+        industry (Industry): The industry, with its types checked.
+
+    Returns:
+        list[AffineRelation]: The relationship of every demand, meta-demand
+        and output of the industry.
+
+    Raises:
+        ValueError: If any value is not affine in the variables, with the
+            expressions of all of them.
+    """
+    assert industry.meta is not None
+    outcome = industry.meta.config.outcome.name
+    variables = [outcome, *industry.external_input_names()]
+    symbols = [Symbol(name) for name in variables]
+    expressions = compose_expressions(
+        industry, {name: Symbol(name) for name in variables}
+    )
+
+    relations = []
+    nonlinear: list[tuple[str, Expr]] = []
+    for name, expression in expressions.items():
+        if name == outcome:
+            continue
+        terms = affine_terms(expression, symbols)
+        if terms is None:
+            nonlinear.append((name, expression))
+            continue
+        coefficients, constant = terms
+        relations.append(
+            AffineRelation(
+                name,
+                {v: c for v, c in zip(variables, coefficients) if c != 0},
+                constant,
+            )
+        )
+    if nonlinear:
+        raise ValueError(
+            f"'{industry.meta.config.name}' is not affine in "
+            + ", ".join(variables)
+            + ":\n"
+            + "\n".join(f"  {name} = {expr}" for name, expr in nonlinear)
+        )
+    return relations
+
+
+def _number(value: float) -> str:
+    if math.isinf(value):
+        return "+inf" if value > 0 else "-inf"
+    return repr(float(value))
+
+
+def _variables(industry: Industry) -> list[str]:
+    assert industry.meta is not None
+    return [
+        industry.meta.config.outcome.name,
+        *industry.external_input_names(),
+        *[
+            name
+            for name in industry.meta.get_units()
+            if name != industry.meta.config.outcome.name
+        ],
+    ]
+
+
+def lp_generator(industry: Industry) -> str:
+    """Generate the constraints of an affine industry in LP format.
+
+    Every value of the industry is a variable with the name of the YAML
+    quantity, and a constraint 'def_<name>' defines it from the outcome
+    and the inputs taken from other industries. The bounds of the
+    variables are the guaranteed bounds of the values, and the objective
+    is empty, so that the model can be embedded in another one.
+
+    Args:
+        industry (Industry): The industry, with its types checked.
+
+    Returns:
+        str: The content of the LP file.
+
+    Raises:
+        ValueError: If the industry is not affine.
+    """
+    assert industry.meta is not None
+    relations = affine_relations(industry)
+    bounds = industry.compute_bounds()
+    variables = _variables(industry)
+
+    lines = [
+        f"\\ {industry.meta.config.name}",
+        "Minimize",
+        f" obj: 0 {variables[0]}",
+        "Subject To",
+    ]
+    for relation in relations:
+        terms = [f"{relation.name}"]
+        for variable, coefficient in relation.coefficients.items():
+            sign = "-" if coefficient > 0 else "+"
+            terms.append(f"{sign} {_number(abs(coefficient))} {variable}")
+        lines.append(
+            f" def_{relation.name}: "
+            + " ".join(terms)
+            + f" = {_number(relation.constant)}"
+        )
+    lines.append("Bounds")
+    for variable in variables:
+        interval = bounds.get(variable, UNBOUNDED)
+        if math.isinf(interval.low) and math.isinf(interval.high):
+            lines.append(f" {variable} free")
+        else:
+            lines.append(
+                f" {_number(interval.low)} <= {variable}"
+                + f" <= {_number(interval.high)}"
+            )
+    lines.append("End")
+    return "\n".join(lines) + "\n"
+
+
+def mps_generator(industry: Industry) -> str:
+    """Generate the constraints of an affine industry in free MPS format.
+
+    The variables, constraints and bounds are the same as in the LP format
+    (see lp_generator).
+
+    Args:
+        industry (Industry): The industry, with its types checked.
+
+    Returns:
+        str: The content of the MPS file.
+
+    Raises:
+        ValueError: If the industry is not affine.
+    """
+    assert industry.meta is not None
+    relations = affine_relations(industry)
+    bounds = industry.compute_bounds()
+    variables = _variables(industry)
+
+    # coefficients of the constraints by variable
+    columns: dict[str, list[tuple[str, float]]] = {v: [] for v in variables}
+    columns[variables[0]].append(("obj", 0))
+    for relation in relations:
+        columns[relation.name].append((f"def_{relation.name}", 1))
+        for variable, coefficient in relation.coefficients.items():
+            columns[variable].append((f"def_{relation.name}", -coefficient))
+
+    lines = [f"NAME {industry.meta.config.short_name}", "ROWS", " N obj"]
+    lines += [f" E def_{relation.name}" for relation in relations]
+    lines.append("COLUMNS")
+    for variable, entries in columns.items():
+        for row, coefficient in entries:
+            lines.append(f" {variable} {row} {_number(coefficient)}")
+    lines.append("RHS")
+    for relation in relations:
+        if relation.constant != 0:
+            lines.append(
+                f" RHS def_{relation.name} {_number(relation.constant)}"
+            )
+    lines.append("BOUNDS")
+    for variable in variables:
+        interval = bounds.get(variable, UNBOUNDED)
+        if math.isinf(interval.low) and math.isinf(interval.high):
+            lines.append(f" FR BND {variable}")
+            continue
+        lines.append(
+            f" MI BND {variable}"
+            if math.isinf(interval.low)
+            else f" LO BND {variable} {_number(interval.low)}"
+        )
+        if not math.isinf(interval.high):
+            lines.append(f" UP BND {variable} {_number(interval.high)}")
+    lines.append("ENDATA")
+    return "\n".join(lines) + "\n"
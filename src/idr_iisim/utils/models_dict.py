@@ -2,13 +2,24 @@
 
 import json
 import math
-from typing import Any, Optional
+from fractions import Fraction
+from typing import Any, Optional, Union
 
 import yaml
 
 from idr_iisim.models.meta import Meta
+from idr_iisim.models.model import CompiledFunction, compile_operation
 from idr_iisim.models.process import Process
-from idr_iisim.templates import load_template
+from idr_iisim.templates import get_template
+from idr_iisim.utils.documents import YamlLoader
+from idr_iisim.utils.intervals import UNBOUNDED, Interval, expression_bounds
+from idr_iisim.utils.structs import InputStruct
+from idr_iisim.utils.timing import timed_phase
+from idr_iisim.utils.units import conversion_factor
+
+# Suffix of the ids of the meta files, that identifies the inputs taken from
+# other industries
+INDUSTRY_ID_SUFFIX = "-Meta"
 
 
 class Industry:
@@ -20,6 +31,9 @@ class Industry:
         self.dependencies: dict[str, set[str]] = {}
         self.processed_models: dict[str, bool] = {}
         self.meta: Optional[Meta] = meta
+        # inputs taken from other industries, with the model that uses them
+        self.external_inputs: list[tuple[Union[Meta, Process], InputStruct]]
+        self.external_inputs = []
 
     def add_process(self, key: str, process: Process) -> None:
         """add model to the industry"""
@@ -45,17 +59,39 @@ class Industry:
         """check types among processes
 
         This method checks if the types of the different inputs and demands
-        are consistent between the different processes.
+        are consistent between the different processes. Units do not need
+        to be identical, but compatible: their conversion factors are
+        folded into the operations of the models that receive the values.
+        Inputs from other industries, whose 'from' is the id of a meta
+        file (ending in '-Meta'), are collected in external_inputs, to be
+        checked once all the industries are loaded.
+
+        Raises:
+            ValueError: If an input comes from an unknown process, from an
+                output that does not exist or if the units are not compatible.
         """
         assert self.meta is not None
-        inputs_checks = [(self.meta.config.name, self.meta.config.inputs)]
-        inputs_checks += [
-            (name, model.config.inputs) for name, model in self.models.items()
+        conversions: dict[str, dict[str, Fraction]] = {}
+        inputs_checks: list[tuple[str, Union[Meta, Process]]] = [
+            (self.meta.config.name, self.meta)
         ]
-        for name, inputs in inputs_checks:
-            for input_field in inputs:
-                # Check if units are the same in both processess
-                if input_field.input_from is not None:
+        inputs_checks += list(self.models.items())
+        self.external_inputs = []
+        for name, model in inputs_checks:
+            for input_field in model.config.inputs:
+                if (
+                    input_field.input_from is not None
+                    and input_field.input_from not in self.models
+                ):
+                    if not input_field.input_from.endswith(INDUSTRY_ID_SUFFIX):
+                        raise ValueError(
+                            f"'{input_field.input_from}' of "
+                            + f"'{input_field.name}' in '{name}' is not a "
+                            + f"process of '{self.meta.config.id}'"
+                        )
+                    self.external_inputs.append((model, input_field))
+                # Check if units are compatible in both processess
+                elif input_field.input_from is not None:
                     model_from = self.models[input_field.input_from]
                     if input_field.name not in model_from.outputs:
                         raise ValueError(
@@ -63,12 +99,14 @@ class Industry:
                             + f"'{model_from.config.name}'"
                         )
                     units_from = model_from.outputs[input_field.name].units
-                    if units_from != input_field.units:
-                        raise ValueError(
-                            f"Unit for '{input_field.name}' differs in "
-                            + f"'{name}' ({input_field.units}) and "
-                            + f"'{model_from.config.name}' ({units_from})"
-                        )
+                    factor = model_conversion_factor(
+                        input_field.name,
+                        (name, input_field.units),
+                        (model_from.config.name, units_from),
+                    )
+                    if factor != 1:
+                        conversions.setdefault(name, {})
+                        conversions[name][input_field.name] = factor
         for demand in self.meta.demands.values():
             model_from = self.models[demand.used]
             if demand.name not in model_from.inputs:
@@ -77,13 +115,36 @@ class Industry:
                     + f"'{model_from.config.name}'"
                 )
             units_from = model_from.inputs[demand.name].units
-            if units_from != demand.units:
-                raise ValueError(
-                    f"Unit for '{demand.name}' differs in "
-                    + f"'Meta' ({demand.units}) and "
-                    + f"'{model_from.config.name}' ({units_from})"
+            factor = model_conversion_factor(
+                demand.name,
+                ("Meta", demand.units),
+                (model_from.config.name, units_from),
+            )
+            if factor != 1:
+                conversions.setdefault(demand.used, {})
+                conversions[demand.used][demand.name] = 1 / factor
+
+        for name, model in inputs_checks:
+            if name in conversions:
+                model.apply_conversions(conversions[name])
+        self._check_meta_demands_types()
+
+    def _check_meta_demands_types(self) -> None:
+        assert self.meta is not None
+        for demand in self.meta.demands.values():
+            if demand.meta in self.meta.meta_demands:
+                meta_demand = self.meta.meta_demands[demand.meta]
+                factor = model_conversion_factor(
+                    demand.name,
+                    ("Meta", meta_demand.units),
+                    ("Meta", demand.units),
                 )
+                if factor != 1:
+                    self.meta.apply_conversions(
+                        {demand.name: factor}, {meta_demand.name}
+                    )
 
+    @timed_phase("generate_execution_queue")
     def generate_execution_queue(self) -> list[str]:
         """Generate the correct execution queue of the processes
 
@@ -99,30 +160,208 @@ class Industry:
                 queue.append(process)
 
         # Add the rest of the processes once their dependencies are fullfilled
+        # (dependencies on other industries are fulfilled before)
         while len(queue) != len(self.models):
+            queue_length = len(queue)
             for process, dependencies in self.dependencies.items():
                 if process not in queue:
                     should_include_process = True
                     for dependency in dependencies:
-                        if dependency not in queue:
+                        if (
+                            dependency in self.models
+                            and dependency not in queue
+                        ):
                             should_include_process = False
                             break
                     if should_include_process:
                         queue.append(process)
+            if len(queue) == queue_length:
+                raise ValueError(
+                    "Circular dependencies among the processes: "
+                    + ", ".join(sorted(set(self.models) - set(queue)))
+                )
 
         return queue
 
-    def script_generator(self) -> str:
+    def external_input_names(self) -> list[str]:
+        """Get the names of the inputs taken from other industries
+
+        Returns:
+            list[str]: The names, without duplicates, in order of appearance.
+        """
+        names: list[str] = []
+        for _, input_field in self.external_inputs:
+            if input_field.name not in names:
+                names.append(input_field.name)
+        return names
+
+    def constant_names(self) -> list[str]:
+        """Get the names of the constants of the industry
+
+        Returns:
+            list[str]: The names of the constants of the meta and of every
+            process, without duplicates, in order of appearance.
+        """
+        assert self.meta is not None
+        names: list[str] = []
+        for model in [self.meta, *self.models.values()]:
+            for constant in model.config.constants:
+                if constant.name not in names:
+                    names.append(constant.name)
+        return names
+
+    def evaluation_sequence(self) -> list[tuple[str, CompiledFunction]]:
+        """Get the items of the industry in the order they are computed
+
+        The order is the same as in the generated class: the demands used
+        by each process and its outputs, following the execution queue,
+        and then the meta-demands and outputs of the meta.
+
+        Returns:
+            list[tuple[str, CompiledFunction]]: The name of each item and
+            the function that computes it.
+        """
+        assert self.meta is not None
+        sequence: list[tuple[str, CompiledFunction]] = []
+        for process_id in self.generate_execution_queue():
+            for demand in self.meta.demands.values():
+                if demand.used == process_id:
+                    function = compile_operation(demand.operation)
+                    sequence.append((demand.name, function))
+            for name, item in self.models[process_id].functions_map.items():
+                sequence.append((name, item["function"]))
+        for name in [*self.meta.meta_demands, *self.meta.outputs]:
+            sequence.append((name, self.meta.functions_map[name]["function"]))
+        return sequence
+
+    def compute_bounds(self) -> dict[str, Interval]:
+        """Compute guaranteed bounds of the values of the industry
+
+        The bounds are propagated with interval arithmetic through every
+        operation, from the range of the outcome and of the constants (or
+        their value when they have no range). The range of an input is
+        only used when its value is not computed by the industry.
+
+        Returns:
+            dict[str, Interval]: The bounds of the outcome, demands,
+            meta-demands and outputs.
+        """
+        assert self.meta is not None
+        bounds: dict[str, Interval] = {}
+        for model in [self.meta, *self.models.values()]:
+            for input_field in model.config.inputs:
+                if input_field.range:
+                    bounds[input_field.name] = Interval(
+                        input_field.range[0], input_field.range[-1]
+                    )
+            for constant in model.config.constants:
+                bounds[constant.name] = Interval(
+                    constant.value, constant.value
+                )
+                if constant.range:
+                    bounds[constant.name] = Interval(
+                        constant.range[0], constant.range[-1]
+                    )
+
+        outcome = self.meta.config.outcome
+        for name in self.external_input_names():
+            bounds.setdefault(name, UNBOUNDED)
+        bounds[outcome.name] = UNBOUNDED
+        if outcome.range:
+            bounds[outcome.name] = Interval(outcome.range[0], math.inf)
+            if len(outcome.range) > 1:
+                bounds[outcome.name] = Interval(
+                    outcome.range[0], outcome.range[1]
+                )
+
+        for name, function in self.evaluation_sequence():
+            bounds[name] = expression_bounds(function.expression, bounds)
+
+        return {name: bounds[name] for name in self.meta.get_units()}
+
+    def find_unused_items(self) -> dict[str, list[str]]:
+        """Find the items whose value is never used
+
+        This method walks the dependencies of the items back from the
+        getters of the industry (its outcome, demands, meta-demands and
+        outputs). The process outputs and the demands aggregated in
+        meta-demands that are not reached are never read.
+
+        Returns:
+            dict[str, list[str]]: The names of the unused items, by the id
+            of the model (process or meta) that computes them.
+        """
+        assert self.meta is not None
+        # item name -> names of the symbols used to compute it
+        symbols: dict[str, set[str]] = {}
+        owners: dict[str, str] = {}
+        for key, model in self.models.items():
+            for name, item in model.functions_map.items():
+                symbols[name] = {
+                    str(s) for s in item["expression"].free_symbols
+                }
+                owners[name] = key
+        for demand in self.meta.demands.values():
+            expression = compile_operation(demand.operation).expression
+            symbols[demand.name] = {str(s) for s in expression.free_symbols}
+            owners[demand.name] = self.meta.config.id
+        for name, item in self.meta.functions_map.items():
+            symbols[name] = {str(s) for s in item["expression"].free_symbols}
+            owners[name] = self.meta.config.id
+
+        used: set[str] = set()
+        pending = list(self.meta.get_units())
+        while pending:
+            name = pending.pop()
+            if name not in used:
+                used.add(name)
+                pending.extend(symbols.get(name, set()))
+
+        unused: dict[str, list[str]] = {}
+        for name, owner in owners.items():
+            if name not in used:
+                unused.setdefault(owner, []).append(name)
+        return unused
+
+    def function_generator(self, exclude: Optional[set[str]] = None) -> str:
+        """Generator of the body of the evaluation function
+
+        The items are computed as local variables, in the same order as in
+        the generated class, so that the function works both with floats
+        and with arrays.
+
+        Args:
+            exclude (Optional[set[str]]): Names of the items to leave out.
+        """
+        exclude = exclude or set()
+        lines = [
+            f"{name} = {function.expression}"
+            for name, function in self.evaluation_sequence()
+            if name not in exclude
+        ]
+        return "\n    ".join(lines)
+
+    def script_generator(
+        self, optimize: bool = False, instrument: bool = False
+    ) -> str:
         """Generator of the script
 
         This method generates the model (the Python class) of the industry
+
+        Args:
+            optimize (bool): If true, the items whose value is never used
+                are not computed by the generated class.
+            instrument (bool): If true, the calls of the process methods,
+                the constructor, evaluate and profile are counted and
+                timed, and read with the stats class method. Otherwise,
+                the generated code has no instrumentation at all.
         """
         assert self.meta is not None
         # Load the template content
-        template_path = "templates/template_generated_industrial_class.txt"
-        method_template = load_template(template_path)
+        method_template = get_template(
+            "templates/template_generated_industrial_class.txt"
+        )
 
-        args = "self"
         constructor = ""
         constants = []
         process_methods = []
@@ -136,35 +375,134 @@ class Industry:
 
         constants.append(self.meta.constants_generator())
 
+        exclude: set[str] = set()
+        if optimize:
+            exclude = set().union(*self.find_unused_items().values())
+
         for model_name in self.generate_execution_queue():
             model = self.models[model_name]
-            process_methods.append(model.process_methods_generator())
             constants.append(model.constants_generator())
-            constructor += self.meta.constructor_pre_generator(model.config.id)
-            constructor += model.process_call_method_generator()
+            constructor += self.meta.constructor_pre_generator(
+                model.config.id, exclude
+            )
+            if model.has_outputs(exclude):
+                process_methods.append(
+                    model.process_methods_generator(exclude, instrument)
+                )
+                constructor += model.process_call_method_generator(exclude)
             constructor += "\n        "
 
         constructor += self.meta.constructor_post_generator()
 
         outcome_name = self.meta.config.outcome.name
-        args += ", " + outcome_name
+        function_args = ", ".join([outcome_name, *self.external_input_names()])
+        constructor = (
+            "".join(
+                f"self.__{name} = {name}\n        "
+                for name in self.external_input_names()
+            )
+            + constructor
+        )
 
         return method_template.substitute(
             name=self.meta.config.short_name,
             fullname=f'"{self.meta.config.name}"',
+            version=self.meta.config.version,
             description=self.meta.config.description,
             outcome_name=outcome_name,
             constructor_method=constructor,
             constants="\n".join(constants),
-            args=args,
+            args=f"self, {function_args}",
             process_methods="\n".join(process_methods),
             get_methods=self.meta.getters_generator(),
+            **_instrumentation_generator(instrument),
             units=json.dumps(units, indent=4),
+            bounds=_bounds_generator(self.compute_bounds()),
             min_units=min_units,
             max_units=max_units,
+            function_args=function_args,
+            evaluate_args=_evaluate_args(function_args, self.constant_names()),
+            function_body=self.function_generator(exclude),
+            function_results="\n".join(
+                f'        "{name}": {name},' for name in units
+            ),
         )
 
 
+def model_conversion_factor(
+    name: str, target: tuple[str, str], source: tuple[str, str]
+) -> Fraction:
+    """Get the factor converting a value between the units of two models
+
+    :param name: name of the value.
+    :param target: name of the model that receives the value and its units.
+    :param source: name of the model that provides the value and its units.
+    """
+    try:
+        return conversion_factor(source[1], target[1])
+    except ValueError as e:
+        raise ValueError(
+            f"Unit for '{name}' differs in "
+            + f"'{target[0]}' ({target[1]}) and "
+            + f"'{source[0]}' ({source[1]})"
+        ) from e
+
+
+def _evaluate_args(function_args: str, constants: list[str]) -> str:
+    """Generate the arguments of the evaluation function
+
+    The constants are keyword-only arguments whose default values are the
+    module constants, so that they can be replaced.
+
+    :param function_args: the outcome and the external inputs.
+    :param constants: the names of the constants.
+    """
+    if not constants:
+        return function_args
+    args = [*function_args.split(", "), "*"]
+    args += [f"{name}={name}" for name in constants]
+    return "".join(f"\n    {arg}," for arg in args) + "\n"
+
+
+def _bounds_generator(bounds: dict[str, Interval]) -> str:
+    lines = [
+        f'    "{name}": ({interval.low!r}, {interval.high!r})'
+        for name, interval in bounds.items()
+    ]
+    return "{\n" + ",\n".join(lines) + "\n}"
+
+
+def _instrumentation_generator(instrument: bool) -> dict[str, str]:
+    """Generate the instrumentation of the class of an industry.
+
+    Args:
+        instrument (bool): Whether to instrument the class.
+
+    Returns:
+        dict[str, str]: The code of the instrumentation placeholders of the
+        template, all of them empty if the class is not instrumented.
+    """
+    if not instrument:
+        return {
+            "instrumentation": "",
+            "stats_methods": "",
+            "evaluate_instrumentation": "",
+            "profile_decorator": "",
+            "init_decorator": "",
+        }
+    return {
+        "instrumentation": get_template(
+            "templates/template_generated_instrumentation.txt"
+        ).substitute(),
+        "stats_methods": get_template(
+            "templates/template_generated_stats_methods.txt"
+        ).substitute(),
+        "evaluate_instrumentation": 'evaluate = _timed("evaluate")(evaluate)\n',
+        "profile_decorator": '@_timed("profile")\n',
+        "init_decorator": '@_timed("__init__")\n    ',
+    }
+
+
 def load_yaml(path: str) -> dict[str, Any]:
     """load industry's yaml file
 
@@ -172,7 +510,7 @@ def load_yaml(path: str) -> dict[str, Any]:
     """
     try:
         with open(path, encoding="utf-8") as file:
-            data: dict[str, Any] = yaml.safe_load(file)
+            data: dict[str, Any] = yaml.load(file, Loader=YamlLoader)
             return data
     except Exception as e:
         raise e
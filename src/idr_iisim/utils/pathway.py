@@ -0,0 +1,245 @@
+"""Multi-year pathway simulation on top of the generated industries"""
+
+import inspect
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from types import ModuleType
+from typing import Any, Optional
+
+import numpy as np
+
+from idr_iisim.utils.verification import load_generated_module
+
+
+@dataclass
+class PathwayResult:
+    """Values of an industry along many pathways.
+
+    Attributes:
+        years (np.ndarray): The simulated years.
+        names (list[str]): The names of the values (outcome, demands,
+            meta-demands and outputs), in the order of the last axis.
+        values (np.ndarray): The values, by pathway, year and name.
+        capacity (np.ndarray): The installed capacity at the end of every
+            year, by pathway and year.
+        additions (np.ndarray): The capacity added during every year, by
+            pathway and year.
+
+    The capacity is bookkeeping of the production: it does not change the
+    evaluated values.
+    """
+
+    years: np.ndarray
+    names: list[str]
+    values: np.ndarray
+    capacity: np.ndarray
+    additions: np.ndarray
+
+    def value(self, name: str) -> np.ndarray:
+        """Get the values of an item along the pathways.
+
+        Args:
+            name (str): The name of the item.
+
+        Returns:
+            np.ndarray: The values, by pathway and year.
+        """
+        return np.asarray(self.values[..., self.names.index(name)])
+
+
+def constant_names(module: ModuleType) -> list[str]:
+    """Get the constants of a generated industry that can be replaced.
+
+    Args:
+        module (ModuleType): The generated module of the industry.
+
+    Returns:
+        list[str]: The keyword arguments of its evaluate function.
+    """
+    return [
+        name
+        for name, parameter in inspect.signature(
+            module.evaluate
+        ).parameters.items()
+        if parameter.kind == inspect.Parameter.KEYWORD_ONLY
+    ]
+
+
+def capacity_stock(
+    production: np.ndarray, initial_capacity: Any, retirement_rate: float
+) -> tuple[np.ndarray, np.ndarray]:
+    """Compute the installed capacity needed by the production.
+
+    Every year, a fraction of the capacity of the previous year retires,
+    and new capacity is added when the remaining one does not cover the
+    production of the year. The years are computed in sequence, but all the
+    pathways at once.
+
+    Args:
+        production (np.ndarray): The production, by pathway and year.
+        initial_capacity (Any): The capacity before the first year, for all
+            the pathways or by pathway.
+        retirement_rate (float): The fraction of the capacity that retires
+            every year.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: The capacity at the end of every year
+        and the capacity added during every year, by pathway and year.
+    """
+    capacity = np.empty_like(production)
+    additions = np.empty_like(production)
+    previous = np.broadcast_to(
+        np.asarray(initial_capacity, dtype=production.dtype),
+        production.shape[:-1],
+    )
+    for year in range(production.shape[-1]):
+        remaining = previous * (1 - retirement_rate)
+        capacity[..., year] = np.maximum(remaining, production[..., year])
+        additions[..., year] = capacity[..., year] - remaining
+        previous = capacity[..., year]
+    return capacity, additions
+
+
+def _simulate(
+    module_path: str,
+    production: np.ndarray,
+    constants: dict[str, np.ndarray],
+    initial_capacity: np.ndarray,
+    retirement_rate: float,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Simulate a set of pathways in one vectorised pass.
+
+    Args:
+        module_path (str): The path of the generated module.
+        production (np.ndarray): The production, by pathway and year.
+        constants (dict[str, np.ndarray]): The trajectories of the constants,
+            broadcastable to the production.
+        initial_capacity (np.ndarray): The initial capacity by pathway.
+        retirement_rate (float): The fraction of capacity retired yearly.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray, np.ndarray]: The values by pathway,
+        year and name, the capacity and the capacity additions.
+    """
+    module = load_generated_module(module_path)
+    results = module.evaluate(production, **constants)
+    values = np.stack(
+        [
+            np.broadcast_to(np.asarray(value, dtype=float), production.shape)
+            for value in results.values()
+        ],
+        axis=-1,
+    )
+    capacity, additions = capacity_stock(
+        production, initial_capacity, retirement_rate
+    )
+    return values, capacity, additions
+
+
+def _trajectories(
+    module: ModuleType, constants: dict[str, Any], shape: tuple[int, ...]
+) -> dict[str, np.ndarray]:
+    """Validate the trajectories of the constants.
+
+    Args:
+        module (ModuleType): The generated module of the industry.
+        constants (dict[str, Any]): The trajectories by constant name.
+        shape (tuple[int, ...]): The number of pathways and years.
+
+    Returns:
+        dict[str, np.ndarray]: The trajectories, by pathway and year.
+
+    Raises:
+        ValueError: If a constant does not exist or its trajectory does not
+            cover the years.
+    """
+    known = constant_names(module)
+    trajectories = {}
+    for name, trajectory in constants.items():
+        if name not in known:
+            raise ValueError(f"'{name}' is not a constant of the industry")
+        trajectory = np.asarray(trajectory, dtype=float)
+        if trajectory.ndim > 0 and trajectory.shape[-1] != shape[-1]:
+            raise ValueError(f"'{name}' should have {shape[-1]} years")
+        trajectories[name] = np.broadcast_to(trajectory, shape)
+    return trajectories
+
+
+def simulate_pathways(  # pylint: disable=too-many-arguments
+    module_path: str,
+    years: Any,
+    production: Any,
+    *,
+    constants: Optional[dict[str, Any]] = None,
+    initial_capacity: Any = 0.0,
+    retirement_rate: float = 0.0,
+    max_workers: int = 1,
+) -> PathwayResult:
+    """Simulate an industry along many pathways over many years.
+
+    The constants of the industry are replaced by their trajectories (a
+    value per year, or per pathway and year), and every year of every
+    pathway is evaluated in one vectorised pass of the generated module.
+    With several workers, the pathways are split among a process pool.
+    The installed capacity is derived from the production afterwards, for
+    bookkeeping only: it is not an input of the evaluation.
+
+    Args:
+        module_path (str): The path of the generated module.
+        years (Any): The simulated years.
+        production (Any): The outcome (production schedule) of the
+            industry, by year or by pathway and year.
+        constants (Optional[dict[str, Any]]): The trajectories of the
+            constants that change over time, by name.
+        initial_capacity (Any): The capacity before the first year, for all
+            the pathways or by pathway.
+        retirement_rate (float): The fraction of the capacity that retires
+            every year.
+        max_workers (int): The number of processes.
+
+    Returns:
+        PathwayResult: The values, by pathway, year and name.
+
+    Raises:
+        ValueError: If a constant does not exist or the trajectories do not
+            cover the years.
+    """
+    years = np.asarray(years)
+    production = np.atleast_2d(np.asarray(production, dtype=float))
+    if production.shape[-1] != len(years):
+        raise ValueError(f"The production should have {len(years)} years")
+    module = load_generated_module(module_path)
+    trajectories = _trajectories(module, constants or {}, production.shape)
+    capacity = np.broadcast_to(
+        np.asarray(initial_capacity, dtype=float), production.shape[:-1]
+    )
+
+    chunks = np.array_split(
+        np.arange(len(production)), max(1, min(max_workers, len(production)))
+    )
+    args = [
+        (
+            module_path,
+            production[chunk],
+            {name: value[chunk] for name, value in trajectories.items()},
+            capacity[chunk],
+            retirement_rate,
+        )
+        for chunk in chunks
+    ]
+    if len(args) == 1:
+        results = [_simulate(*args[0])]
+    else:
+        with ProcessPoolExecutor(
+            max_workers=min(len(args), os.cpu_count() or 1)
+        ) as executor:
+            results = list(executor.map(_simulate, *zip(*args)))
+
+    return PathwayResult(
+        years=years,
+        names=list(module.UNITS),
+        values=np.concatenate([r[0] for r in results]),
+        capacity=np.concatenate([r[1] for r in results]),
+        additions=np.concatenate([r[2] for r in results]),
+    )
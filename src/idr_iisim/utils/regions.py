@@ -0,0 +1,228 @@
+"""Region-indexed constants bound to the generated industries at runtime"""
+
+import csv
+import inspect
+import math
+from dataclasses import dataclass
+from types import ModuleType
+from typing import Any, Optional
+
+import numpy as np
+
+from idr_iisim.utils.pathway import constant_names
+
+# Column of the region codes
+REGION_COLUMN = "region"
+
+
+def _cell_value(cell: Optional[str], where: str) -> float:
+    """Get the value of a cell of a CSV file.
+
+    Args:
+        cell (Optional[str]): The cell, None if the row is short.
+        where (str): The file and the line of the cell, for the errors.
+
+    Returns:
+        float: The value, NaN if the cell is empty.
+
+    Raises:
+        ValueError: If the cell is not empty and not a number, e.g. if it
+            only has spaces.
+    """
+    if not cell:
+        return math.nan
+    try:
+        return float(cell)
+    except ValueError:
+        raise ValueError(f"{where}: '{cell}' is not a number") from None
+
+
+@dataclass
+class ConstantsTable:
+    """Values of some constants of an industry by region.
+
+    Missing values are NaN, and take the value of the YAML file when the
+    table is bound to an industry.
+
+    Attributes:
+        regions (list[str]): The region codes (e.g. NUTS-3 codes).
+        columns (dict[str, np.ndarray]): The value of every constant for
+            each region, by constant name.
+    """
+
+    regions: list[str]
+    columns: dict[str, np.ndarray]
+
+    @classmethod
+    def from_csv(cls, path: str) -> "ConstantsTable":
+        """Load a table from a CSV file.
+
+        The file has a 'region' column with the region codes and a column
+        per constant. Empty cells of the constants are missing values. A
+        byte-order mark, as written by some spreadsheets, is skipped.
+
+        Args:
+            path (str): The path of the file.
+
+        Returns:
+            ConstantsTable: The loaded table.
+
+        Raises:
+            ValueError: If the file has no 'region' column, a region code is
+                empty or a value is not a number.
+        """
+        with open(path, "r", encoding="utf-8-sig", newline="") as f:
+            rows = list(csv.DictReader(f))
+        names = list(rows[0]) if rows else []
+        if REGION_COLUMN not in names:
+            raise ValueError(f"'{path}' has no '{REGION_COLUMN}' column")
+        regions = []
+        columns: dict[str, list[float]] = {
+            name: [] for name in names if name != REGION_COLUMN
+        }
+        # the header is the first line
+        for line, row in enumerate(rows, start=2):
+            region = (row[REGION_COLUMN] or "").strip()
+            if not region:
+                raise ValueError(f"'{path}', line {line}: empty region code")
+            regions.append(region)
+            for name, column in columns.items():
+                column.append(_cell_value(row[name], f"'{path}', line {line}"))
+        return cls(
+            regions=regions,
+            columns={
+                name: np.array(column) for name, column in columns.items()
+            },
+        )
+
+    @classmethod
+    def from_npz(cls, path: str) -> "ConstantsTable":
+        """Load a table from a NumPy .npz file.
+
+        The file has a 'region' array with the region codes and an array
+        per constant. NaN values are missing values.
+
+        Args:
+            path (str): The path of the file.
+
+        Returns:
+            ConstantsTable: The loaded table.
+
+        Raises:
+            ValueError: If the file has no 'region' array.
+        """
+        with np.load(path) as data:
+            if REGION_COLUMN not in data:
+                raise ValueError(f"'{path}' has no '{REGION_COLUMN}' array")
+            return cls(
+                regions=[
+                    str(region)
+                    for region in np.asarray(data[REGION_COLUMN], dtype=str)
+                ],
+                columns={
+                    name: data[name].astype(float)
+                    for name in data.files
+                    if name != REGION_COLUMN
+                },
+            )
+
+    @classmethod
+    def load(cls, path: str) -> "ConstantsTable":
+        """Load a table from a CSV or a NumPy .npz file.
+
+        Args:
+            path (str): The path of the file.
+
+        Returns:
+            ConstantsTable: The loaded table.
+        """
+        if path.endswith(".npz"):
+            return cls.from_npz(path)
+        return cls.from_csv(path)
+
+    def bind(
+        self, module: ModuleType, regions: Optional[list[str]] = None
+    ) -> dict[str, np.ndarray]:
+        """Get the constants of some regions for a generated industry.
+
+        Args:
+            module (ModuleType): The generated module of the industry.
+            regions (Optional[list[str]]): The region codes, all the regions
+                of the table by default.
+
+        Returns:
+            dict[str, np.ndarray]: The value of every constant of the table
+            for each region, with the missing values replaced by the value
+            of the YAML file.
+
+        Raises:
+            ValueError: If a constant or a region does not exist.
+        """
+        defaults = _constant_defaults(module)
+        unknown = set(self.columns) - set(defaults)
+        if unknown:
+            raise ValueError(
+                "Not constants of the industry: " + ", ".join(sorted(unknown))
+            )
+        index = {region: i for i, region in enumerate(self.regions)}
+        missing = [r for r in regions or [] if r not in index]
+        if missing:
+            raise ValueError("Unknown regions: " + ", ".join(missing))
+        rows = [index[r] for r in regions] if regions else slice(None)
+
+        constants = {}
+        for name, column in self.columns.items():
+            values = column[rows]
+            constants[name] = np.where(
+                np.isnan(values), defaults[name], values
+            )
+        return constants
+
+
+def _constant_defaults(module: ModuleType) -> dict[str, Any]:
+    parameters = inspect.signature(module.evaluate).parameters
+    return {name: parameters[name].default for name in constant_names(module)}
+
+
+def evaluate_regions(
+    module: ModuleType,
+    table: ConstantsTable,
+    outcomes: Any,
+    regions: Optional[list[str]] = None,
+) -> dict[str, Any]:
+    """Evaluate a generated industry with the constants of every region.
+
+    The outcomes have a value per region (1-D), or a row per region (2-D,
+    e.g. regions by years), and all the regions are evaluated in one
+    vectorised call.
+
+    Args:
+        module (ModuleType): The generated module of the industry.
+        table (ConstantsTable): The constants by region.
+        outcomes (Any): The outcomes of the regions.
+        regions (Optional[list[str]]): The region codes of the outcomes, all
+            the regions of the table by default.
+
+    Returns:
+        dict[str, Any]: The values of the industry, with the shape of the
+        outcomes.
+
+    Raises:
+        ValueError: If a constant or a region does not exist, or the
+            outcomes do not have a value per region.
+    """
+    outcomes = np.asarray(outcomes, dtype=float)
+    constants = table.bind(module, regions)
+    count = len(regions or table.regions)
+    if outcomes.ndim == 0 or outcomes.shape[0] != count:
+        raise ValueError(f"The outcomes should have {count} regions")
+    # the constants of each region are broadcast along its row
+    shape = (count,) + (1,) * (outcomes.ndim - 1)
+    return dict(
+        module.evaluate(
+            outcomes,
+            **{
+                name: value.reshape(shape) for name, value in constants.items()
+            },
+        )
+    )
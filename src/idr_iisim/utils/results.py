@@ -0,0 +1,265 @@
+"""Results of the generated industries in one contiguous buffer"""
+
+import json
+import math
+import struct
+from dataclasses import asdict, dataclass
+from multiprocessing.shared_memory import SharedMemory
+from types import ModuleType
+from typing import Any, Optional
+
+import numpy as np
+
+# Start of every buffer: magic bytes and length of the header
+MAGIC = b"IDRR"
+_PREFIX = struct.Struct("<4sI")
+# Alignment of the columns in the buffer
+ALIGNMENT = 64
+
+
+@dataclass
+class ResultHeader:
+    """Description of the columns of a result buffer.
+
+    Attributes:
+        names (list[str]): The names of the columns, as in UNITS.
+        units (list[str]): The units of every column.
+        version (str): The version of the model that computed the values.
+        shape (list[int]): The shape of the values of every column.
+        dtype (str): The type of the values.
+    """
+
+    names: list[str]
+    units: list[str]
+    version: str
+    shape: list[int]
+    dtype: str = "<f8"
+
+    @property
+    def offset(self) -> int:
+        """Position of the first column in the buffer."""
+        size = _PREFIX.size + len(self.encode())
+        return -(-size // ALIGNMENT) * ALIGNMENT
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the buffer, with the header and the columns."""
+        return (
+            self.offset
+            + len(self.names)
+            * math.prod(self.shape)
+            * np.dtype(self.dtype).itemsize
+        )
+
+    def encode(self) -> bytes:
+        """Encode the header.
+
+        Returns:
+            bytes: The header in JSON.
+        """
+        return json.dumps(asdict(self)).encode("utf-8")
+
+    @classmethod
+    def decode(cls, buffer: Any) -> "ResultHeader":
+        """Decode the header at the start of a buffer.
+
+        Args:
+            buffer (Any): The buffer.
+
+        Returns:
+            ResultHeader: The header.
+
+        Raises:
+            ValueError: If the buffer does not start with a header.
+        """
+        view = memoryview(buffer).cast("B")
+        if len(view) < _PREFIX.size:
+            raise ValueError("The buffer has no result header")
+        magic, length = _PREFIX.unpack_from(view)
+        if magic != MAGIC:
+            raise ValueError("The buffer has no result header")
+        start = _PREFIX.size
+        return cls(**json.loads(bytes(view[start : start + length])))
+
+
+class ResultBuffer:
+    """Values of an industry in one contiguous buffer, a column per value.
+
+    The buffer starts with a header (see ResultHeader) followed by the
+    columns, each of them contiguous. Any object with the buffer protocol
+    can hold the buffer (a bytearray, a memoryview, the buffer of a shared
+    memory block, a memory-mapped file), so that other processes attach to
+    the results without copying them.
+
+    Attributes:
+        header (ResultHeader): The description of the columns.
+        buffer (memoryview): The whole buffer, with the header.
+        data (np.ndarray): The values by column, a view on the buffer.
+    """
+
+    def __init__(self, header: ResultHeader, buffer: Any):
+        """Use a buffer that starts with its header.
+
+        Args:
+            header (ResultHeader): The description of the columns.
+            buffer (Any): The buffer.
+
+        Raises:
+            ValueError: If the buffer is too small for the columns.
+        """
+        self.header = header
+        self.buffer = memoryview(buffer).cast("B")
+        if len(self.buffer) < header.nbytes:
+            raise ValueError(
+                f"The buffer has {len(self.buffer)} bytes instead of "
+                + f"{header.nbytes}"
+            )
+        self.data: np.ndarray = np.ndarray(
+            (len(header.names), math.prod(header.shape)),
+            dtype=header.dtype,
+            buffer=self.buffer,
+            offset=header.offset,
+        )
+
+    def __buffer__(self, _flags: int) -> memoryview:
+        """Export the buffer, e.g. with memoryview(result) (Python 3.12+)."""
+        return self.buffer
+
+    @classmethod
+    def allocate(
+        cls, header: ResultHeader, buffer: Optional[Any] = None
+    ) -> "ResultBuffer":
+        """Write a header at the start of a buffer.
+
+        Args:
+            header (ResultHeader): The description of the columns.
+            buffer (Optional[Any]): A writable buffer of at least
+                header.nbytes bytes, a new one by default.
+
+        Returns:
+            ResultBuffer: The results, with the values to be written.
+        """
+        if buffer is None:
+            buffer = bytearray(header.nbytes)
+        encoded = header.encode()
+        view = memoryview(buffer).cast("B")
+        _PREFIX.pack_into(view, 0, MAGIC, len(encoded))
+        view[_PREFIX.size : _PREFIX.size + len(encoded)] = encoded
+        return cls(header, view)
+
+    @classmethod
+    def attach(cls, buffer: Any) -> "ResultBuffer":
+        """Use the results in a buffer, without copying them.
+
+        Args:
+            buffer (Any): The buffer, which starts with its header.
+
+        Returns:
+            ResultBuffer: The results.
+
+        Raises:
+            ValueError: If the buffer does not hold results.
+        """
+        return cls(ResultHeader.decode(buffer), buffer)
+
+    @classmethod
+    def from_values(
+        cls,
+        values: dict[str, Any],
+        units: dict[str, str],
+        version: str,
+        buffer: Optional[Any] = None,
+    ) -> "ResultBuffer":
+        """Pack the values of an industry.
+
+        Args:
+            values (dict[str, Any]): The values, by name (e.g. the result of
+                evaluate), floats or arrays of the same shape.
+            units (dict[str, str]): The units of the values, by name.
+            version (str): The version of the model.
+            buffer (Optional[Any]): A writable buffer, a new one by default.
+
+        Returns:
+            ResultBuffer: The results.
+        """
+        shape = np.broadcast_shapes(*(np.shape(v) for v in values.values()))
+        header = ResultHeader(
+            names=list(values),
+            units=[units.get(name, "") for name in values],
+            version=version,
+            shape=list(shape),
+        )
+        result = cls.allocate(header, buffer)
+        for column, value in zip(result.data, values.values()):
+            column[...] = np.broadcast_to(value, shape).ravel()
+        return result
+
+    @classmethod
+    def from_module(
+        cls,
+        module: ModuleType,
+        values: dict[str, Any],
+        buffer: Optional[Any] = None,
+    ) -> "ResultBuffer":
+        """Pack the values computed by a generated industry.
+
+        Args:
+            module (ModuleType): The generated module of the industry.
+            values (dict[str, Any]): The values computed by its evaluate
+                function.
+            buffer (Optional[Any]): A writable buffer, a new one by default.
+
+        Returns:
+            ResultBuffer: The results, with a column per entry in UNITS.
+        """
+        return cls.from_values(
+            {name: values[name] for name in module.UNITS},
+            module.UNITS,
+            module.VERSION,
+            buffer,
+        )
+
+    def to_shared_memory(self, name: Optional[str] = None) -> SharedMemory:
+        """Copy the results to a new shared memory block.
+
+        Other processes attach to them with
+        ResultBuffer.attach(SharedMemory(name).buf).
+
+        Args:
+            name (Optional[str]): The name of the block, a random one by
+                default.
+
+        Returns:
+            SharedMemory: The block, to be closed and unlinked by the caller.
+        """
+        memory = SharedMemory(name=name, create=True, size=self.header.nbytes)
+        assert memory.buf is not None
+        memory.buf[: self.header.nbytes] = self.buffer[: self.header.nbytes]
+        return memory
+
+    def column(self, name: str) -> np.ndarray:
+        """Get the values of a column, without copying them.
+
+        Args:
+            name (str): The name of the column.
+
+        Returns:
+            np.ndarray: The values, with the shape of the header.
+        """
+        return np.reshape(
+            self.data[self.header.names.index(name)], self.header.shape
+        )
+
+    def values(self) -> dict[str, np.ndarray]:
+        """Get the values of every column, without copying them.
+
+        Returns:
+            dict[str, np.ndarray]: The values by name, as returned by the
+            evaluate function of the industry.
+        """
+        return {name: self.column(name) for name in self.header.names}
+
+    def release(self) -> None:
+        """Release the buffer, e.g. before closing its shared memory."""
+        del self.data
+        self.buffer.release()
@@ -0,0 +1,453 @@
+"""Local evaluation service of the generated industries"""
+
+import inspect
+import json
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from socketserver import BaseServer, ThreadingMixIn, UnixStreamServer
+from types import ModuleType
+from typing import Any, Callable, Optional
+
+import numpy as np
+
+from idr_iisim.utils.logger import i_logger
+from idr_iisim.utils.pathway import constant_names
+from idr_iisim.utils.results import ResultBuffer
+from idr_iisim.utils.sockets import is_unix_address, remove_stale_socket
+from idr_iisim.utils.verification import load_module
+
+# Default address of the service
+DEFAULT_ADDRESS = "127.0.0.1:8000"
+# Seconds between the checks of the YAML files
+DEFAULT_RELOAD_INTERVAL = 1.0
+BINARY_TYPE = "application/octet-stream"
+
+
+@dataclass
+class ServedIndustry:
+    """Industry kept in memory by the service.
+
+    Attributes:
+        source_path (str): The directory of its YAML files.
+        module_path (str): The path of its generated module.
+        module (ModuleType): The loaded module.
+        mtime (float): The last modification time of its YAML files when
+            the module was generated.
+    """
+
+    source_path: str
+    module_path: str
+    module: ModuleType
+    mtime: float
+
+
+class ServiceStats:  # pylint: disable=too-many-instance-attributes
+    """Request counters of the service, safe to update from many threads."""
+
+    def __init__(self) -> None:
+        """Start the counters."""
+        self._lock = threading.Lock()
+        self.start = time.monotonic()
+        self.requests = 0
+        self.errors = 0
+        self.scenarios = 0
+        self.reloads = 0
+        self.latency = 0.0
+        self.max_latency = 0.0
+
+    def record(self, latency: float, scenarios: int, error: bool) -> None:
+        """Count a request.
+
+        Args:
+            latency (float): The seconds spent answering it.
+            scenarios (int): The number of scenarios evaluated.
+            error (bool): Whether it failed.
+        """
+        with self._lock:
+            self.requests += 1
+            self.errors += int(error)
+            self.scenarios += scenarios
+            self.latency += latency
+            self.max_latency = max(self.max_latency, latency)
+
+    def count_reload(self) -> None:
+        """Count a reload of an industry."""
+        with self._lock:
+            self.reloads += 1
+
+    def snapshot(self) -> dict[str, Any]:
+        """Get the counters.
+
+        Returns:
+            dict[str, Any]: The counters, the mean and maximum latencies in
+            seconds, and the throughput since the start.
+        """
+        with self._lock:
+            uptime = time.monotonic() - self.start
+            return {
+                "uptime": uptime,
+                "requests": self.requests,
+                "errors": self.errors,
+                "scenarios": self.scenarios,
+                "reloads": self.reloads,
+                "latency": {
+                    "mean": self.latency / self.requests
+                    if self.requests
+                    else 0.0,
+                    "max": self.max_latency,
+                },
+                "throughput": {
+                    "requests": self.requests / uptime,
+                    "scenarios": self.scenarios / uptime,
+                },
+            }
+
+
+def source_mtime(source_path: str) -> float:
+    """Get the last modification time of the YAML files of an industry.
+
+    Args:
+        source_path (str): The directory of the YAML files.
+
+    Returns:
+        float: The latest modification time.
+    """
+    return max(
+        (file.stat().st_mtime for file in Path(source_path).rglob("*.yaml")),
+        default=0.0,
+    )
+
+
+class EvaluationService:
+    """Generated industries kept warm in memory to answer evaluations.
+
+    When the YAML files of some industries change, they are built again,
+    with the industries that depend on them, and their modules are
+    replaced at once: the evaluations in progress finish with the previous
+    modules, and a failed build keeps them.
+    """
+
+    def __init__(self, build: Callable[[set[str]], dict[str, str]]):
+        """Create an empty service.
+
+        Args:
+            build (Callable[[set[str]], dict[str, str]]): The function that
+                generates the modules of the industries with the given
+                names, and of the industries that depend on them, and
+                returns the paths of the modules by industry name.
+        """
+        self.build = build
+        self.stats = ServiceStats()
+        self._industries: dict[str, ServedIndustry] = {}
+        self._lock = threading.Lock()
+        self._loads = 0
+
+    def _load(self, name: str, module_path: str) -> ModuleType:
+        with self._lock:
+            self._loads += 1
+            loads = self._loads
+        return load_module(module_path, f"_served_{name}_{loads}")
+
+    def add_industry(
+        self, name: str, source_path: str, module_path: str
+    ) -> None:
+        """Serve an industry whose module is already generated.
+
+        Args:
+            name (str): The name of the industry.
+            source_path (str): The directory of its YAML files.
+            module_path (str): The path of its generated module.
+        """
+        served = ServedIndustry(
+            source_path,
+            module_path,
+            self._load(name, module_path),
+            source_mtime(source_path),
+        )
+        with self._lock:
+            self._industries[name] = served
+
+    def industry(self, name: str) -> ModuleType:
+        """Get the module of an industry.
+
+        Args:
+            name (str): The name of the industry.
+
+        Returns:
+            ModuleType: The current module.
+
+        Raises:
+            KeyError: If the industry is not served.
+        """
+        with self._lock:
+            return self._industries[name].module
+
+    def describe(self) -> dict[str, Any]:
+        """Describe the served industries.
+
+        Returns:
+            dict[str, Any]: The version, units and constants of every
+            industry, by name.
+        """
+        with self._lock:
+            modules = {n: s.module for n, s in self._industries.items()}
+        return {
+            name: {
+                "name": module.NAME,
+                "version": module.VERSION,
+                "units": module.UNITS,
+                "constants": constant_names(module),
+            }
+            for name, module in modules.items()
+        }
+
+    def evaluate(
+        self, name: str, arguments: dict[str, Any]
+    ) -> tuple[ModuleType, dict[str, Any]]:
+        """Evaluate an industry for a batch of scenarios.
+
+        Args:
+            name (str): The name of the industry.
+            arguments (dict[str, Any]): The arguments of its evaluate
+                function by name: the outcome, the inputs from other
+                industries and the constants to replace, floats or lists.
+
+        Returns:
+            tuple[ModuleType, dict[str, Any]]: The module used and the
+            values it computed.
+
+        Raises:
+            KeyError: If the industry is not served.
+            ValueError: If the arguments are not valid.
+        """
+        module = self.industry(name)
+        try:
+            values = module.evaluate(
+                **{
+                    key: np.asarray(value, dtype=float)
+                    for key, value in arguments.items()
+                }
+            )
+        except TypeError as err:
+            raise ValueError(str(err)) from err
+        return module, values
+
+    def reload_changed(self) -> list[str]:
+        """Build again the industries whose YAML files changed.
+
+        Returns:
+            list[str]: The names of the industries reloaded, including the
+            industries that depend on the changed ones.
+        """
+        with self._lock:
+            industries = dict(self._industries)
+        changed = {}
+        for name, served in industries.items():
+            mtime = source_mtime(served.source_path)
+            if mtime > served.mtime:
+                changed[name] = mtime
+        if not changed:
+            return []
+        try:
+            module_paths = {
+                name: path
+                for name, path in self.build(set(changed)).items()
+                if name in industries
+            }
+            modules = {
+                name: self._load(name, path)
+                for name, path in module_paths.items()
+            }
+        except Exception as err:  # pylint: disable=broad-exception-caught
+            i_logger.error(
+                "Industries %s not reloaded: %s", ", ".join(changed), err
+            )
+            for name, mtime in changed.items():
+                industries[name].mtime = mtime
+            return []
+        for name in changed.keys() - modules.keys():
+            industries[name].mtime = changed[name]
+        with self._lock:
+            for name, module in modules.items():
+                served = industries[name]
+                self._industries[name] = ServedIndustry(
+                    served.source_path,
+                    module_paths[name],
+                    module,
+                    changed.get(name, served.mtime),
+                )
+        for name in modules:
+            self.stats.count_reload()
+            i_logger.info("Industry '%s' reloaded.", name)
+        return list(modules)
+
+    def watch(
+        self, stop: threading.Event, interval: float = DEFAULT_RELOAD_INTERVAL
+    ) -> None:
+        """Reload the changed industries until stopped.
+
+        Args:
+            stop (threading.Event): The event that stops the watch.
+            interval (float): The seconds between the checks.
+        """
+        while not stop.wait(interval):
+            self.reload_changed()
+
+
+def _scenarios(values: dict[str, Any]) -> int:
+    return int(
+        np.prod(np.broadcast_shapes(*(np.shape(v) for v in values.values())))
+    )
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """HTTP requests to the service.
+
+    GET /industries describes the industries and GET /stats returns the
+    counters. POST /evaluate/<name> evaluates an industry: a JSON object
+    with the arguments of its evaluate function, or the outcomes as raw
+    little-endian float64 values. The values are returned in JSON, or in a
+    result buffer if the request is binary or accepts binary data.
+    """
+
+    service: EvaluationService
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        # pylint: disable=redefined-builtin
+        i_logger.debug(format, *args)
+
+    def _send(self, status: int, body: bytes, content_type: str) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, status: int, content: Any) -> None:
+        self._send(status, json.dumps(content).encode(), "application/json")
+
+    def do_GET(self) -> None:  # pylint: disable=invalid-name
+        """Describe the industries or return the counters."""
+        if self.path == "/industries":
+            self._send_json(200, self.service.describe())
+        elif self.path == "/stats":
+            self._send_json(200, self.service.stats.snapshot())
+        else:
+            self._send_json(404, {"error": f"Unknown path '{self.path}'"})
+
+    def do_POST(self) -> None:  # pylint: disable=invalid-name
+        """Evaluate an industry."""
+        start = time.perf_counter()
+        scenarios = 0
+        failed = True
+        try:
+            if not self.path.startswith("/evaluate/"):
+                raise KeyError(self.path)
+            name = self.path.removeprefix("/evaluate/")
+            body = self.rfile.read(int(self.headers["Content-Length"] or 0))
+            binary = self.headers["Content-Type"] == BINARY_TYPE
+            if binary:
+                # the outcomes are the first argument of evaluate
+                outcome = next(
+                    iter(
+                        inspect.signature(
+                            self.service.industry(name).evaluate
+                        ).parameters
+                    )
+                )
+                arguments = {outcome: np.frombuffer(body, "<f8")}
+            else:
+                arguments = json.loads(body or b"{}")
+                if not isinstance(arguments, dict):
+                    raise ValueError("The arguments should be an object")
+            module, values = self.service.evaluate(name, arguments)
+            scenarios = _scenarios(values)
+            failed = False
+            if binary or self.headers["Accept"] == BINARY_TYPE:
+                result = ResultBuffer.from_module(module, values)
+                self._send(200, bytes(result.buffer), BINARY_TYPE)
+            else:
+                self._send_json(
+                    200,
+                    {
+                        key: np.asarray(value).tolist()
+                        for key, value in values.items()
+                    },
+                )
+        except KeyError as err:
+            self._send_json(404, {"error": f"Unknown industry {err}"})
+        except ValueError as err:
+            self._send_json(400, {"error": str(err)})
+        except Exception as err:  # pylint: disable=broad-exception-caught
+            # e.g. a division by zero in the generated module
+            i_logger.error("Evaluation of %s failed: %r", self.path, err)
+            self._send_json(500, {"error": f"{type(err).__name__}: {err}"})
+        finally:
+            latency = time.perf_counter() - start
+            self.service.stats.record(latency, scenarios, failed)
+
+
+class _UnixHTTPServer(ThreadingMixIn, UnixStreamServer):
+    """HTTP server on a Unix socket."""
+
+    daemon_threads = True
+
+    def get_request(self) -> tuple[Any, Any]:
+        # the handler expects an address with a host
+        request, _ = super().get_request()
+        return request, ("local", 0)
+
+
+def make_server(service: EvaluationService, address: str) -> BaseServer:
+    """Create the HTTP server of a service.
+
+    Args:
+        service (EvaluationService): The service.
+        address (str): 'host:port' on localhost, or the path of a Unix
+            socket.
+
+    Returns:
+        BaseServer: The server, to be run with serve_forever.
+
+    Raises:
+        ValueError: If the path of the Unix socket is another file.
+    """
+    handler = type("Handler", (_Handler,), {"service": service})
+    if is_unix_address(address):
+        remove_stale_socket(address)
+        return _UnixHTTPServer(address, handler)
+    host, port = address.rsplit(":", 1)
+    return ThreadingHTTPServer((host, int(port)), handler)
+
+
+def serve(
+    service: EvaluationService,
+    address: str = DEFAULT_ADDRESS,
+    reload_interval: Optional[float] = DEFAULT_RELOAD_INTERVAL,
+) -> None:
+    """Answer the evaluation requests until interrupted.
+
+    Args:
+        service (EvaluationService): The service.
+        address (str): 'host:port' on localhost, or the path of a Unix
+            socket.
+        reload_interval (Optional[float]): The seconds between the checks
+            of the YAML files, or None not to reload the industries.
+    """
+    stop = threading.Event()
+    if reload_interval is not None:
+        threading.Thread(
+            target=service.watch, args=(stop, reload_interval), daemon=True
+        ).start()
+    with make_server(service, address) as server:
+        i_logger.info("Serving the industries on %s", address)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            i_logger.info("Service stopped")
+        finally:
+            stop.set()
@@ -0,0 +1,36 @@
+"""Addresses of the local servers, on TCP or on a Unix socket"""
+
+import os
+import stat
+
+
+def is_unix_address(address: str) -> bool:
+    """Whether an address is the path of a Unix socket, not 'host:port'.
+
+    Args:
+        address (str): 'host:port' on localhost, or the path of a Unix
+            socket.
+
+    Returns:
+        bool: True if the address is a path.
+    """
+    return os.sep in address or ":" not in address
+
+
+def remove_stale_socket(path: str) -> None:
+    """Remove the Unix socket left at a path by a previous server.
+
+    Args:
+        path (str): The path of the socket.
+
+    Raises:
+        ValueError: If the path exists and is not a Unix socket, so that a
+            mistyped address never removes a file.
+    """
+    try:
+        mode = os.stat(path).st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise ValueError(f"'{path}' exists and is not a Unix socket")
+    os.remove(path)
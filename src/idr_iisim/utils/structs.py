@@ -95,11 +95,14 @@ class InputStruct(BaseStruct):
         value (list[float]): List of input values.
         input_from (str): The source of the input, using 'from' as a JSON key.
         range (Optional[list[float]]): Optional range of valid values for the input.
+        tests (Optional[list[float]]): Optional tests of an input from another
+            industry: its value in each test of the industry.
     """
 
     value: list[float]
     input_from: str = field(metadata={"json_key": "from"})
     range: Optional[list[float]] = None
+    tests: Optional[list[float]] = None
 
 
 @dataclass
@@ -0,0 +1,335 @@
+"""Piecewise-linear surrogates of industries"""
+
+from dataclasses import dataclass
+from typing import Any, Optional
+
+import numpy as np
+
+from idr_iisim.templates import get_template
+from idr_iisim.utils.interpreter import evaluate_industry
+from idr_iisim.utils.models_dict import Industry
+
+# Samples of the outcome used to fit the surrogates (2^12 intervals, so
+# that uniform tables of 2^k intervals fall on the samples)
+DEFAULT_SAMPLES = 4097
+
+
+@dataclass
+class SurrogateValue:
+    """Piecewise-linear approximation of a value of an industry.
+
+    Attributes:
+        name (str): The name of the value.
+        breakpoints (np.ndarray): The outcomes of the breakpoints.
+        values (np.ndarray): The value at each breakpoint.
+        max_error (float): Maximum absolute error, measured halfway between
+            the samples used to fit the approximation.
+        max_relative_error (float): Maximum error relative to the largest
+            absolute value of the value in the range.
+    """
+
+    name: str
+    breakpoints: np.ndarray
+    values: np.ndarray
+    max_error: float
+    max_relative_error: float
+
+
+@dataclass
+class Surrogate:
+    """Piecewise-linear surrogate of an industry over its outcome's range.
+
+    Attributes:
+        name (str): The name of the industry.
+        outcome (str): The name of the outcome.
+        low (float): The minimum outcome covered by the surrogate.
+        high (float): The maximum outcome covered by the surrogate.
+        tolerance (float): The maximum absolute error requested.
+        units (dict[str, str]): The units of the outcome and the values.
+        values (list[SurrogateValue]): The approximation of every value.
+    """
+
+    name: str
+    outcome: str
+    low: float
+    high: float
+    tolerance: float
+    units: dict[str, str]
+    values: list[SurrogateValue]
+
+    def report(self) -> str:
+        """Generate the accuracy report of the surrogate.
+
+        Returns:
+            str: A table with the breakpoints and the errors of every
+            value, flagging those above the tolerance.
+        """
+        lines = [
+            f"Surrogate of the {self.name}",
+            f"Outcome: {self.outcome} in [{self.low}, {self.high}] "
+            + f"{self.units[self.outcome]}",
+            f"Tolerance: {self.tolerance}",
+            "",
+            f"{'value':<32} {'points':>6} {'max error':>12} "
+            + f"{'relative':>10}",
+        ]
+        for value in self.values:
+            flag = "" if value.max_error <= self.tolerance else "  > tolerance"
+            lines.append(
+                f"{value.name:<32} {len(value.breakpoints):>6} "
+                + f"{value.max_error:>12.3e} "
+                + f"{value.max_relative_error:>10.3e}{flag}"
+            )
+        return "\n".join(lines) + "\n"
+
+    def script_generator(self) -> str:
+        """Generate the module that evaluates the surrogate.
+
+        Returns:
+            str: The generated module.
+        """
+        template_path = "templates/template_generated_surrogate_module.txt"
+        module_template = get_template(template_path)
+
+        return module_template.substitute(
+            name=self.name,
+            outcome=self.outcome,
+            low=repr(self.low),
+            high=repr(self.high),
+            max_errors="\n    ".join(
+                f'"{v.name}": {v.max_error!r},' for v in self.values
+            ),
+            units="\n    ".join(
+                f'"{name}": "{unit}",' for name, unit in self.units.items()
+            ),
+            breakpoints="\n    ".join(
+                f'"{v.name}": (\n        np.array({_floats(v.breakpoints)}),'
+                + f"\n        np.array({_floats(v.values)}),\n    ),"
+                for v in self.values
+            ),
+        )
+
+
+def _floats(array: np.ndarray) -> str:
+    return "[" + ", ".join(repr(float(x)) for x in array) + "]"
+
+
+def _interpolation_error(
+    grid: np.ndarray, samples: np.ndarray, indices: list[int]
+) -> np.ndarray:
+    """Get the error of interpolating the samples between some of them.
+
+    Args:
+        grid (np.ndarray): The outcomes of the samples.
+        samples (np.ndarray): The values of the samples.
+        indices (list[int]): The indices of the breakpoints, sorted.
+
+    Returns:
+        np.ndarray: The absolute error at every sample.
+    """
+    approximation = np.interp(grid, grid[indices], samples[indices])
+    return np.asarray(np.abs(approximation - samples))
+
+
+def _adaptive_breakpoints(
+    grid: np.ndarray, samples: np.ndarray, tolerance: float
+) -> list[int]:
+    """Choose breakpoints so that the samples are within the tolerance.
+
+    Segments are split at their worst sample until every sample is within
+    the tolerance, so that the breakpoints concentrate where the value
+    curves.
+
+    Args:
+        grid (np.ndarray): The outcomes of the samples.
+        samples (np.ndarray): The values of the samples.
+        tolerance (float): The maximum absolute error.
+
+    Returns:
+        list[int]: The indices of the breakpoints, sorted.
+    """
+    indices = {0, len(grid) - 1}
+    pending = [(0, len(grid) - 1)]
+    while pending:
+        first, last = pending.pop()
+        if last - first < 2:
+            continue
+        error = _interpolation_error(
+            grid[first : last + 1], samples[first : last + 1], [0, -1]
+        )
+        worst = int(np.argmax(error))
+        if error[worst] > tolerance:
+            indices.add(first + worst)
+            pending += [(first, first + worst), (first + worst, last)]
+    return sorted(indices)
+
+
+def _uniform_breakpoints(
+    grid: np.ndarray, samples: np.ndarray, tolerance: float
+) -> list[int]:
+    """Choose the coarsest uniform table within the tolerance.
+
+    Args:
+        grid (np.ndarray): The outcomes of the samples.
+        samples (np.ndarray): The values of the samples.
+        tolerance (float): The maximum absolute error.
+
+    Returns:
+        list[int]: The indices of the breakpoints, sorted.
+    """
+    step = len(grid) - 1
+    while step > 1:
+        indices = list(range(0, len(grid), step))
+        if indices[-1] == len(grid) - 1 and (
+            _interpolation_error(grid, samples, indices).max() <= tolerance
+        ):
+            return indices
+        step //= 2
+    return list(range(len(grid)))
+
+
+def _fit(
+    grid: np.ndarray, sample: Any, tolerance: float, uniform: bool
+) -> tuple[np.ndarray, np.ndarray]:
+    """Choose the breakpoints of the approximation of a value.
+
+    Args:
+        grid (np.ndarray): The outcomes of the samples.
+        sample (Any): The values of the samples (or a single value if it
+            does not depend on the outcome).
+        tolerance (float): The maximum absolute error.
+        uniform (bool): Whether the breakpoints are equally spaced.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: The outcomes and the values of the
+        breakpoints.
+    """
+    samples = np.broadcast_to(np.asarray(sample, float), grid.shape)
+    choose = _uniform_breakpoints if uniform else _adaptive_breakpoints
+    indices = choose(grid, samples, tolerance)
+    return grid[indices], samples[indices]
+
+
+def _outcome_range(
+    industry: Industry, outcome_range: Optional[tuple[float, float]]
+) -> tuple[float, float]:
+    """Get the range of the outcome covered by a surrogate.
+
+    Args:
+        industry (Industry): The industry.
+        outcome_range (Optional[tuple[float, float]]): The range requested,
+            if any.
+
+    Returns:
+        tuple[float, float]: The minimum and maximum outcomes.
+
+    Raises:
+        ValueError: If there is no range or the industry takes inputs from
+            other industries.
+    """
+    assert industry.meta is not None
+    config = industry.meta.config
+    if industry.external_inputs:
+        raise ValueError(f"'{config.name}' takes inputs from other industries")
+    if outcome_range is None:
+        if config.outcome.range is None or len(config.outcome.range) < 2:
+            raise ValueError(
+                f"The outcome of '{config.name}' has no minimum and maximum"
+            )
+        outcome_range = (config.outcome.range[0], config.outcome.range[1])
+    return float(outcome_range[0]), float(outcome_range[1])
+
+
+def _surrogate_value(
+    name: str,
+    breakpoints: tuple[np.ndarray, np.ndarray],
+    outcomes: np.ndarray,
+    expected: np.ndarray,
+) -> SurrogateValue:
+    """Measure the accuracy of the approximation of a value.
+
+    Args:
+        name (str): The name of the value.
+        breakpoints (tuple[np.ndarray, np.ndarray]): The outcomes and the
+            values of the breakpoints.
+        outcomes (np.ndarray): The outcomes where the accuracy is measured.
+        expected (np.ndarray): The exact values at those outcomes.
+
+    Returns:
+        SurrogateValue: The approximation of the value.
+    """
+    error = np.abs(np.interp(outcomes, *breakpoints) - expected)
+    scale = max(
+        float(np.abs(breakpoints[1]).max()), float(np.abs(expected).max())
+    )
+    return SurrogateValue(
+        name=name,
+        breakpoints=breakpoints[0],
+        values=breakpoints[1],
+        max_error=float(error.max()),
+        max_relative_error=float(error.max() / scale) if scale else 0,
+    )
+
+
+def build_surrogate(
+    industry: Industry,
+    tolerance: float,
+    uniform: bool = False,
+    outcome_range: Optional[tuple[float, float]] = None,
+    samples: int = DEFAULT_SAMPLES,
+) -> Surrogate:
+    """Build a piecewise-linear surrogate of an industry.
+
+    The industry is sampled over the range of its outcome and every value
+    is approximated by linear interpolation between breakpoints chosen
+    among the samples, so that the error at the samples is within the
+    tolerance. The accuracy is then measured halfway between the samples.
+
+    Args:
+        industry (Industry): The industry, with its types checked.
+        tolerance (float): The maximum absolute error of the values.
+        uniform (bool): Whether to use equally spaced breakpoints (a lookup
+            table) instead of adaptive ones.
+        outcome_range (Optional[tuple[float, float]]): The range to cover,
+            instead of the range of the outcome.
+        samples (int): The number of samples of the outcome.
+
+    Returns:
+        Surrogate: The surrogate of the industry.
+
+    Raises:
+        ValueError: If the outcome has no minimum and maximum values or the
+            industry takes inputs from other industries.
+    """
+    assert industry.meta is not None
+    config = industry.meta.config
+    bounds = _outcome_range(industry, outcome_range)
+
+    grid = np.linspace(*bounds, samples)
+    midpoints = (grid[:-1] + grid[1:]) / 2
+    fitted = evaluate_industry(industry, grid)
+    checked = evaluate_industry(industry, midpoints)
+
+    values = []
+    for name in industry.meta.get_units():
+        if name != config.outcome.name:
+            values.append(
+                _surrogate_value(
+                    name,
+                    _fit(grid, fitted[name], tolerance, uniform),
+                    midpoints,
+                    np.broadcast_to(
+                        np.asarray(checked[name], float), midpoints.shape
+                    ),
+                )
+            )
+
+    return Surrogate(
+        name=config.name,
+        outcome=config.outcome.name,
+        low=bounds[0],
+        high=bounds[1],
+        tolerance=tolerance,
+        units=industry.meta.get_units(),
+        values=values,
+    )
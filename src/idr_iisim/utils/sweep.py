@@ -0,0 +1,272 @@
+"""Sweeps of the generated industries over large grids of scenarios"""
+
+import os
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Optional
+
+import numpy as np
+
+from idr_iisim.utils.logger import i_logger
+from idr_iisim.utils.verification import load_generated_module
+
+# Work units per worker
+UNITS_PER_WORKER = 4
+
+
+@dataclass
+class SharedArray:
+    """Description of an array in shared memory, to attach to it.
+
+    Attributes:
+        name (str): The name of the shared memory block.
+        shape (tuple[int, ...]): The shape of the array.
+        dtype (str): The type of the elements of the array.
+    """
+
+    name: str
+    shape: tuple[int, ...]
+    dtype: str
+
+    def attach(self) -> tuple[SharedMemory, np.ndarray]:
+        """Attach to the array.
+
+        Returns:
+            tuple[SharedMemory, np.ndarray]: The shared memory block, to be
+            closed after use, and the array that uses it.
+        """
+        memory = SharedMemory(name=self.name)
+        array: np.ndarray = np.ndarray(
+            self.shape, dtype=self.dtype, buffer=memory.buf
+        )
+        return memory, array
+
+
+@dataclass
+class SweepReport:
+    """Throughput of a sweep.
+
+    Attributes:
+        evaluations (int): The number of scenarios evaluated.
+        units (int): The number of work units.
+        workers (int): The number of processes.
+        seconds (float): The wall-clock time of the sweep.
+        units_by_worker (dict[int, int]): The work units run by every
+            worker, by process id.
+    """
+
+    evaluations: int
+    units: int
+    workers: int
+    seconds: float
+    units_by_worker: dict[int, int] = field(default_factory=dict)
+
+    @property
+    def throughput(self) -> float:
+        """Scenarios evaluated per second."""
+        return self.evaluations / self.seconds if self.seconds else 0.0
+
+
+@dataclass
+class SweepResult:
+    """Values of an industry over a grid of scenarios.
+
+    Attributes:
+        names (list[str]): The names of the values, in the order of the
+            last axis.
+        values (np.ndarray): The values, with the shape of the outcomes and
+            an additional axis by name.
+        report (SweepReport): The throughput of the sweep.
+    """
+
+    names: list[str]
+    values: np.ndarray
+    report: SweepReport
+
+    def value(self, name: str) -> np.ndarray:
+        """Get the values of an item over the grid.
+
+        Args:
+            name (str): The name of the item.
+
+        Returns:
+            np.ndarray: The values, with the shape of the outcomes.
+        """
+        return np.asarray(self.values[..., self.names.index(name)])
+
+
+def _run_unit(
+    module_path: str,
+    outcomes: SharedArray,
+    results: SharedArray,
+    rows: tuple[int, int],
+    constants: dict[str, np.ndarray],
+) -> int:
+    """Evaluate a work unit and write its values in shared memory.
+
+    Args:
+        module_path (str): The path of the generated module.
+        outcomes (SharedArray): The outcomes of the whole grid.
+        results (SharedArray): The values of the whole grid.
+        rows (tuple[int, int]): The first and last (excluded) regions of
+            the unit.
+        constants (dict[str, np.ndarray]): The constants of the regions of
+            the unit, by name.
+
+    Returns:
+        int: The id of the process that ran the unit.
+    """
+    module = load_generated_module(module_path)
+    # the memory blocks can only be closed once no array views them
+    outcomes_memory, outcomes_array = outcomes.attach()
+    try:
+        results_memory, results_array = results.attach()
+        block = values = None
+        try:
+            block = outcomes_array[rows[0] : rows[1]]
+            shape = (len(block),) + (1,) * (block.ndim - 1)
+            values = module.evaluate(
+                block,
+                **{name: c.reshape(shape) for name, c in constants.items()},
+            )
+            for index, value in enumerate(values.values()):
+                results_array[rows[0] : rows[1], ..., index] = value
+        finally:
+            del block, values, results_array
+            results_memory.close()
+    finally:
+        del outcomes_array
+        outcomes_memory.close()
+    return os.getpid()
+
+
+def _region_constants(
+    constants: dict[str, Any], regions: int
+) -> dict[str, np.ndarray]:
+    """Validate the constants of the regions.
+
+    Args:
+        constants (dict[str, Any]): The constants, by name.
+        regions (int): The number of regions.
+
+    Returns:
+        dict[str, np.ndarray]: The value of every constant by region.
+
+    Raises:
+        ValueError: If the constants do not have a value per region.
+    """
+    values = {}
+    for name, value in constants.items():
+        value = np.asarray(value, dtype=float)
+        if value.ndim > 1 or value.size not in (1, regions):
+            raise ValueError(f"'{name}' should have a value per region")
+        values[name] = np.broadcast_to(value, (regions,))
+    return values
+
+
+def _dispatch(units: list[tuple[Any, ...]], workers: int) -> dict[int, int]:
+    """Run the work units, in a process pool if there are several workers.
+
+    Args:
+        units (list[tuple[Any, ...]]): The arguments of every unit.
+        workers (int): The number of processes.
+
+    Returns:
+        dict[int, int]: The number of units run by every process, by id.
+    """
+    if workers == 1:
+        return Counter(_run_unit(*unit) for unit in units)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(_run_unit, *unit) for unit in units]
+        return Counter(future.result() for future in as_completed(futures))
+
+
+def sweep(
+    module_path: str,
+    outcomes: Any,
+    constants: Optional[dict[str, Any]] = None,
+    max_workers: Optional[int] = None,
+) -> SweepResult:
+    """Evaluate a generated industry over a grid of scenarios.
+
+    The grid (e.g. regions by years by scenarios) is split by region into
+    work units, which are dispatched to a pool of processes. The outcomes
+    and the values live in shared memory: the workers read the outcomes
+    and write the values of their units without pickling any array.
+
+    Args:
+        module_path (str): The path of the generated module.
+        outcomes (Any): The outcome of every scenario, with the regions on
+            the first axis.
+        constants (Optional[dict[str, Any]]): The constants of every region
+            (e.g. from ConstantsTable.bind), by name.
+        max_workers (Optional[int]): The number of processes, one per CPU
+            by default.
+
+    Returns:
+        SweepResult: The values of every scenario and the throughput.
+
+    Raises:
+        ValueError: If the constants do not have a value per region.
+    """
+    outcomes = np.asarray(outcomes, dtype=float)
+    region_constants = _region_constants(constants or {}, len(outcomes))
+    names = list(load_generated_module(module_path).UNITS)
+    workers = max(1, min(max_workers or os.cpu_count() or 1, len(outcomes)))
+    # several units per worker, so that the faster workers take more units
+    bounds = np.linspace(
+        0,
+        len(outcomes),
+        min(len(outcomes), workers * UNITS_PER_WORKER) + 1,
+        dtype=int,
+    )
+    report = SweepReport(outcomes.size, len(bounds) - 1, workers, 0.0)
+
+    memory = (
+        SharedMemory(create=True, size=max(outcomes.nbytes, 1)),
+        SharedMemory(create=True, size=max(outcomes.nbytes * len(names), 1)),
+    )
+    shared = (
+        SharedArray(memory[0].name, outcomes.shape, outcomes.dtype.str),
+        SharedArray(memory[1].name, outcomes.shape + (len(names),), "<f8"),
+    )
+    try:
+        np.copyto(
+            np.ndarray(outcomes.shape, dtype=float, buffer=memory[0].buf),
+            outcomes,
+        )
+        start = time.perf_counter()
+        report.units_by_worker = _dispatch(
+            [
+                (
+                    module_path,
+                    *shared,
+                    (int(first), int(last)),
+                    {n: c[first:last] for n, c in region_constants.items()},
+                )
+                for first, last in zip(bounds[:-1], bounds[1:])
+            ],
+            workers,
+        )
+        report.seconds = time.perf_counter() - start
+        values = np.array(
+            np.ndarray(shared[1].shape, dtype=float, buffer=memory[1].buf)
+        )
+    finally:
+        for block in memory:
+            block.close()
+            block.unlink()
+
+    i_logger.info(
+        "Sweep of %d scenarios in %d units on %d workers: %.3f s "
+        + "(%.0f scenarios/s)",
+        report.evaluations,
+        report.units,
+        report.workers,
+        report.seconds,
+        report.throughput,
+    )
+    return SweepResult(names=names, values=values, report=report)
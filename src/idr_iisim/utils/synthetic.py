@@ -0,0 +1,368 @@
+"""Synthetic industries, to measure the compiler on large inputs"""
+
+import os
+import random
+from dataclasses import dataclass
+from typing import Any, Optional
+
+import yaml
+
+# Operations applied to the expression of an output, with a constant and,
+# for some of them, one of the inputs of the process
+_OPERATIONS = [
+    "({expression}) * (1 - {constant})",
+    "({expression}) / (1 + {constant})",
+    "{expression} + {constant} * {input}",
+    "{expression} - {constant} * {input}",
+]
+
+
+@dataclass
+class SyntheticSpec:
+    """Shape of a synthetic industry.
+
+    The processes are laid out in layers, the first one fed by demands of
+    the meta, and every other process takes the outputs of processes of the
+    previous layers. The outputs that no process takes are inputs of the
+    meta, whose output is their sum.
+
+    Attributes:
+        processes (int): The number of processes.
+        depth (int): The number of layers of processes, the length of the
+            longest chain of processes.
+        fan_in (int): The maximum number of processes a process takes
+            outputs from.
+        fan_out (int): The maximum number of processes that take the output
+            of a process, unless the next layer needs more.
+        constants (int): The number of constants of every process.
+        complexity (int): The number of operations of every output.
+        seed (int): The seed of the random choices.
+    """
+
+    processes: int = 10
+    depth: int = 3
+    fan_in: int = 2
+    fan_out: int = 2
+    constants: int = 2
+    complexity: int = 2
+    seed: int = 0
+
+    def validate(self) -> None:
+        """Check that an industry of this shape can be built.
+
+        Raises:
+            ValueError: If any attribute is out of its range.
+        """
+        if self.processes < 1:
+            raise ValueError("A synthetic industry needs at least one process")
+        if not 1 <= self.depth <= self.processes:
+            raise ValueError("The depth should be between 1 and the processes")
+        if self.fan_in < 1 or self.fan_out < 1:
+            raise ValueError("The fan-in and the fan-out should be positive")
+        if self.constants < 1:
+            raise ValueError("Every process needs at least one constant")
+        if self.complexity < 0:
+            raise ValueError("The complexity should not be negative")
+
+
+def _constant(name: str, value: float) -> dict[str, Any]:
+    """Get the YAML of a constant."""
+    return {
+        "name": name,
+        "description": f"Synthetic constant {name}",
+        "citation": "synthetic",
+        "source": "synthetic",
+        "value": value,
+        "units": "p.u.",
+    }
+
+
+def _input(name: str, source: Optional[str]) -> dict[str, Any]:
+    """Get the YAML of an input, from a process id or None."""
+    return {
+        "name": name,
+        "description": f"Input {name}",
+        "value": None,
+        "units": "kt",
+        "from": source,
+    }
+
+
+def _layers(spec: SyntheticSpec, rng: random.Random) -> list[int]:
+    """Get the layer of every process, in increasing order.
+
+    Args:
+        spec (SyntheticSpec): The shape of the industry.
+        rng (random.Random): The random generator.
+
+    Returns:
+        list[int]: The layer of every process, every layer with at least
+        one process.
+    """
+    extra = [rng.randrange(spec.depth) for _ in range(spec.processes)]
+    return sorted(list(range(spec.depth)) + extra[spec.depth :])
+
+
+def _upstream(
+    spec: SyntheticSpec, layers: list[int], rng: random.Random
+) -> list[list[int]]:
+    """Choose the processes every process takes outputs from.
+
+    Every process out of the first layer takes the output of a process of
+    the previous layer, so that the longest chain has the depth of the
+    spec, and of other processes of the previous layers up to the fan-in.
+    The fan-out is only exceeded when every process of the previous layer
+    already reached it.
+
+    Args:
+        spec (SyntheticSpec): The shape of the industry.
+        layers (list[int]): The layer of every process.
+        rng (random.Random): The random generator.
+
+    Returns:
+        list[list[int]]: The indexes of the upstream processes of every
+        process.
+    """
+    consumers = [0] * len(layers)
+    upstream: list[list[int]] = []
+    for index, layer in enumerate(layers):
+        if layer == 0:
+            upstream.append([])
+            continue
+        previous = [i for i in range(index) if layers[i] == layer - 1]
+        chosen = [min(previous, key=lambda i: (consumers[i], rng.random()))]
+        free = [
+            i
+            for i in range(index)
+            if layers[i] < layer
+            and i not in chosen
+            and consumers[i] < spec.fan_out
+        ]
+        extra = rng.randint(0, spec.fan_in - 1)
+        chosen += rng.sample(free, min(extra, len(free)))
+        for i in chosen:
+            consumers[i] += 1
+        upstream.append(sorted(chosen))
+    return upstream
+
+
+def _expression(
+    inputs: list[str],
+    constants: list[str],
+    complexity: int,
+    rng: random.Random,
+) -> str:
+    """Get the expression of an output.
+
+    Args:
+        inputs (list[str]): The names of the inputs, all of them summed.
+        constants (list[str]): The names of the constants, used in turns.
+        complexity (int): The number of operations applied to the sum.
+        rng (random.Random): The random generator.
+
+    Returns:
+        str: The expression.
+    """
+    expression = " + ".join(inputs)
+    for step in range(complexity):
+        expression = rng.choice(_OPERATIONS).format(
+            expression=expression,
+            constant=constants[step % len(constants)],
+            input=rng.choice(inputs),
+        )
+    return expression
+
+
+def _process(
+    name: str,
+    index: int,
+    upstream: list[int],
+    spec: SyntheticSpec,
+    rng: random.Random,
+) -> dict[str, Any]:
+    """Get the YAML of a process.
+
+    Args:
+        name (str): The name of the industry.
+        index (int): The index of the process.
+        upstream (list[int]): The processes it takes outputs from, none if
+            it is fed by the meta.
+        spec (SyntheticSpec): The shape of the industry.
+        rng (random.Random): The random generator.
+
+    Returns:
+        dict[str, Any]: The YAML document of the process.
+    """
+    sources: list[Optional[str]]
+    if upstream:
+        inputs = [f"output_{i}" for i in upstream]
+        sources = [f"{name}-process{i}" for i in upstream]
+    else:
+        inputs = [f"feed_{index}"]
+        sources = [None]
+    constants = [f"FACTOR_{index}_{j}" for j in range(spec.constants)]
+    expression = _expression(inputs, constants, spec.complexity, rng)
+    return {
+        "id": f"{name}-process{index}",
+        "name": f"Process {index}",
+        "short_name": f"process_{index}",
+        "type": "process",
+        "description": f"Synthetic process {index}",
+        "version": "1.0.0",
+        "debug": False,
+        "constants": [
+            _constant(constant, round(rng.uniform(0.001, 0.05), 4))
+            for constant in constants
+        ],
+        "inputs": [
+            _input(input_name, source)
+            for input_name, source in zip(inputs, sources)
+        ],
+        "outputs": [
+            {
+                "name": f"output_{index}",
+                "operation": expression,
+                "args": [
+                    {"name": input_name, "type": "inputs"}
+                    for input_name in inputs
+                ]
+                + [
+                    {"name": constant, "type": "constants"}
+                    for constant in constants[: spec.complexity]
+                ],
+                "description": f"Output of process {index}",
+                "value": None,
+                "units": "kt",
+            }
+        ],
+    }
+
+
+def _meta(
+    name: str,
+    sources: list[int],
+    sinks: list[int],
+    rng: random.Random,
+) -> dict[str, Any]:
+    """Get the YAML of the meta.
+
+    Args:
+        name (str): The name of the industry.
+        sources (list[int]): The processes fed by demands of the meta.
+        sinks (list[int]): The processes whose outputs no process takes.
+        rng (random.Random): The random generator.
+
+    Returns:
+        dict[str, Any]: The YAML document of the meta.
+    """
+    outputs = [f"output_{i}" for i in sinks]
+    return {
+        "id": f"{name}-Meta",
+        "name": f"{name} industry",
+        "short_name": name,
+        "type": "industry",
+        "description": f"Synthetic industry {name}",
+        "version": "1.0.0",
+        "debug": False,
+        "constants": [
+            _constant(f"FEED_{i}", round(rng.uniform(0.5, 2.0), 4))
+            for i in sources
+        ],
+        "inputs": [
+            _input(output, f"{name}-process{i}")
+            for i, output in zip(sinks, outputs)
+        ],
+        "outcome": [
+            {
+                "name": "production",
+                "description": "Total production",
+                "units": "kt",
+                "same_result": {
+                    "process": f"{name}-process{sinks[-1]}",
+                    "output": outputs[-1],
+                },
+            }
+        ],
+        "demands": [
+            {
+                "name": f"feed_{i}",
+                "operation": f"production * FEED_{i}",
+                "args": [
+                    {"name": f"FEED_{i}", "type": "constants"},
+                    {"name": "production", "type": "outcome"},
+                ],
+                "description": f"Feed of process {i}",
+                "units": "kt",
+                "used": f"{name}-process{i}",
+            }
+            for i in sources
+        ],
+        "outputs": [
+            {
+                "name": "final_output",
+                "operation": " + ".join(outputs),
+                "args": [
+                    {"name": output, "type": "inputs"} for output in outputs
+                ],
+                "description": "Output of the industry",
+                "units": "kt",
+            }
+        ],
+    }
+
+
+def synthetic_industry(
+    name: str, spec: SyntheticSpec
+) -> dict[str, dict[str, Any]]:
+    """Get the YAML documents of a synthetic industry.
+
+    The same name and spec, including its seed, give the same documents.
+
+    Args:
+        name (str): The name of the industry (its short name, a valid
+            Python class name).
+        spec (SyntheticSpec): The shape of the industry.
+
+    Returns:
+        dict[str, dict[str, Any]]: The YAML documents by file name.
+
+    Raises:
+        ValueError: If the spec is not valid.
+    """
+    spec.validate()
+    rng = random.Random(spec.seed)
+    layers = _layers(spec, rng)
+    upstream = _upstream(spec, layers, rng)
+    taken = {i for processes in upstream for i in processes}
+    documents = {
+        f"process_{index}.yaml": _process(name, index, processes, spec, rng)
+        for index, processes in enumerate(upstream)
+    }
+    documents["meta.yaml"] = _meta(
+        name,
+        [i for i, layer in enumerate(layers) if layer == 0],
+        [i for i in range(spec.processes) if i not in taken],
+        rng,
+    )
+    return documents
+
+
+def write_synthetic_industry(
+    path: str, name: str, spec: SyntheticSpec
+) -> None:
+    """Write the YAML files of a synthetic industry.
+
+    Args:
+        path (str): The directory of the industry, created if needed.
+        name (str): The name of the industry (its short name, a valid
+            Python class name).
+        spec (SyntheticSpec): The shape of the industry.
+
+    Raises:
+        ValueError: If the spec is not valid.
+    """
+    documents = synthetic_industry(name, spec)
+    os.makedirs(path, exist_ok=True)
+    for file_name, document in documents.items():
+        with open(os.path.join(path, file_name), "w", encoding="utf-8") as f:
+            yaml.safe_dump(document, f, sort_keys=False)
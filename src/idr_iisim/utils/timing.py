@@ -0,0 +1,291 @@
+"""Timing of the phases of the compiler, and profiling of a build"""
+
+import cProfile
+import functools
+import json
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Iterator, Optional, TypeVar
+
+Function = TypeVar("Function", bound=Callable[..., Any])
+
+# Files listed in the summary, the slowest ones
+SUMMARY_FILES = 5
+
+
+@dataclass
+class PhaseRecord:
+    """Measures of a run of a phase.
+
+    Attributes:
+        phase (str): The name of the phase (e.g. 'validate').
+        file (Optional[str]): The file or directory the phase worked on.
+        wall (float): The elapsed seconds.
+        cpu (float): The CPU seconds of the thread.
+        peak_memory (Optional[int]): The peak of the memory allocated
+            during the phase, in bytes, or None if it is not traced.
+    """
+
+    phase: str
+    file: Optional[str]
+    wall: float
+    cpu: float
+    peak_memory: Optional[int]
+
+
+@dataclass
+class PhaseTotals:
+    """Measures of all the runs of a phase.
+
+    Attributes:
+        calls (int): The runs of the phase.
+        wall (float): The elapsed seconds.
+        cpu (float): The CPU seconds.
+        peak_memory (Optional[int]): The highest peak of memory, in bytes.
+    """
+
+    calls: int = 0
+    wall: float = 0.0
+    cpu: float = 0.0
+    peak_memory: Optional[int] = None
+
+
+@dataclass
+class _Frame:
+    """Memory of a running phase: at its start and its peak so far."""
+
+    start: int
+    peak: int
+
+
+@dataclass
+class PhaseTimer:
+    """Measures of the phases run while the timer is active.
+
+    The phases may be nested (e.g. 'generate_execution_queue' within
+    'script_generator'), and the measures of a phase include the ones of
+    the phases nested in it. The phases are measured in the thread that
+    runs them, e.g. the threads loading the YAML files, whose wall times
+    overlap. The memory is traced process-wide, so the peak of memory is
+    only measured for the phases of the thread that created the timer.
+
+    Attributes:
+        trace_memory (bool): Whether to trace the peak memory of the
+            phases, which slows down the allocations.
+        records (list[PhaseRecord]): The measures, in the order the
+            phases ended.
+    """
+
+    trace_memory: bool = True
+    records: list[PhaseRecord] = field(default_factory=list)
+    _frames: list[_Frame] = field(default_factory=list, repr=False)
+    _owner: int = field(default_factory=threading.get_ident, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    @contextmanager
+    def phase(self, name: str, file: Optional[str] = None) -> Iterator[None]:
+        """Measure a phase.
+
+        Args:
+            name (str): The name of the phase.
+            file (Optional[str]): The file or directory it works on.
+        """
+        tracing = (
+            self.trace_memory
+            and tracemalloc.is_tracing()
+            and threading.get_ident() == self._owner
+        )
+        if tracing:
+            current, peak = tracemalloc.get_traced_memory()
+            if self._frames:
+                parent = self._frames[-1]
+                parent.peak = max(parent.peak, peak)
+            tracemalloc.reset_peak()
+            self._frames.append(_Frame(current, current))
+        start_wall = time.perf_counter()
+        start_cpu = time.thread_time()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - start_wall
+            cpu = time.thread_time() - start_cpu
+            peak_memory = None
+            if tracing:
+                frame = self._frames.pop()
+                frame.peak = max(
+                    frame.peak, tracemalloc.get_traced_memory()[1]
+                )
+                peak_memory = frame.peak - frame.start
+                if self._frames:
+                    parent = self._frames[-1]
+                    parent.peak = max(parent.peak, frame.peak)
+            with self._lock:
+                self.records.append(
+                    PhaseRecord(name, file, wall, cpu, peak_memory)
+                )
+
+    def totals(self) -> dict[str, PhaseTotals]:
+        """Get the measures of every phase.
+
+        Returns:
+            dict[str, PhaseTotals]: The measures, by phase, in the order the
+            phases first ended.
+        """
+        totals: dict[str, PhaseTotals] = {}
+        for record in self.records:
+            total = totals.setdefault(record.phase, PhaseTotals())
+            total.calls += 1
+            total.wall += record.wall
+            total.cpu += record.cpu
+            if record.peak_memory is not None:
+                total.peak_memory = max(
+                    total.peak_memory or 0, record.peak_memory
+                )
+        return totals
+
+    def report(self) -> dict[str, Any]:
+        """Get the report of the measures.
+
+        Returns:
+            dict[str, Any]: The totals by phase and the measures of every
+            run, JSON serializable.
+        """
+        return {
+            "phases": {
+                name: asdict(total) for name, total in self.totals().items()
+            },
+            "records": [asdict(record) for record in self.records],
+        }
+
+    def write_report(self, path: str) -> None:
+        """Write the report of the measures as JSON.
+
+        Args:
+            path (str): The path of the report.
+        """
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(self.report(), file, indent=2)
+
+    def summary(self) -> str:
+        """Get a readable summary of the measures.
+
+        Returns:
+            str: A table of the phases, slowest first, and the slowest
+            files.
+        """
+        lines = [
+            f"{'phase':<26}{'calls':>7}{'wall s':>10}{'cpu s':>10}"
+            + f"{'peak MiB':>10}"
+        ]
+        totals = sorted(
+            self.totals().items(), key=lambda item: item[1].wall, reverse=True
+        )
+        for name, total in totals:
+            lines.append(
+                f"{name:<26}{total.calls:>7}{total.wall:>10.3f}"
+                + f"{total.cpu:>10.3f}{_mebibytes(total.peak_memory):>10}"
+            )
+        files = sorted(
+            (record for record in self.records if record.file is not None),
+            key=lambda record: record.wall,
+            reverse=True,
+        )
+        if files:
+            lines.append("Slowest files:")
+        for record in files[:SUMMARY_FILES]:
+            lines.append(
+                f"  {record.wall:.3f} s  {record.phase:<18}{record.file}"
+            )
+        return "\n".join(lines)
+
+
+def _mebibytes(size: Optional[int]) -> str:
+    """Format a size in MiB, '-' if it is not known."""
+    return "-" if size is None else f"{size / 2**20:.2f}"
+
+
+# Timer of the phases, if the compiler is being timed
+_ACTIVE_TIMER: Optional[PhaseTimer] = None
+
+
+@contextmanager
+def timed(timer: Optional[PhaseTimer]) -> Iterator[None]:
+    """Measure the phases run in the context.
+
+    Args:
+        timer (Optional[PhaseTimer]): The timer of the phases, or None to
+            leave them unmeasured.
+    """
+    global _ACTIVE_TIMER  # pylint: disable=global-statement
+    previous = _ACTIVE_TIMER
+    tracing = timer is not None and timer.trace_memory
+    started = tracing and not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    _ACTIVE_TIMER = timer
+    try:
+        yield
+    finally:
+        _ACTIVE_TIMER = previous
+        if started:
+            tracemalloc.stop()
+
+
+@contextmanager
+def phase(name: str, file: Optional[str] = None) -> Iterator[None]:
+    """Measure a phase, if the compiler is being timed.
+
+    Args:
+        name (str): The name of the phase.
+        file (Optional[str]): The file or directory it works on.
+    """
+    if _ACTIVE_TIMER is None:
+        yield
+        return
+    with _ACTIVE_TIMER.phase(name, file):
+        yield
+
+
+def timed_phase(name: str) -> Callable[[Function], Function]:
+    """Decorator that measures every call of a function as a phase.
+
+    Args:
+        name (str): The name of the phase.
+
+    Returns:
+        Callable[[Function], Function]: The decorator.
+    """
+
+    def decorator(function: Function) -> Function:
+        @functools.wraps(function)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with phase(name):
+                return function(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+@contextmanager
+def profiled(path: Optional[str]) -> Iterator[None]:
+    """Profile the code run in the context with cProfile.
+
+    Args:
+        path (Optional[str]): The path of the .prof file written at the
+            end (to be read with pstats or snakeviz), or None to not
+            profile.
+    """
+    if path is None:
+        yield
+        return
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        profiler.dump_stats(path)
@@ -0,0 +1,171 @@
+"""Registry of units and dimensional analysis"""
+
+import re
+from dataclasses import dataclass
+from fractions import Fraction
+
+
+@dataclass(frozen=True)
+class Unit:
+    """Unit expressed as a factor of a product of base dimensions.
+
+    Attributes:
+        factor (Fraction): Value of the unit in the base units.
+        dimensions (tuple[tuple[str, int], ...]): Exponent of each base
+            dimension, sorted by dimension name.
+    """
+
+    factor: Fraction
+    dimensions: tuple[tuple[str, int], ...]
+
+    def __mul__(self, other: "Unit") -> "Unit":
+        dimensions = dict(self.dimensions)
+        for name, exponent in other.dimensions:
+            dimensions[name] = dimensions.get(name, 0) + exponent
+        return Unit(
+            self.factor * other.factor,
+            tuple(sorted((k, v) for k, v in dimensions.items() if v != 0)),
+        )
+
+    def __pow__(self, exponent: int) -> "Unit":
+        return Unit(
+            self.factor**exponent,
+            tuple((name, e * exponent) for name, e in self.dimensions),
+        )
+
+
+DIMENSIONLESS = Unit(Fraction(1), ())
+
+PREFIXES: dict[str, Fraction] = {
+    "p": Fraction(1, 10**12),
+    "n": Fraction(1, 10**9),
+    "u": Fraction(1, 10**6),
+    "m": Fraction(1, 10**3),
+    "c": Fraction(1, 10**2),
+    "k": Fraction(10**3),
+    "M": Fraction(10**6),
+    "G": Fraction(10**9),
+    "T": Fraction(10**12),
+    "P": Fraction(10**15),
+}
+
+# name -> (unit, whether it accepts prefixes)
+UNITS: dict[str, tuple[Unit, bool]] = {}
+
+
+def register_unit(
+    name: str,
+    factor: Fraction,
+    dimensions: dict[str, int],
+    prefixes: bool = True,
+) -> None:
+    """Register a unit in the registry.
+
+    Args:
+        name (str): Symbol of the unit, as written in the YAML files.
+        factor (Fraction): Value of the unit in the base units.
+        dimensions (dict[str, int]): Exponent of each base dimension.
+        prefixes (bool): Whether the SI prefixes can be applied to the unit.
+    """
+    unit = Unit(Fraction(factor), tuple(sorted(dimensions.items())))
+    UNITS[name] = (unit, prefixes)
+
+
+# Mass
+register_unit("g", Fraction(1, 1000), {"mass": 1})
+register_unit("t", Fraction(1000), {"mass": 1})
+# Energy and power
+register_unit("J", Fraction(1), {"energy": 1})
+register_unit("Wh", Fraction(3600), {"energy": 1})
+register_unit("W", Fraction(1), {"energy": 1, "time": -1})
+register_unit("cal", Fraction(4184, 1000), {"energy": 1})
+# Length, area and volume
+register_unit("m", Fraction(1), {"length": 1})
+register_unit("L", Fraction(1, 1000), {"length": 3})
+register_unit("l", Fraction(1, 1000), {"length": 3})
+# Time
+register_unit("s", Fraction(1), {"time": 1})
+register_unit("min", Fraction(60), {"time": 1}, prefixes=False)
+register_unit("h", Fraction(3600), {"time": 1}, prefixes=False)
+register_unit("d", Fraction(86400), {"time": 1}, prefixes=False)
+register_unit("yr", Fraction(31536000), {"time": 1}, prefixes=False)
+# Dimensionless
+register_unit("p.u.", Fraction(1), {}, prefixes=False)
+register_unit("p.u", Fraction(1), {}, prefixes=False)
+register_unit("%", Fraction(1, 100), {}, prefixes=False)
+register_unit("percentage", Fraction(1, 100), {}, prefixes=False)
+
+_FACTOR = re.compile(r"^(?P<name>.+?)(?P<exponent>-?\d+)?$")
+
+
+def _parse_name(name: str) -> Unit:
+    if name in UNITS:
+        return UNITS[name][0]
+    for prefix, factor in PREFIXES.items():
+        if name.startswith(prefix) and name[len(prefix) :] in UNITS:
+            unit, accepts_prefixes = UNITS[name[len(prefix) :]]
+            if accepts_prefixes:
+                return Unit(unit.factor * factor, unit.dimensions)
+    raise ValueError(f"Unknown unit '{name}'")
+
+
+def _parse_product(text: str) -> Unit:
+    unit = DIMENSIONLESS
+    for factor in re.split(r"[*·\s]+", text.strip()):
+        if not factor or factor == "1":
+            continue
+        match = _FACTOR.match(factor)
+        assert match is not None
+        if factor in UNITS or match["exponent"] is None:
+            unit = unit * _parse_name(factor)
+        else:
+            exponent = int(match["exponent"])
+            unit = unit * _parse_name(match["name"]) ** exponent
+    return unit
+
+
+def parse_unit(text: str) -> Unit:
+    """Parse a unit such as 'kt', 'm3' or 'MJ/kg'.
+
+    The unit is a product of registered units, optionally with SI prefixes
+    and integer exponents, separated by '*' or spaces. A '/' divides by the
+    product that follows it.
+
+    Args:
+        text (str): The unit to parse.
+
+    Returns:
+        Unit: The parsed unit.
+
+    Raises:
+        ValueError: If any unit is not registered.
+    """
+    if text.strip() in UNITS:
+        return UNITS[text.strip()][0]
+    numerator, *denominators = text.split("/")
+    unit = _parse_product(numerator)
+    for denominator in denominators:
+        unit = unit * _parse_product(denominator) ** -1
+    return unit
+
+
+def conversion_factor(source: str, target: str) -> Fraction:
+    """Get the factor that converts values from a unit into another one.
+
+    Args:
+        source (str): The unit of the values.
+        target (str): The unit to convert the values into.
+
+    Returns:
+        Fraction: The factor to multiply the values by.
+
+    Raises:
+        ValueError: If any unit is unknown or the units are not compatible.
+    """
+    if source == target:
+        return Fraction(1)
+    source_unit = parse_unit(source)
+    target_unit = parse_unit(target)
+    if source_unit.dimensions != target_unit.dimensions:
+        raise ValueError(f"Units '{source}' and '{target}' are not compatible")
+    return source_unit.factor / target_unit.factor
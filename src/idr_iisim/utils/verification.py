@@ -0,0 +1,220 @@
+"""Verification of the generated industries against their YAML tests"""
+
+import importlib.util
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from fractions import Fraction
+from functools import lru_cache
+from types import ModuleType
+from typing import Any, Optional
+
+from idr_iisim.utils.logger import i_logger
+from idr_iisim.utils.models_dict import Industry
+from idr_iisim.utils.structs import ItemStruct
+
+# The expected values of the YAML files are rounded to two decimals
+DEFAULT_TOLERANCE = 0.005
+# Absorbs the floating point error of the rounded expected values
+EPSILON = 1e-9
+
+
+@dataclass
+class TestVector:
+    """Expected values of an industry for a given outcome.
+
+    Attributes:
+        outcome (float): The value of the industry's outcome.
+        expected (dict[str, float]): Expected value of each getter.
+        inputs (dict[str, float]): Value of each input from other
+            industries, as given to the generated class.
+    """
+
+    __test__ = False  # not a test case
+
+    outcome: float
+    expected: dict[str, float] = field(default_factory=dict)
+    inputs: dict[str, float] = field(default_factory=dict)
+
+
+@dataclass
+class VerificationJob:
+    """Test vectors to run against a generated industry module.
+
+    Attributes:
+        name (str): The name of the industry.
+        module_path (str): Path of the generated module.
+        class_name (str): Name of the industry's class in the module.
+        vectors (list[TestVector]): Test vectors to run.
+    """
+
+    name: str
+    module_path: str
+    class_name: str
+    vectors: list[TestVector]
+
+
+class VerificationError(ValueError):
+    """Generated industries that do not pass their tests.
+
+    Attributes:
+        failed (list[str]): The names of the industries.
+    """
+
+    def __init__(self, failed: list[str], errors: list[str]):
+        super().__init__(
+            "Generated industries do not pass their tests:\n"
+            + "\n".join(errors)
+        )
+        self.failed = failed
+
+
+def collect_test_vectors(industry: Industry) -> list[TestVector]:
+    """Collect the test vectors declared in the industry's meta.
+
+    The i-th value of the outcome's tests is the outcome of the i-th
+    vector, and the i-th value of the tests of each demand, meta-demand
+    and output is its expected value. The inputs from other industries
+    declare their value in the i-th test in their own tests, in their own
+    units: a vector without the value of any of them is left out.
+
+    Args:
+        industry (Industry): The industry whose tests are collected, with
+            the inputs from other industries checked.
+
+    Returns:
+        list[TestVector]: The test vectors of the industry.
+    """
+    assert industry.meta is not None
+    config = industry.meta.config
+    items: list[ItemStruct] = [d for d in config.demands if d.meta is None]
+    items += list(config.meta)
+    items += list(config.outputs)
+    inputs: dict[str, tuple[list[float], Fraction]] = {}
+    for model, input_field in industry.external_inputs:
+        # the generated class takes the values in the units of their source
+        factor = model.conversions.get((input_field.name, None), Fraction(1))
+        inputs.setdefault(input_field.name, (input_field.tests or [], factor))
+
+    vectors = []
+    for i, outcome in enumerate(config.outcome.tests or []):
+        vector = TestVector(outcome=outcome)
+        for item in items:
+            if item.tests is not None and i < len(item.tests):
+                vector.expected[item.name] = item.tests[i]
+        for name, (tests, factor) in inputs.items():
+            if i < len(tests):
+                vector.inputs[name] = tests[i] / float(factor)
+        if len(vector.inputs) == len(inputs):
+            vectors.append(vector)
+    return vectors
+
+
+def load_module(path: str, name: str) -> ModuleType:
+    """Load a generated module from its file.
+
+    The module is not registered in sys.modules, so that a stale version
+    imported before the build is never used.
+
+    Args:
+        path (str): The path of the module.
+        name (str): The name given to the module.
+
+    Returns:
+        ModuleType: The loaded module.
+    """
+    spec = importlib.util.spec_from_file_location(name, path)
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@lru_cache(maxsize=16)
+def _load_version(path: str, mtime: int, size: int) -> ModuleType:
+    # pylint: disable=unused-argument
+    return load_module(path, "_generated_industry")
+
+
+def load_generated_module(path: str) -> ModuleType:
+    """Load a generated module once per version of its file.
+
+    The modules are cached, e.g. for the workers of a process pool, by
+    path, modification time and size: a rebuilt module is loaded again.
+
+    Args:
+        path (str): The path of the module.
+
+    Returns:
+        ModuleType: The loaded module.
+    """
+    stat = os.stat(path)
+    return _load_version(path, stat.st_mtime_ns, stat.st_size)
+
+
+def verify_module(
+    job: VerificationJob, tolerance: float = DEFAULT_TOLERANCE
+) -> list[str]:
+    """Run the test vectors of a job against its generated module.
+
+    Args:
+        job (VerificationJob): The job to run.
+        tolerance (float): Maximum absolute difference allowed.
+
+    Returns:
+        list[str]: A description of every mismatch found.
+    """
+    module = load_module(
+        job.module_path, f"_verification_{job.class_name.lower()}"
+    )
+    industry_cls: Any = getattr(module, job.class_name)
+    errors = []
+    for vector in job.vectors:
+        instance = industry_cls(vector.outcome, **vector.inputs)
+        for name, expected in vector.expected.items():
+            value = float(getattr(instance, f"get_{name}")())
+            if abs(value - expected) > tolerance + EPSILON:
+                errors.append(
+                    f"{job.name}: '{name}' for outcome {vector.outcome} "
+                    + f"is {value} (expected {expected})"
+                )
+    return errors
+
+
+def verify_industries(
+    jobs: list[VerificationJob],
+    tolerance: float = DEFAULT_TOLERANCE,
+    max_workers: Optional[int] = None,
+) -> None:
+    """Verify several generated industries in parallel.
+
+    Each industry is verified in a different process.
+
+    Args:
+        jobs (list[VerificationJob]): One job per industry.
+        tolerance (float): Maximum absolute difference allowed.
+        max_workers (Optional[int]): Maximum number of processes.
+
+    Raises:
+        VerificationError: If any value differs from its expected value.
+    """
+    jobs = [job for job in jobs if job.vectors]
+    if not jobs:
+        return
+    i_logger.info("Verifying %d industries", len(jobs))
+
+    results: list[list[str]]
+    if len(jobs) == 1:
+        results = [verify_module(jobs[0], tolerance)]
+    else:
+        workers = min(len(jobs), max_workers or os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(
+                executor.map(verify_module, jobs, [tolerance] * len(jobs))
+            )
+
+    failed = [job.name for job, errors in zip(jobs, results) if errors]
+    if failed:
+        raise VerificationError(
+            failed, [error for errors in results for error in errors]
+        )
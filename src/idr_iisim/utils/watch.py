@@ -0,0 +1,132 @@
+"""Watch of the source files, to rebuild the industries that change"""
+
+import os
+import threading
+from pathlib import Path
+from typing import Optional
+
+# Seconds between the checks of the files
+DEFAULT_POLL_INTERVAL = 0.5
+# Seconds without changes before a burst of changes is handled
+DEFAULT_DEBOUNCE = 0.3
+
+
+def snapshot(roots: list[tuple[str, str]]) -> dict[str, int]:
+    """Get the modification times of the files of some directories.
+
+    Args:
+        roots (list[tuple[str, str]]): The directories, with the glob
+            pattern of the files to watch in them (e.g. '*.yaml').
+
+    Returns:
+        dict[str, int]: The modification time in nanoseconds, by path.
+    """
+    mtimes = {}
+    for root, pattern in roots:
+        for file in Path(root).rglob(pattern):
+            try:
+                mtimes[str(file)] = file.stat().st_mtime_ns
+            except FileNotFoundError:
+                continue
+    return mtimes
+
+
+class FileWatcher:
+    """Changes of the files of some directories, polling their mtimes.
+
+    Attributes:
+        roots (list[tuple[str, str]]): The directories, with the glob
+            pattern of the files to watch in them.
+        interval (float): The seconds between the checks of the files.
+        debounce (float): The seconds without changes before a burst of
+            changes (e.g. an editor saving many files) is reported.
+    """
+
+    def __init__(
+        self,
+        roots: list[tuple[str, str]],
+        interval: float = DEFAULT_POLL_INTERVAL,
+        debounce: float = DEFAULT_DEBOUNCE,
+    ):
+        """Start watching the files.
+
+        Args:
+            roots (list[tuple[str, str]]): The directories, with the glob
+                pattern of the files to watch in them.
+            interval (float): The seconds between the checks of the files.
+            debounce (float): The seconds without changes before a burst of
+                changes is reported.
+        """
+        self.roots = roots
+        self.interval = interval
+        self.debounce = debounce
+        self._mtimes = snapshot(roots)
+
+    def poll(self) -> set[str]:
+        """Get the files created, modified or removed since the last poll.
+
+        Returns:
+            set[str]: The paths of the files.
+        """
+        mtimes = snapshot(self.roots)
+        changed = {
+            path
+            for path in mtimes.keys() | self._mtimes.keys()
+            if mtimes.get(path) != self._mtimes.get(path)
+        }
+        self._mtimes = mtimes
+        return changed
+
+    def wait(self, stop: Optional[threading.Event] = None) -> set[str]:
+        """Wait for a burst of changes.
+
+        Args:
+            stop (Optional[threading.Event]): An event that ends the wait.
+
+        Returns:
+            set[str]: The paths of the files that changed, empty if the
+            wait was stopped.
+        """
+        stop = stop or threading.Event()
+        changed: set[str] = set()
+        while not stop.is_set():
+            changes = self.poll()
+            if changes:
+                changed |= changes
+            elif changed:
+                return changed
+            stop.wait(self.debounce if changed else self.interval)
+        return set()
+
+
+def affected_industries(
+    changed: set[str], directories: dict[str, str]
+) -> Optional[set[str]]:
+    """Get the industries whose files changed.
+
+    Args:
+        changed (set[str]): The paths of the files that changed.
+        directories (dict[str, str]): The directory of every industry, by
+            name.
+
+    Returns:
+        Optional[set[str]]: The names of the industries, or None if a file
+        out of their directories (a template, a schema, a manifest or a new
+        industry) changed.
+    """
+    roots = {
+        name: os.path.abspath(directory)
+        for name, directory in directories.items()
+    }
+    industries = set()
+    for path in changed:
+        path = os.path.abspath(path)
+        names = {
+            name
+            for name, root in roots.items()
+            if os.path.commonpath([root, path]) == root
+        }
+        if not names:
+            return None
+        industries |= names
+    return industries
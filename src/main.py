@@ -1,90 +1,918 @@
 """IDR-IISIM Compiler main"""
 
+import argparse
 import os
+import sys
 import traceback
-from pathlib import Path
+from typing import Optional
 
 from dotenv import load_dotenv
 
 from idr_iisim.models.meta import Meta
 from idr_iisim.models.process import Process
+from idr_iisim.utils.catalogue import Catalogue
+from idr_iisim.utils.coefficients import (
+    catalogue_coefficients,
+    industry_coefficients,
+)
+from idr_iisim.utils.daemon import DEFAULT_DAEMON_ADDRESS, CompileDaemon
+from idr_iisim.utils.discovery import (
+    IndustrySource,
+    discover_industries,
+    industry_ids,
+    select_industries,
+)
+from idr_iisim.utils.documents import default_cache, load_documents
+from idr_iisim.utils.linear_program import lp_generator, mps_generator
 from idr_iisim.utils.logger import i_logger
-from idr_iisim.utils.models_dict import Industry, load_yaml
+from idr_iisim.utils.models_dict import Industry
 from idr_iisim.utils.schema import Validator
+from idr_iisim.utils.server import (
+    DEFAULT_ADDRESS,
+    DEFAULT_RELOAD_INTERVAL,
+    EvaluationService,
+    serve,
+)
+from idr_iisim.utils.surrogate import build_surrogate
+from idr_iisim.utils.timing import PhaseTimer, phase, profiled, timed
+from idr_iisim.utils.verification import (
+    DEFAULT_TOLERANCE,
+    VerificationError,
+    VerificationJob,
+    collect_test_vectors,
+    verify_industries,
+)
+from idr_iisim.utils.watch import FileWatcher, affected_industries
 
+INDUSTRIES_FINAL_PATH = "industries"
 
-def process_industry(name: str, industry_path: str) -> None:
-    """Process and generate code for a specified industry.
 
-    This function validates and processes all YAML files in the given industry path,
-    generating a Python script for the industry based on the loaded configurations.
+def load_industry(
+    name: str,
+    industry_path: str,
+    validator: Optional[Validator] = None,
+    files: Optional[list[str]] = None,
+) -> Industry:
+    """Load and validate the YAML files of a specified industry.
 
     Args:
-        name (str): The name of the industry to be processed.
+        name (str): The name of the industry to be loaded.
         industry_path (str): The path where the YAML files of the industry are stored.
+        validator (Optional[Validator]): The schema validator, a new one by default.
+        files (Optional[list[str]]): The YAML files of the industry (e.g. from a
+            manifest), all the YAML files under its path by default.
+
+    Returns:
+        Industry: The industry with its meta and processes, with its types checked.
 
     Raises:
         Exception: If there are issues in processing the industry files.
     """
-    i_logger.info("Processing industry: %s", name)
+    i_logger.debug("Loading industry: %s", name)
     industry = Industry()
-    yaml_validator = Validator()
+    yaml_validator = validator or Validator()
 
-    for file in Path(industry_path).rglob("*.yaml"):
-        yaml_path = str(file)
-        yaml_data = load_yaml(yaml_path)
-        yaml_validator.validate(yaml_data)
+    # the files are parsed concurrently, or taken from the cache
+    yaml_paths = IndustrySource(name, industry_path, files).yaml_files()
+    documents = load_documents(yaml_paths, default_cache())
+    for yaml_path, yaml_data in zip(yaml_paths, documents):
+        with phase("validate", yaml_path):
+            yaml_validator.validate(yaml_data)
         if yaml_data["type"] == "industry":
-            meta = Meta(yaml_data, yaml_path)
+            with phase("parse_meta", yaml_path):
+                meta = Meta(yaml_data, yaml_path)
             industry.set_meta(meta)
         else:
-            process = Process(yaml_data, yaml_path)
+            with phase("parse_process", yaml_path):
+                process = Process(yaml_data, yaml_path)
             # save instance in ModelDict class
             key = process.config.id
             industry.add_process(key=key, process=process)
 
     # Check types
-    industry.check_types()
+    with phase("check_types", industry_path):
+        industry.check_types()
     assert industry.meta is not None
+    return industry
 
-    industries_final_path = "industries"
-    result_path = os.path.join(
-        industries_final_path,
+
+def industry_module_path(
+    industry: Industry, directory: Optional[str] = None
+) -> str:
+    """Get the path of the generated module of an industry.
+
+    Args:
+        industry (Industry): The industry.
+        directory (Optional[str]): The directory of the generated modules,
+            INDUSTRIES_FINAL_PATH by default.
+
+    Returns:
+        str: The path of the Python script generated for the industry.
+    """
+    assert industry.meta is not None
+    return os.path.join(
+        directory or INDUSTRIES_FINAL_PATH,
         f"{industry.meta.config.short_name.lower()}.py",
     )
 
-    with open(result_path, "w", encoding="utf-8") as f:
-        f.write(industry.script_generator())
+
+def process_industry(  # pylint: disable=too-many-arguments
+    name: str,
+    industry_path: str,
+    optimize: bool = False,
+    validator: Optional[Validator] = None,
+    files: Optional[list[str]] = None,
+    *,
+    instrument: bool = False,
+) -> Industry:
+    """Process and generate code for a specified industry.
+
+    This function validates and processes all YAML files in the given industry path,
+    generating a Python script for the industry based on the loaded configurations.
+    The items whose value is never used are reported.
+
+    Args:
+        name (str): The name of the industry to be processed.
+        industry_path (str): The path where the YAML files of the industry are stored.
+        optimize (bool): If true, the unused items are left out of the generated code.
+        validator (Optional[Validator]): The schema validator, a new one by default.
+        files (Optional[list[str]]): The YAML files of the industry, all the YAML
+            files under its path by default.
+        instrument (bool): If true, the generated code counts the calls of its
+            methods and the seconds spent in them.
+
+    Returns:
+        Industry: The processed industry.
+
+    Raises:
+        Exception: If there are issues in processing the industry files.
+    """
+    i_logger.info("Processing industry: %s", name)
+    industry = load_industry(name, industry_path, validator, files)
+    generate_industry(name, industry, optimize, instrument)
+    return industry
+
+
+def generate_industry(
+    name: str,
+    industry: Industry,
+    optimize: bool,
+    instrument: bool = False,
+    directory: Optional[str] = None,
+) -> str:
+    """Generate the code of a loaded industry.
+
+    Args:
+        name (str): The name of the industry.
+        industry (Industry): The industry, with its types checked.
+        optimize (bool): If true, the unused items are left out of the generated code.
+        instrument (bool): If true, the generated code counts the calls of its
+            methods and the seconds spent in them.
+        directory (Optional[str]): The directory of the generated module,
+            INDUSTRIES_FINAL_PATH by default.
+
+    Returns:
+        str: The path of the generated module.
+    """
+    with phase("find_unused_items"):
+        unused_items = industry.find_unused_items()
+    for model_id, names in unused_items.items():
+        i_logger.warning(
+            "Unused items in '%s': %s", model_id, ", ".join(names)
+        )
+
+    module_path = industry_module_path(industry, directory)
+    with phase("script_generator", module_path):
+        script = industry.script_generator(optimize, instrument)
+    with phase("write", module_path):
+        with open(module_path, "w", encoding="utf-8") as f:
+            f.write(script)
 
     i_logger.info("Industry '%s' processed.", name)
+    return module_path
+
+
+def verify_generated_industries(
+    industries: dict[str, Industry], tolerance: float
+) -> None:
+    """Run the YAML tests of the industries against their generated code.
+
+    The industries that take inputs from other industries are verified on
+    their own, with the values of these inputs declared in their tests.
+
+    Args:
+        industries (dict[str, Industry]): Processed industries by name.
+        tolerance (float): Maximum absolute difference allowed.
+
+    Raises:
+        VerificationError: If any generated industry does not pass its tests.
+    """
+    jobs = []
+    for name, industry in industries.items():
+        assert industry.meta is not None
+        vectors = collect_test_vectors(industry)
+        tests = industry.meta.config.outcome.tests or []
+        if len(vectors) < len(tests):
+            i_logger.warning(
+                "Industry '%s' does not declare the inputs from other "
+                + "industries of %d of its tests, they are not verified",
+                name,
+                len(tests) - len(vectors),
+            )
+        jobs.append(
+            VerificationJob(
+                name=name,
+                module_path=industry_module_path(industry),
+                class_name=industry.meta.config.short_name,
+                vectors=vectors,
+            )
+        )
+    verify_industries(jobs, tolerance)
+    i_logger.info("Industries verified.")
+
+
+def remove_failed_industries(
+    industries: dict[str, Industry], failed: list[str]
+) -> None:
+    """Remove the generated modules of the industries that failed their tests.
+
+    The modules that evaluate all the industries together import them, so
+    they are removed as well.
+
+    Args:
+        industries (dict[str, Industry]): Processed industries by name.
+        failed (list[str]): The names of the industries that failed.
+    """
+    paths = [industry_module_path(industries[name]) for name in failed]
+    paths += [
+        os.path.join(INDUSTRIES_FINAL_PATH, f"{module}.py")
+        for module in ["coupled", "portfolio"]
+    ]
+    for path in paths:
+        if os.path.exists(path):
+            os.remove(path)
+            i_logger.warning("Generated module %s removed", path)
+
+
+def export_coefficients(
+    catalogue: Catalogue, sparse: bool, whole_catalogue: bool
+) -> None:
+    """Write the technical coefficients matrices of the linear industries.
+
+    The industries that are not linear, or take inputs from other
+    industries, are skipped with a warning.
+
+    Args:
+        catalogue (Catalogue): The catalogue of the industries.
+        sparse (bool): Whether to write the matrices in COO format.
+        whole_catalogue (bool): Whether to also write the matrix of all the
+            industries of the catalogue.
+
+    Raises:
+        ValueError: If the matrix of the catalogue is requested and any
+            industry is not linear.
+    """
+    for industry in catalogue.industries.values():
+        assert industry.meta is not None
+        name = industry.meta.config.short_name
+        try:
+            coefficients = industry_coefficients(industry)
+        except ValueError as err:
+            i_logger.warning(
+                "Coefficients of '%s' not exported: %s", name, err
+            )
+            continue
+        coefficients.save(
+            os.path.join(
+                INDUSTRIES_FINAL_PATH, f"{name.lower()}_coefficients.npz"
+            ),
+            sparse,
+        )
+    if whole_catalogue:
+        catalogue_coefficients(catalogue).save(
+            os.path.join(INDUSTRIES_FINAL_PATH, "coefficients.npz"), sparse
+        )
+    i_logger.info("Coefficients exported.")
+
+
+def export_linear_programs(catalogue: Catalogue, file_format: str) -> None:
+    """Write the constraints of the affine industries in LP or MPS format.
+
+    The industries that are not affine are rejected, reporting their
+    nonlinear expressions.
+
+    Args:
+        catalogue (Catalogue): The catalogue of the industries.
+        file_format (str): The format of the files, 'lp' or 'mps'.
+    """
+    generator = lp_generator if file_format == "lp" else mps_generator
+    for industry in catalogue.industries.values():
+        assert industry.meta is not None
+        name = industry.meta.config.short_name
+        try:
+            content = generator(industry)
+        except ValueError as err:
+            i_logger.error("Constraints of '%s' not exported: %s", name, err)
+            continue
+        path = os.path.join(
+            INDUSTRIES_FINAL_PATH, f"{name.lower()}.{file_format}"
+        )
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(content)
+    i_logger.info("Linear programs exported.")
+
+
+def export_surrogates(
+    industries: dict[str, Industry], tolerance: float, uniform: bool
+) -> None:
+    """Write the piecewise-linear surrogates of the industries.
+
+    Every surrogate is written with its accuracy report. The industries
+    whose outcome has no minimum and maximum values, or that take inputs
+    from other industries, are skipped with a warning.
+
+    Args:
+        industries (dict[str, Industry]): Processed industries by name.
+        tolerance (float): The maximum absolute error of the values.
+        uniform (bool): Whether to use lookup tables of equally spaced
+            breakpoints instead of adaptive breakpoints.
+    """
+    for name, industry in industries.items():
+        try:
+            surrogate = build_surrogate(industry, tolerance, uniform)
+        except ValueError as err:
+            i_logger.warning("Surrogate of '%s' not generated: %s", name, err)
+            continue
+        path = industry_module_path(industry).removesuffix(".py")
+        with open(f"{path}_surrogate.py", "w", encoding="utf-8") as f:
+            f.write(surrogate.script_generator())
+        with open(f"{path}_surrogate_report.txt", "w", encoding="utf-8") as f:
+            f.write(surrogate.report())
+        for value in surrogate.values:
+            if value.max_error > tolerance:
+                i_logger.warning(
+                    "Surrogate of '%s' exceeds the tolerance in '%s': %g",
+                    name,
+                    value.name,
+                    value.max_error,
+                )
+    i_logger.info("Surrogates generated.")
+
+
+def build_industries(
+    industries: dict[str, Industry], names: set[str], args: argparse.Namespace
+) -> None:
+    """Generate the code of some loaded industries.
+
+    The inputs that the industries take from other industries are resolved
+    before generating their code, and the modules that evaluate all the
+    industries are generated again.
+
+    Args:
+        industries (dict[str, Industry]): Loaded industries by name.
+        names (set[str]): The names of the industries to generate, loaded
+            since the last build.
+        args (argparse.Namespace): The command line arguments.
+
+    Raises:
+        ValueError: If the inputs from other industries are not valid.
+        VerificationError: If the generated industries do not pass their
+            tests, whose modules are removed.
+    """
+    catalogue = Catalogue()
+    for industry in industries.values():
+        catalogue.add_industry(industry)
+    catalogue.check_types(
+        industry.meta.config.id
+        for name, industry in industries.items()
+        if name in names and industry.meta is not None
+    )
+    for elem, industry in industries.items():
+        if elem in names:
+            generate_industry(elem, industry, args.optimize, args.instrument)
+    if catalogue.is_coupled():
+        coupled_path = os.path.join(INDUSTRIES_FINAL_PATH, "coupled.py")
+        with open(coupled_path, "w", encoding="utf-8") as f:
+            f.write(catalogue.script_generator())
+        i_logger.info("Coupled industries processed.")
+    export_models(catalogue, industries, args)
+
+    if args.verify:
+        with phase("verify"):
+            try:
+                verify_generated_industries(
+                    {
+                        n: industry
+                        for n, industry in industries.items()
+                        if n in names
+                    },
+                    args.tolerance,
+                )
+            except VerificationError as err:
+                remove_failed_industries(industries, err.failed)
+                raise
+
+
+def reload_industries(
+    sources: dict[str, IndustrySource],
+    industries: dict[str, Industry],
+    names: set[str],
+    validator: Validator,
+) -> set[str]:
+    """Load again some industries and the industries that depend on them.
+
+    Args:
+        sources (dict[str, IndustrySource]): The YAML files of the industries.
+        industries (dict[str, Industry]): Loaded industries by name, updated
+            with the industries loaded again (or removed).
+        names (set[str]): The names of the industries whose files changed.
+        validator (Validator): The schema validator.
 
+    Returns:
+        set[str]: The names of the industries loaded.
+    """
+    catalogue = Catalogue()
+    ids = {}
+    for name, industry in industries.items():
+        catalogue.add_industry(industry)
+        assert industry.meta is not None
+        ids[industry.meta.config.id] = name
+    changed = {key for key, name in ids.items() if name in names}
+    names = names | {ids[key] for key in catalogue.dependents(changed)}
+
+    for name in names:
+        source = sources.get(name)
+        if source is not None:
+            i_logger.info("Processing industry: %s", name)
+            industries[name] = load_industry(
+                name, source.path, validator, source.files
+            )
+        elif industries.pop(name, None) is not None:
+            i_logger.info("Industry '%s' removed.", name)
+    return names & industries.keys()
+
+
+def load_upstream_industries(
+    sources: dict[str, IndustrySource],
+    industries: dict[str, Industry],
+    validator: Validator,
+) -> set[str]:
+    """Load the industries that the loaded industries take inputs from.
+
+    The industries selected with --only may take inputs from industries
+    that are not selected: these are loaded, to check the inputs and to
+    evaluate the industries together, but not generated. They are found by
+    the id of their meta file, parsing the YAML files of the industries
+    not loaded yet.
+
+    Args:
+        sources (dict[str, IndustrySource]): The YAML files of all the
+            industries.
+        industries (dict[str, Industry]): Loaded industries by name, updated
+            with the industries loaded.
+        validator (Validator): The schema validator.
+
+    Returns:
+        set[str]: The names of the industries loaded.
+    """
+    loaded_ids = set()
+    missing = set()
+    for industry in industries.values():
+        assert industry.meta is not None
+        loaded_ids.add(industry.meta.config.id)
+        missing |= {f.input_from for _, f in industry.external_inputs}
+    missing -= loaded_ids
+    if not missing:
+        return set()
+
+    ids = industry_ids(
+        {n: s for n, s in sources.items() if n not in industries}
+    )
+    loaded = set()
+    while missing:
+        key = missing.pop()
+        name = ids.get(key)
+        # unknown industries are reported by the catalogue check
+        if name is None or name in industries:
+            continue
+        i_logger.info("Loading upstream industry: %s", name)
+        source = sources[name]
+        industry = load_industry(name, source.path, validator, source.files)
+        industries[name] = industry
+        loaded.add(name)
+        loaded_ids.add(key)
+        missing |= {
+            f.input_from for _, f in industry.external_inputs
+        } - loaded_ids
+    return loaded
+
+
+def industries_to_generate(
+    industries: dict[str, Industry],
+    names: set[str],
+    args: argparse.Namespace,
+) -> set[str]:
+    """Get the loaded industries to generate.
+
+    Args:
+        industries (dict[str, Industry]): Loaded industries by name.
+        names (set[str]): The names of the industries loaded since the last
+            build.
+        args (argparse.Namespace): The command line arguments.
+
+    Returns:
+        set[str]: The industries selected with --only, and the industries
+        whose module was never generated, which the coupled module imports.
+    """
+    return select_industries(sorted(names), args.only) | {
+        name
+        for name, industry in industries.items()
+        if not os.path.exists(industry_module_path(industry))
+    }
+
+
+def rebuild_industries(  # pylint: disable=too-many-arguments
+    sources: dict[str, IndustrySource],
+    industries: dict[str, Industry],
+    names: set[str],
+    validator: Validator,
+    args: argparse.Namespace,
+) -> dict[str, str]:
+    """Build again some industries and the industries that depend on them.
+
+    The industries they take inputs from are loaded if needed, and only
+    the industries selected with --only are generated.
+
+    Args:
+        sources (dict[str, IndustrySource]): The YAML files of all the
+            industries.
+        industries (dict[str, Industry]): Processed industries by name,
+            updated with the industries built again.
+        names (set[str]): The names of the industries to build again.
+        validator (Validator): The schema validator.
+        args (argparse.Namespace): The command line arguments.
+
+    Returns:
+        dict[str, str]: The paths of the generated modules, by industry name.
+
+    Raises:
+        ValueError: If the industries are not valid, or the generated
+            industries do not pass their tests.
+    """
+    loaded = reload_industries(sources, industries, names, validator)
+    loaded |= load_upstream_industries(sources, industries, validator)
+    generated = industries_to_generate(industries, loaded, args)
+    build_industries(industries, generated, args)
+    return {name: industry_module_path(industries[name]) for name in generated}
+
+
+def watch_industries(
+    industries_path: str,
+    industries: dict[str, Industry],
+    args: argparse.Namespace,
+) -> None:
+    """Rebuild the industries whose files change, until interrupted.
+
+    A change of the YAML files of an industry rebuilds it and the
+    industries that take inputs from it, and a change of a template or a
+    schema rebuilds all of them, and builds the industries added since.
+    Only the industries selected with --only are generated.
+
+    Args:
+        industries_path (str): The directory of the industries.
+        industries (dict[str, Industry]): Processed industries by name.
+        args (argparse.Namespace): The command line arguments.
+    """
+    watcher = FileWatcher(
+        [(industries_path, "*.yaml"), ("templates", "*"), ("config", "*")]
+    )
+    sources = discover_industries(industries_path, args.manifest)
+    validator = Validator()
+    pending: set[str] = set()
+    i_logger.info("Watching %s, templates and config", industries_path)
+    try:
+        while True:
+            names = affected_industries(
+                watcher.wait(), {n: s.path for n, s in sources.items()}
+            )
+            if names is None:
+                # the schemas or the industries themselves may have changed
+                validator = Validator()
+                sources = discover_industries(industries_path, args.manifest)
+                names = set(industries) | select_industries(
+                    list(sources), args.only
+                )
+            # the industries neither selected nor upstream are not loaded
+            pending |= names & (
+                set(industries) | select_industries(list(sources), args.only)
+            )
+            try:
+                rebuild_industries(
+                    sources, industries, pending, validator, args
+                )
+                pending = set()
+            except Exception as err:  # pylint: disable=broad-exception-caught
+                i_logger.error("Industries not rebuilt: %s", err)
+    except KeyboardInterrupt:
+        i_logger.info("Watch stopped")
+
+
+def export_models(
+    catalogue: Catalogue,
+    industries: dict[str, Industry],
+    args: argparse.Namespace,
+) -> None:
+    """Write the optional models requested in the command line.
+
+    Args:
+        catalogue (Catalogue): The catalogue of the industries.
+        industries (dict[str, Industry]): Processed industries by name.
+        args (argparse.Namespace): The command line arguments.
+    """
+    if args.portfolio:
+        portfolio_path = os.path.join(INDUSTRIES_FINAL_PATH, "portfolio.py")
+        with open(portfolio_path, "w", encoding="utf-8") as f:
+            f.write(catalogue.portfolio_generator())
+        i_logger.info("Portfolio of industries processed.")
+    if args.coefficients is not None:
+        export_coefficients(
+            catalogue,
+            args.coefficients == "coo",
+            args.catalogue_coefficients,
+        )
+    if args.linear_program is not None:
+        export_linear_programs(catalogue, args.linear_program)
+    if args.surrogate is not None:
+        export_surrogates(industries, args.surrogate, args.surrogate_table)
+
+
+def serve_industries(
+    sources: dict[str, IndustrySource],
+    industries: dict[str, Industry],
+    validator: Validator,
+    args: argparse.Namespace,
+) -> None:
+    """Answer evaluation requests with the generated industries.
 
-def main() -> None:
+    The industries whose YAML files change are built again, with the
+    industries that depend on them, and replaced in the service. Only the
+    industries selected with --only are served.
+
+    Args:
+        sources (dict[str, IndustrySource]): The YAML files of all the
+            industries.
+        industries (dict[str, Industry]): Processed industries by name.
+        validator (Validator): The schema validator.
+        args (argparse.Namespace): The command line arguments.
+    """
+    service = EvaluationService(
+        lambda names: rebuild_industries(
+            sources, industries, names, validator, args
+        )
+    )
+    for name in sorted(select_industries(list(industries), args.only)):
+        service.add_industry(
+            name, sources[name].path, industry_module_path(industries[name])
+        )
+    serve(
+        service, args.serve, DEFAULT_RELOAD_INTERVAL if args.reload else None
+    )
+
+
+def run_compile_daemon(
+    industries_path: str,
+    industries: dict[str, Industry],
+    validator: Validator,
+    args: argparse.Namespace,
+) -> None:
+    """Build the industries requested by the compile client.
+
+    The schema validator, the templates, the parsed expressions and the
+    loaded industries stay in memory between the builds. Every build checks
+    the inputs taken from other industries, rebuilds the industries that
+    depend on the requested one and verifies them, as a full build does.
+    Only the industries selected with --only can be requested.
+
+    Args:
+        industries_path (str): The directory of the industries.
+        industries (dict[str, Industry]): Processed industries by name,
+            updated with the industries built again.
+        validator (Validator): The schema validator.
+        args (argparse.Namespace): The command line arguments.
+    """
+
+    def build(name: str) -> str:
+        sources = discover_industries(industries_path, args.manifest)
+        if name not in sources:
+            raise ValueError(f"Unknown industry '{name}'")
+        if name not in select_industries([name], args.only):
+            raise ValueError(f"Industry '{name}' not selected with --only")
+        module_paths = rebuild_industries(
+            sources, industries, {name}, validator, args
+        )
+        return module_paths[name]
+
+    CompileDaemon(build).serve(args.daemon)
+
+
+def parse_arguments(argv: list[str]) -> argparse.Namespace:
+    """Parse the command line arguments of the compiler.
+
+    Args:
+        argv (list[str]): The command line arguments.
+
+    Returns:
+        argparse.Namespace: The parsed arguments.
+    """
+    parser = argparse.ArgumentParser(description="IDR-IISIM compiler")
+    parser.add_argument(
+        "--manifest",
+        help="YAML file listing the industries and their YAML files, "
+        + "instead of walking INDUSTRIES_PATH (default: manifest.yaml in "
+        + "INDUSTRIES_PATH if it exists)",
+    )
+    parser.add_argument(
+        "--only",
+        nargs="+",
+        metavar="NAME",
+        help="build only the industries with these names or glob patterns, "
+        + "loading the industries they take inputs from without building "
+        + "them",
+    )
+    parser.add_argument(
+        "--optimize",
+        action="store_true",
+        help="leave the unused items out of the generated code",
+    )
+    parser.add_argument(
+        "--instrument",
+        action="store_true",
+        help="count the calls of the generated methods and the seconds "
+        + "spent in them, read with the stats class method",
+    )
+    parser.add_argument(
+        "--portfolio",
+        action="store_true",
+        help="generate a module that evaluates all the industries at once",
+    )
+    parser.add_argument(
+        "--coefficients",
+        choices=["dense", "coo"],
+        help="write the technical coefficients matrix of the linear "
+        + "industries, in dense or sparse (COO) format",
+    )
+    parser.add_argument(
+        "--catalogue-coefficients",
+        action="store_true",
+        help="with --coefficients, also write the matrix of all the industries",
+    )
+    parser.add_argument(
+        "--linear-program",
+        choices=["lp", "mps"],
+        help="write the constraints of the affine industries in LP or MPS "
+        + "format",
+    )
+    parser.add_argument(
+        "--surrogate",
+        type=float,
+        metavar="TOLERANCE",
+        help="generate piecewise-linear surrogates of the industries over "
+        + "the range of their outcome, within the given absolute error",
+    )
+    parser.add_argument(
+        "--surrogate-table",
+        action="store_true",
+        help="with --surrogate, use lookup tables of equally spaced points",
+    )
+    long_running = parser.add_mutually_exclusive_group()
+    long_running.add_argument(
+        "--serve",
+        nargs="?",
+        const=DEFAULT_ADDRESS,
+        metavar="ADDRESS",
+        help="after the build, answer evaluation requests over HTTP on "
+        + f"HOST:PORT (default {DEFAULT_ADDRESS}) or a Unix socket path",
+    )
+    long_running.add_argument(
+        "--watch",
+        action="store_true",
+        help="after the build, rebuild the industries whose YAML files, "
+        + "templates or schemas change",
+    )
+    long_running.add_argument(
+        "--daemon",
+        nargs="?",
+        const=DEFAULT_DAEMON_ADDRESS,
+        metavar="ADDRESS",
+        help="after the build, keep the compiler in memory and build the "
+        + "industries requested by src/client.py, on HOST:PORT (default "
+        + f"{DEFAULT_DAEMON_ADDRESS}) or a Unix socket path",
+    )
+    parser.add_argument(
+        "--no-reload",
+        dest="reload",
+        action="store_false",
+        help="with --serve, do not rebuild the industries whose YAML files "
+        + "change",
+    )
+    parser.add_argument(
+        "--timing",
+        nargs="?",
+        const=os.path.join(INDUSTRIES_FINAL_PATH, "timing.json"),
+        metavar="REPORT",
+        help="time the phases of the build, writing a JSON report "
+        + "(industries/timing.json by default) and logging a summary",
+    )
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const=os.path.join(INDUSTRIES_FINAL_PATH, "build.prof"),
+        metavar="PROF",
+        help="profile the build with cProfile, writing its statistics "
+        + "(industries/build.prof by default)",
+    )
+    parser.add_argument(
+        "--no-verify",
+        dest="verify",
+        action="store_false",
+        help="do not run the YAML tests against the generated code",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=DEFAULT_TOLERANCE,
+        help="maximum absolute difference allowed in the YAML tests",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[list[str]] = None) -> None:
     """Main program entry point.
 
-    The program iterates over all industries found in the specified source folder,
-    processing each industry to generate its corresponding model.
+    The program iterates over all industries found in the specified source
+    folder (or listed in its manifest), or those selected with --only,
+    processing each industry to generate its corresponding model. The
+    industries the selected ones take inputs from are loaded too, but only
+    generated if their model is missing. When the industries take inputs from
+    each other, a module that evaluates them together is also generated, as
+    well as a module that evaluates all of them at once if a portfolio is
+    requested. Then, the tests declared in the YAML files are run against the
+    generated models, and the models can be served to other tools.
+
+    Args:
+        argv (Optional[list[str]]): The command line arguments.
 
     Raises:
-        Exception: If there is an error during the processing of the industries.
+        SystemExit: With status 1, if the generated industries do not pass
+            their tests.
     """
+    args = parse_arguments(argv or [])
     try:
         i_logger.info("starting iDesignRES tool")
         industries_path = os.environ.get("INDUSTRIES_PATH", "Sources")
-        for elem in os.listdir(industries_path):
-            elem_path = os.path.join(industries_path, elem)
-            if os.path.isdir(elem_path):
-                process_industry(elem, elem_path)
+        sources = discover_industries(industries_path, args.manifest)
+        selected = select_industries(list(sources), args.only)
+        if not selected:
+            i_logger.warning("No industries found in %s", industries_path)
+        industries = {}
+        validator = Validator()
+        timer = PhaseTimer() if args.timing is not None else None
+        with profiled(args.profile), timed(timer):
+            for elem, source in sources.items():
+                if elem in selected:
+                    i_logger.info("Processing industry: %s", elem)
+                    industries[elem] = load_industry(
+                        elem, source.path, validator, source.files
+                    )
+            load_upstream_industries(sources, industries, validator)
+            build_industries(
+                industries,
+                industries_to_generate(industries, selected, args),
+                args,
+            )
+        if timer is not None:
+            timer.write_report(args.timing)
+            i_logger.info("Timing of the build:\n%s", timer.summary())
+        if args.profile is not None:
+            i_logger.info("Profile of the build written to %s", args.profile)
+        if args.watch:
+            watch_industries(industries_path, industries, args)
+        if args.serve is not None:
+            serve_industries(sources, industries, validator, args)
+        if args.daemon is not None:
+            run_compile_daemon(industries_path, industries, validator, args)
         i_logger.info("iDesignRES tool finished")
     except Exception as err:  # pylint: disable=broad-exception-caught
         print()
         traceback.print_exc()
         i_logger.error(err)
         i_logger.info("iDesignRES tool finished UNSUCCESFULLY")
+        if isinstance(err, VerificationError):
+            sys.exit(1)
 
 
 if __name__ == "__main__":
     #
     os.system("cls" if os.name == "nt" else "clear")
     load_dotenv()
-    main()
+    main(sys.argv[1:])
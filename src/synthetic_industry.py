@@ -0,0 +1,76 @@
+"""IDR-IISIM synthetic industry generator
+
+Writes the YAML files of a valid industry of any size, to test the
+compiler at scale:
+
+    python src/synthetic_industry.py Synthetic/Big --processes 1000 --depth 50
+"""
+
+import argparse
+import os
+import sys
+from typing import Optional
+
+from idr_iisim.utils.synthetic import SyntheticSpec, write_synthetic_industry
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """Generator entry point.
+
+    Args:
+        argv (Optional[list[str]]): The command line arguments.
+
+    Returns:
+        int: The exit status, 1 if the shape of the industry is not valid.
+    """
+    default = SyntheticSpec()
+    parser = argparse.ArgumentParser(
+        description="IDR-IISIM synthetic industry generator"
+    )
+    parser.add_argument(
+        "path", help="directory of the industry, created if needed"
+    )
+    parser.add_argument(
+        "--name",
+        help="name of the industry, a Python class name (default: the "
+        + "name of the directory)",
+    )
+    for option, help_text in [
+        ("processes", "number of processes"),
+        ("depth", "layers of processes, the longest chain"),
+        ("fan-in", "maximum processes a process takes outputs from"),
+        ("fan-out", "maximum processes that take the output of a process"),
+        ("constants", "constants of every process"),
+        ("complexity", "operations of every output"),
+        ("seed", "seed of the random choices"),
+    ]:
+        value = getattr(default, option.replace("-", "_"))
+        parser.add_argument(
+            f"--{option}",
+            type=int,
+            default=value,
+            help=f"{help_text} (default {value})",
+        )
+    args = parser.parse_args(argv or [])
+
+    spec = SyntheticSpec(
+        processes=args.processes,
+        depth=args.depth,
+        fan_in=args.fan_in,
+        fan_out=args.fan_out,
+        constants=args.constants,
+        complexity=args.complexity,
+        seed=args.seed,
+    )
+    name = args.name or os.path.basename(os.path.normpath(args.path))
+    try:
+        write_synthetic_industry(args.path, name, spec)
+    except ValueError as err:
+        print(err, file=sys.stderr)
+        return 1
+    print(f"{name}: {spec.processes + 1} YAML files written to {args.path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
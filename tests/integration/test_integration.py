@@ -8,6 +8,8 @@ from pathlib import Path
 from typing import Any
 from unittest.mock import patch
 
+import numpy as np
+
 from idr_iisim.utils.models_dict import (  # type:ignore # pylint: disable=import-error
     load_yaml,
 )
@@ -81,6 +83,45 @@ class TestIntegration(unittest.TestCase):
                 except Exception:  # pylint: disable=broad-exception-caught
                     self.fail("Industry not correctly generated")
 
+    def test_profile(self) -> None:
+        """Time series of outcomes, in float64 and float32"""
+        for elem in os.listdir(INDUSTRIES_PATH):
+            elem_path = os.path.join(INDUSTRIES_PATH, elem)
+            if os.path.isdir(elem_path):
+                process_industry(elem, elem_path)
+                yaml = _find_industry(elem_path)
+                module = importlib.import_module(
+                    f"industries.{yaml['short_name'].lower()}"
+                )
+                # 2 years by 8760 hours
+                outcomes = np.linspace(1, 100, 2 * 8760).reshape(2, 8760)
+                expected = module.evaluate(outcomes)
+                for dtype in ["float64", "float32"]:
+                    result = module.profile(outcomes, dtype=dtype)
+                    for name, series in result["series"].items():
+                        with self.subTest(dtype=dtype, item=name):
+                            self.assertEqual(series.shape, (2, 8760))
+                            self.assertEqual(series.dtype, np.dtype(dtype))
+                            self.assertEqual(
+                                result["totals"][name].shape, (2,)
+                            )
+                            self.assertTrue(
+                                np.allclose(
+                                    result["totals"][name],
+                                    np.sum(
+                                        expected[name] * np.ones((2, 8760)),
+                                        axis=-1,
+                                    ),
+                                    rtol=1e-5,
+                                )
+                            )
+                            self.assertTrue(
+                                np.allclose(
+                                    result["peaks"][name],
+                                    series.max(axis=-1),
+                                )
+                            )
+
     @patch("main.i_logger")
     def test_full_integration(self, mock_logger) -> None:
         """Full test (correct execution)"""
@@ -0,0 +1,69 @@
+"""benchmarks testing module"""
+
+import os
+import tempfile
+import unittest
+
+from benchmark import (  # type:ignore # pylint: disable=import-error
+    Measure,
+    compare_results,
+    read_results,
+    run_benchmarks,
+    write_results,
+)
+
+
+class TestBenchmark(unittest.TestCase):
+    """Test the benchmarks and their comparison"""
+
+    def test_run_benchmarks(self) -> None:
+        """The build phases and the model paths are measured"""
+        measures = run_benchmarks(None, [3], min_time=0.001)
+        for name in [
+            "build/Synthetic3/validate",
+            "build/Synthetic3/generate_execution_queue",
+            "build/Synthetic3/total",
+            "build/Synthetic3/peak_memory",
+            "model/Synthetic3/scalar",
+            "model/Synthetic3/function",
+            "model/Synthetic3/batch",
+            "model/Synthetic3/batch_peak_memory",
+        ]:
+            self.assertGreater(measures[name].value, 0, name)
+        self.assertTrue(measures["model/Synthetic3/batch"].higher_is_better)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "results.json")
+            write_results(measures, path)
+            self.assertEqual(read_results(path), measures)
+
+    def test_compare_results(self) -> None:
+        """Only the measures worse beyond the threshold are regressions"""
+        baseline = {
+            "build/a/total": Measure(1.0, "s"),
+            "build/a/write": Measure(0.001, "s"),
+            "build/a/peak_memory": Measure(1000, "bytes"),
+            "model/a/batch": Measure(100.0, "evaluations/s", True),
+            "model/a/scalar": Measure(100.0, "evaluations/s", True),
+        }
+        current = {
+            "build/a/total": Measure(1.2, "s"),
+            "build/a/write": Measure(0.004, "s"),
+            "build/a/peak_memory": Measure(2000, "bytes"),
+            "model/a/batch": Measure(50.0, "evaluations/s", True),
+            "model/a/scalar": Measure(200.0, "evaluations/s", True),
+            "model/b/batch": Measure(1.0, "evaluations/s", True),
+        }
+        regressions = compare_results(baseline, current, 0.25)
+        self.assertEqual(
+            [(r.name, r.change) for r in regressions],
+            [("build/a/peak_memory", 1.0), ("model/a/batch", 1.0)],
+        )
+        self.assertEqual(
+            [r.name for r in compare_results(baseline, current, 0.1)],
+            ["build/a/peak_memory", "model/a/batch", "build/a/total"],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,489 @@
+"""catalogue testing module"""
+
+import importlib
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from idr_iisim.utils.catalogue import (  # type:ignore # pylint: disable=import-error
+    Catalogue,
+)
+from idr_iisim.utils.daemon import (  # type:ignore # pylint: disable=import-error
+    send_request,
+)
+from idr_iisim.utils.discovery import (  # type:ignore # pylint: disable=import-error
+    discover_industries,
+)
+from idr_iisim.utils.interpreter import (  # type:ignore # pylint: disable=import-error
+    evaluate_industry,
+)
+from idr_iisim.utils.schema import (  # type:ignore # pylint: disable=import-error
+    Validator,
+)
+from idr_iisim.utils.server import (  # type:ignore # pylint: disable=import-error
+    EvaluationService,
+)
+from idr_iisim.utils.synthetic import (  # type:ignore # pylint: disable=import-error
+    SyntheticSpec,
+    write_synthetic_industry,
+)
+from idr_iisim.utils.verification import (  # type:ignore # pylint: disable=import-error
+    TestVector,
+    VerificationJob,
+    collect_test_vectors,
+    load_module,
+    verify_module,
+)
+from main import (  # type:ignore # pylint: disable=import-error
+    build_industries,
+    industry_module_path,
+    load_industry,
+    main,
+    parse_arguments,
+    rebuild_industries,
+    run_compile_daemon,
+    watch_industries,
+)
+
+CONCRETE_META = """
+id: Concrete-Meta
+name: Concrete industry
+short_name: Concrete
+type: industry
+description: Concrete industry
+version: 1.0.0
+debug: false
+constants:
+  - name: CEMENT_PROPORTION
+    description: Cement proportion
+    citation: text
+    source: https://www.google.com
+    value: 0.15
+    units: p.u.
+inputs:
+  - name: co2_overall_emissions
+    description: CO2 emissions of the cement
+    units: t
+    value: null
+    from: SOURCE
+    tests: [2550]
+outcome:
+  - name: total_concrete_production
+    description: Total concrete production
+    units: kt
+    same_result:
+      process: Concrete-process1-Mixing
+      output: concrete_mix
+    tests: [10]
+demands:
+  - name: cement_demand
+    units: kt
+    operation: total_concrete_production * CEMENT_PROPORTION
+    used: Concrete-process1-Mixing
+    args:
+      - name: CEMENT_PROPORTION
+        type: constants
+      - name: total_concrete_production
+        type: outcome
+    description: Total cement demand
+    tests: [1.5]
+meta: []
+outputs:
+  - name: co2_emissions
+    operation: co2_overall_emissions
+    args:
+      - name: co2_overall_emissions
+        type: inputs
+    description: CO2 emissions
+    units: t
+    tests: [2550]
+"""
+
+CONCRETE_MIXING = """
+id: Concrete-process1-Mixing
+name: Mixing
+short_name: mixing
+type: process
+description: Mixing
+version: 1.0.0
+debug: false
+constants: []
+inputs:
+  - name: cement_demand
+    description: Cement
+    value: null
+    units: kt
+    from: null
+outputs:
+  - name: concrete_mix
+    operation: cement_demand
+    args:
+      - name: cement_demand
+        type: inputs
+    description: Concrete mix
+    value: null
+    units: kt
+"""
+
+
+class TestCatalogue(unittest.TestCase):
+    """Test the industries that depend on each other"""
+
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()  # pylint: disable=R1732
+        self.cement = load_industry("Cement", "Sources/Cement")
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def load_concrete(self, source: str = "Cemento-process4-Meta"):  # type: ignore
+        """Write and load an industry that depends on the cement"""
+        path = os.path.join(self.tmp_dir.name, "Concrete")
+        os.makedirs(path, exist_ok=True)
+        with open(os.path.join(path, "meta.yaml"), "w", encoding="utf-8") as f:
+            f.write(CONCRETE_META.replace("SOURCE", source))
+        with open(
+            os.path.join(path, "mixing.yaml"), "w", encoding="utf-8"
+        ) as f:
+            f.write(CONCRETE_MIXING)
+        return load_industry("Concrete", path)
+
+    def import_generated(self, catalogue, name, script):  # type: ignore
+        """Write the generated modules to a package and import one of them"""
+        package = os.path.join(self.tmp_dir.name, "generated_industries")
+        os.makedirs(package, exist_ok=True)
+        modules = {"__init__": "", name: script}
+        for industry in catalogue.industries.values():
+            short_name = industry.meta.config.short_name.lower()
+            modules[short_name] = industry.script_generator()
+        for module, content in modules.items():
+            with open(
+                os.path.join(package, f"{module}.py"), "w", encoding="utf-8"
+            ) as f:
+                f.write(content)
+
+        sys.path.insert(0, self.tmp_dir.name)
+        try:
+            return importlib.import_module(f"generated_industries.{name}")
+        finally:
+            sys.path.remove(self.tmp_dir.name)
+            for module in list(sys.modules):
+                if module.startswith("generated_industries"):
+                    del sys.modules[module]
+
+    def test_schedule(self) -> None:
+        """Check that the industries are sorted by their dependencies"""
+        concrete = self.load_concrete()
+        self.assertEqual(
+            concrete.external_input_names(), ["co2_overall_emissions"]
+        )
+        catalogue = Catalogue()
+        catalogue.add_industry(concrete)
+        catalogue.add_industry(self.cement)
+        catalogue.check_types()
+        # the conversions are folded once, however many times it is checked
+        catalogue.check_types()
+        concrete.check_types()
+
+        self.assertTrue(catalogue.is_coupled())
+        self.assertEqual(
+            catalogue.generate_schedule(),
+            ["Cemento-process4-Meta", "Concrete-Meta"],
+        )
+        # kt from the cement are converted to t
+        values = evaluate_industry(
+            concrete, 10, {"co2_overall_emissions": 2.55}
+        )
+        self.assertAlmostEqual(values["co2_emissions"], 2550)
+
+    def test_dependents(self) -> None:
+        """Check the industries that take inputs from others"""
+        catalogue = Catalogue()
+        catalogue.add_industry(self.load_concrete())
+        catalogue.add_industry(self.cement)
+
+        self.assertEqual(
+            catalogue.dependents(["Cemento-process4-Meta"]),
+            {"Cemento-process4-Meta", "Concrete-Meta"},
+        )
+        self.assertEqual(
+            catalogue.dependents(["Concrete-Meta"]), {"Concrete-Meta"}
+        )
+        # only the inputs of the concrete are checked
+        catalogue.check_types(["Concrete-Meta"])
+
+    def test_unknown_industry(self) -> None:
+        """Check that inputs from unknown industries are rejected"""
+        catalogue = Catalogue()
+        catalogue.add_industry(self.load_concrete("Unknown-Meta"))
+        catalogue.add_industry(self.cement)
+        with self.assertRaises(ValueError):
+            catalogue.check_types()
+
+    def test_unknown_process(self) -> None:
+        """Check that inputs from unknown processes are rejected on load"""
+        with self.assertRaises(ValueError) as context:
+            self.load_concrete("Concrete-process2-Mixer")
+        self.assertIn(
+            "is not a process of 'Concrete-Meta'", str(context.exception)
+        )
+
+    def test_circular_dependencies(self) -> None:
+        """Check that circular dependencies are rejected"""
+        concrete = self.load_concrete("Concrete-Meta")
+        catalogue = Catalogue()
+        catalogue.add_industry(concrete)
+        with self.assertRaises(ValueError):
+            catalogue.generate_schedule()
+
+    def test_script_generator(self) -> None:
+        """Check the values of the generated coupled module"""
+        concrete = self.load_concrete()
+        catalogue = Catalogue()
+        catalogue.add_industry(self.cement)
+        catalogue.add_industry(concrete)
+        catalogue.check_types()
+
+        coupled = self.import_generated(
+            catalogue, "coupled", catalogue.script_generator()
+        )
+        results = coupled.evaluate({"Cement": 137, "Concrete": 10})
+
+        self.assertEqual(coupled.ORDER, ["Cement", "Concrete"])
+        self.assertEqual(round(results["Cement"]["clay_demand"], 2), 51.38)
+        self.assertAlmostEqual(results["Concrete"]["cement_demand"], 1.5)
+        self.assertAlmostEqual(
+            results["Concrete"]["co2_emissions"],
+            results["Cement"]["co2_overall_emissions"] * 1000,
+        )
+
+    def test_verify_coupled(self) -> None:
+        """Check that a coupled industry is verified with its inputs"""
+        concrete = self.load_concrete()
+        catalogue = Catalogue()
+        catalogue.add_industry(self.cement)
+        catalogue.add_industry(concrete)
+        catalogue.check_types()
+        vectors = collect_test_vectors(concrete)
+        # the input is declared in t, and given to the class in kt
+        self.assertEqual(
+            vectors,
+            [
+                TestVector(
+                    outcome=10,
+                    expected={"cement_demand": 1.5, "co2_emissions": 2550},
+                    inputs={"co2_overall_emissions": 2.55},
+                )
+            ],
+        )
+        self.import_generated(
+            catalogue, "coupled", catalogue.script_generator()
+        )
+        job = VerificationJob(
+            name="Concrete",
+            module_path=os.path.join(
+                self.tmp_dir.name, "generated_industries", "concrete.py"
+            ),
+            class_name="Concrete",
+            vectors=vectors,
+        )
+        self.assertEqual(verify_module(job), [])
+        job.vectors[0].inputs["co2_overall_emissions"] = 3.55
+        errors = verify_module(job)
+        self.assertEqual(len(errors), 1)
+        self.assertIn("co2_emissions", errors[0])
+        # the tests without the values of the inputs are not verified
+        for _, input_field in concrete.external_inputs:
+            input_field.tests = None
+        self.assertEqual(collect_test_vectors(concrete), [])
+
+    def write_sources(self) -> str:
+        """Write the cement and the concrete to a directory of industries"""
+        sources_path = os.path.join(self.tmp_dir.name, "Sources")
+        shutil.copytree("Sources/Cement", os.path.join(sources_path, "Cement"))
+        self.load_concrete()
+        shutil.copytree(
+            os.path.join(self.tmp_dir.name, "Concrete"),
+            os.path.join(sources_path, "Concrete"),
+        )
+        os.mkdir(os.path.join(self.tmp_dir.name, "industries"))
+        return sources_path
+
+    def test_service_reload(self) -> None:
+        """Check that the service reloads a coupled industry"""
+        sources_path = self.write_sources()
+        output = os.path.join(self.tmp_dir.name, "industries")
+        args = parse_arguments([])
+        sources = discover_industries(sources_path)
+        validator = Validator()
+        industries = {
+            name: load_industry(name, source.path, validator)
+            for name, source in sources.items()
+        }
+
+        with patch("main.INDUSTRIES_FINAL_PATH", output), patch.dict(
+            os.environ, {"YAML_CACHE_PATH": ""}
+        ):
+            build_industries(industries, set(industries), args)
+            service = EvaluationService(
+                lambda names: rebuild_industries(
+                    sources, industries, names, validator, args
+                )
+            )
+            for name, industry in industries.items():
+                service.add_industry(
+                    name, sources[name].path, industry_module_path(industry)
+                )
+
+            for name, reloaded in [
+                ("Concrete", ["Concrete"]),
+                ("Cement", ["Cement", "Concrete"]),
+            ]:
+                meta_path = os.path.join(sources[name].path, "meta.yaml")
+                mtime = os.path.getmtime(meta_path) + 10
+                os.utime(meta_path, (mtime, mtime))
+                self.assertEqual(sorted(service.reload_changed()), reloaded)
+                # the kt from the cement are still converted to t
+                values = service.industry("Concrete").evaluate(10, 2.55)
+                self.assertAlmostEqual(values["co2_emissions"], 2550)
+            self.assertTrue(os.path.isfile(os.path.join(output, "coupled.py")))
+
+    def test_only_upstream(self) -> None:
+        """Check that --only loads the industries the selection takes from"""
+        sources_path = self.write_sources()
+        output = os.path.join(self.tmp_dir.name, "industries")
+        cement_path = os.path.join(output, "cement.py")
+
+        with patch("main.INDUSTRIES_FINAL_PATH", output), patch.dict(
+            os.environ,
+            {"INDUSTRIES_PATH": sources_path, "YAML_CACHE_PATH": ""},
+        ):
+            main(["--only", "Concrete"])
+            # the cement is generated because the coupled module imports it
+            self.assertEqual(
+                sorted(os.listdir(output)),
+                ["cement.py", "concrete.py", "coupled.py"],
+            )
+            mtime = os.stat(cement_path).st_mtime_ns
+            time.sleep(0.01)
+            main(["--only", "Concrete"])
+        self.assertEqual(os.stat(cement_path).st_mtime_ns, mtime)
+
+    def test_watch_new_industry(self) -> None:
+        """Check that an industry added while watching is built"""
+        sources_path = self.write_sources()
+        output = os.path.join(self.tmp_dir.name, "industries")
+        glass_path = os.path.join(sources_path, "Glass")
+
+        def wait() -> set[str]:
+            # the industry is added, then the watch is interrupted
+            if os.path.exists(glass_path):
+                raise KeyboardInterrupt
+            write_synthetic_industry(glass_path, "Glass", SyntheticSpec())
+            return {os.path.join(glass_path, "meta.yaml")}
+
+        sources = discover_industries(sources_path)
+        industries = {
+            name: load_industry(name, source.path)
+            for name, source in sources.items()
+        }
+        with patch("main.INDUSTRIES_FINAL_PATH", output), patch.dict(
+            os.environ, {"YAML_CACHE_PATH": ""}
+        ), patch("main.FileWatcher") as watcher:
+            watcher.return_value.wait.side_effect = wait
+            watch_industries(sources_path, industries, parse_arguments([]))
+        self.assertIn("Glass", industries)
+        self.assertTrue(os.path.isfile(os.path.join(output, "glass.py")))
+
+    def test_compile_daemon(self) -> None:
+        """Check that the daemon checks and verifies a coupled industry"""
+        sources_path = self.write_sources()
+        output = os.path.join(self.tmp_dir.name, "industries")
+        address = os.path.join(self.tmp_dir.name, "daemon.sock")
+        args = parse_arguments(["--daemon", address])
+        sources = discover_industries(sources_path)
+        industries = {
+            name: load_industry(name, source.path)
+            for name, source in sources.items()
+        }
+        meta_path = os.path.join(sources_path, "Concrete", "meta.yaml")
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = f.read()
+
+        with patch("main.INDUSTRIES_FINAL_PATH", output), patch.dict(
+            os.environ, {"YAML_CACHE_PATH": ""}
+        ):
+            build_industries(industries, set(industries), args)
+            thread = threading.Thread(
+                target=run_compile_daemon,
+                args=(sources_path, industries, Validator(), args),
+            )
+            thread.start()
+            while not os.path.exists(address):
+                time.sleep(0.01)
+            try:
+                answer = send_request({"build": "Concrete"}, address)
+                self.assertTrue(answer["ok"], answer.get("error"))
+                concrete = load_module(answer["module"], "daemon_concrete")
+                values = concrete.evaluate(10, 2.55)
+                self.assertAlmostEqual(values["co2_emissions"], 2550)
+
+                for content, error in [
+                    (
+                        meta.replace("tests: [1.5]", "tests: [2.5]"),
+                        "do not pass their tests",
+                    ),
+                    (
+                        meta.replace("Cemento-process4-Meta", "Cement-Meta"),
+                        "is not a process of 'Concrete-Meta' or a known",
+                    ),
+                ]:
+                    with open(meta_path, "w", encoding="utf-8") as f:
+                        f.write(content)
+                    answer = send_request({"build": "Concrete"}, address)
+                    self.assertFalse(answer["ok"])
+                    self.assertIn(error, answer["error"])
+            finally:
+                send_request({"stop": True}, address)
+                thread.join()
+
+    def test_portfolio_generator(self) -> None:
+        """Check the result matrix of the generated portfolio module"""
+        concrete = self.load_concrete()
+        catalogue = Catalogue()
+        catalogue.add_industry(concrete)
+        catalogue.add_industry(self.cement)
+        catalogue.check_types()
+        portfolio = self.import_generated(
+            catalogue, "portfolio", catalogue.portfolio_generator()
+        )
+
+        self.assertEqual(portfolio.INDUSTRIES, ["Cement", "Concrete"])
+        self.assertEqual(
+            len(portfolio.COLUMNS),
+            len(self.cement.meta.get_units()) + 3,
+        )
+        results = portfolio.evaluate([[5, 10], [137, 20]])
+        self.assertEqual(results.shape, (2, len(portfolio.COLUMNS)))
+
+        clay = results[:, portfolio.column("Cement", "clay_demand")]
+        self.assertEqual(list(clay.round(2)), [1.88, 51.38])
+        cement = results[:, portfolio.column("Concrete", "cement_demand")]
+        self.assertEqual(list(cement), [1.5, 3.0])
+        emissions = results[:, portfolio.column("Concrete", "co2_emissions")]
+        expected = results[
+            :, portfolio.column("Cement", "co2_overall_emissions")
+        ]
+        self.assertEqual(list(emissions), list(expected * 1000))
+
+        with self.assertRaises(ValueError):
+            portfolio.evaluate([5, 137])
+
+
+if __name__ == "__main__":
+    unittest.main()
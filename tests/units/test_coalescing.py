@@ -0,0 +1,82 @@
+"""asynchronous evaluation testing module"""
+
+import asyncio
+import unittest
+from types import ModuleType
+from typing import Any
+
+import numpy as np
+
+from idr_iisim.utils.coalescing import (  # type:ignore # pylint: disable=import-error
+    AsyncEvaluator,
+)
+
+MODULE_PATH = "industries/cement.py"
+
+
+def _evaluate(production: Any) -> dict[str, Any]:
+    """Evaluate an industry that takes positive outcomes"""
+    if np.any(production < 0):
+        raise ValueError("The production should be positive")
+    return {"production": production, "demand": production * 2}
+
+
+class TestCoalescing(unittest.IsolatedAsyncioTestCase):
+    """Test the coalescing of concurrent requests"""
+
+    def setUp(self) -> None:
+        self.evaluator = AsyncEvaluator.from_paths(
+            {"Cement": MODULE_PATH}, window=0.01
+        )
+
+    async def test_coalesced_requests(self) -> None:
+        """Check that concurrent requests are evaluated in one batch"""
+        results = await asyncio.gather(
+            *(self.evaluator.evaluate("Cement", x) for x in range(1, 101))
+        )
+
+        self.assertEqual(self.evaluator.requests, 100)
+        self.assertEqual(self.evaluator.batches, 1)
+        for x, values in zip(range(1, 101), results):
+            self.assertAlmostEqual(values["clay_demand"], x * 0.375)
+            self.assertIsInstance(values["clay_demand"], float)
+
+    async def test_maximum_batch(self) -> None:
+        """Check that the batches are split at their maximum size"""
+        self.evaluator.max_batch = 30
+        await asyncio.gather(
+            *(self.evaluator.evaluate("Cement", x) for x in range(1, 101))
+        )
+        self.assertEqual(self.evaluator.batches, 4)
+
+    async def test_arguments(self) -> None:
+        """Check that the constants are batched with the outcomes"""
+        results = await asyncio.gather(
+            self.evaluator.evaluate(
+                "Cement", 10, CO2_EMISSIONS_PROPORTION=0.1
+            ),
+            self.evaluator.evaluate(
+                "Cement", 10, CO2_EMISSIONS_PROPORTION=0.2
+            ),
+            self.evaluator.evaluate("Cement", 10),
+        )
+        self.assertAlmostEqual(results[0]["co2_overall_emissions"], 1)
+        self.assertAlmostEqual(results[1]["co2_overall_emissions"], 2)
+        self.assertAlmostEqual(results[2]["co2_overall_emissions"], 5.1)
+        self.assertEqual(self.evaluator.batches, 2)
+
+    async def test_failing_request(self) -> None:
+        """Check that only the failing requests of a batch raise"""
+        module = ModuleType("positive")
+        setattr(module, "evaluate", _evaluate)
+        self.evaluator.modules["Positive"] = module
+        results = await asyncio.gather(
+            self.evaluator.evaluate("Positive", 10),
+            self.evaluator.evaluate("Positive", -1),
+            self.evaluator.evaluate("Positive", 3),
+            return_exceptions=True,
+        )
+        self.assertEqual(results[0], {"production": 10, "demand": 20})
+        self.assertIsInstance(results[1], ValueError)
+        self.assertEqual(results[2], {"production": 3, "demand": 6})
+        self.assertEqual(self.evaluator.batches, 1)
@@ -0,0 +1,104 @@
+"""coefficients testing module"""
+
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+
+from idr_iisim.models.model import (  # type:ignore # pylint: disable=import-error
+    compile_operation,
+)
+from idr_iisim.utils.catalogue import (  # type:ignore # pylint: disable=import-error
+    Catalogue,
+)
+from idr_iisim.utils.coefficients import (  # type:ignore # pylint: disable=import-error
+    catalogue_coefficients,
+    industry_coefficients,
+)
+from idr_iisim.utils.interpreter import (  # type:ignore # pylint: disable=import-error
+    evaluate_industry,
+)
+from main import (  # type:ignore # pylint: disable=import-error
+    load_industry,
+)
+
+
+class TestCoefficients(unittest.TestCase):
+    """Test the technical coefficients matrices"""
+
+    def setUp(self) -> None:
+        self.industry = load_industry("Cement", "Sources/Cement")
+
+    def test_industry_coefficients(self) -> None:
+        """Check that the matrix reproduces the values of the industry"""
+        coefficients = industry_coefficients(self.industry)
+        units = self.industry.meta.get_units()
+
+        self.assertEqual(coefficients.industries, ["Cement"])
+        self.assertEqual(coefficients.column_units, ["kt"])
+        self.assertEqual(
+            [name for _, name in coefficients.rows], list(units)[1:]
+        )
+        self.assertEqual(
+            coefficients.row_units, [units[n] for n in list(units)[1:]]
+        )
+        self.assertEqual(coefficients.matrix.shape, (len(units) - 1, 1))
+
+        values = evaluate_industry(self.industry, 137)
+        products = coefficients.matrix @ np.array([137])
+        for (_, name), product in zip(coefficients.rows, products):
+            with self.subTest(item=name):
+                self.assertAlmostEqual(product, values[name])
+
+    def test_catalogue_coefficients(self) -> None:
+        """Check the matrix of a catalogue and its COO format"""
+        catalogue = Catalogue()
+        catalogue.add_industry(self.industry)
+        coefficients = catalogue_coefficients(catalogue)
+        expected = industry_coefficients(self.industry)
+
+        self.assertTrue(np.allclose(coefficients.matrix, expected.matrix))
+        row, col, data = coefficients.coo()
+        self.assertEqual(list(row), list(np.nonzero(expected.matrix)[0]))
+        self.assertEqual(set(col), {0})
+        self.assertTrue(np.allclose(data, expected.matrix[row, col]))
+
+    def test_not_linear(self) -> None:
+        """Check that non linear industries are rejected"""
+        outcome = self.industry.meta.config.outcome.name
+        sequence = self.industry.evaluation_sequence()
+        sequence[0] = (sequence[0][0], compile_operation(f"{outcome} ** 2"))
+        with patch(
+            "idr_iisim.utils.models_dict.Industry.evaluation_sequence",
+            return_value=sequence,
+        ), self.assertRaises(ValueError):
+            industry_coefficients(self.industry)
+
+    def test_save(self) -> None:
+        """Check the dense and COO files"""
+        coefficients = industry_coefficients(self.industry)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "dense.npz")
+            coefficients.save(path)
+            with np.load(path) as data:
+                self.assertTrue(
+                    np.array_equal(data["matrix"], coefficients.matrix)
+                )
+                self.assertEqual(list(data["industries"]), ["Cement"])
+
+            path = os.path.join(tmp_dir, "coo.npz")
+            coefficients.save(path, sparse=True)
+            with np.load(path) as data:
+                matrix = np.zeros(data["shape"])
+                matrix[data["row"], data["col"]] = data["data"]
+                self.assertTrue(np.array_equal(matrix, coefficients.matrix))
+                self.assertEqual(
+                    list(data["row_names"]),
+                    [name for _, name in coefficients.rows],
+                )
+
+
+if __name__ == "__main__":
+    unittest.main()
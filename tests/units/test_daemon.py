@@ -0,0 +1,96 @@
+"""compile daemon testing module"""
+
+import json
+import os
+import shutil
+import socket
+import tempfile
+import threading
+import time
+import unittest
+
+from idr_iisim.utils.daemon import (  # type:ignore # pylint: disable=import-error
+    CompileDaemon,
+    send_request,
+)
+
+
+class TestDaemon(unittest.TestCase):
+    """Test the compile daemon and its client"""
+
+    def setUp(self) -> None:
+        self.directory = tempfile.mkdtemp()
+        self.address = os.path.join(self.directory, "daemon.sock")
+        self.daemon = CompileDaemon(self._build)
+        self.thread = threading.Thread(
+            target=self.daemon.serve, args=(self.address,)
+        )
+        self.thread.start()
+        while not os.path.exists(self.address):
+            time.sleep(0.01)
+
+    def tearDown(self) -> None:
+        if self.thread.is_alive():
+            send_request({"stop": True}, self.address)
+        self.thread.join()
+        shutil.rmtree(self.directory)
+
+    def _build(self, name: str) -> str:
+        """Build an industry"""
+        if name != "Cement":
+            raise ValueError(f"Unknown industry '{name}'")
+        return "industries/cement.py"
+
+    def test_build(self) -> None:
+        """Check that the industries are built on request"""
+        answer = send_request({"build": "Cement"}, self.address)
+        self.assertTrue(answer["ok"])
+        self.assertEqual(answer["module"], "industries/cement.py")
+        self.assertGreaterEqual(answer["seconds"], 0)
+        self.assertEqual(self.daemon.builds, 1)
+
+    def test_errors(self) -> None:
+        """Check that the failed builds are reported"""
+        answer = send_request({"build": "Steel"}, self.address)
+        self.assertFalse(answer["ok"])
+        self.assertIn("Unknown industry 'Steel'", answer["error"])
+        self.assertFalse(send_request({}, self.address)["ok"])
+
+    def test_invalid_requests(self) -> None:
+        """Check that the requests that are not objects are rejected"""
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+            connection.connect(self.address)
+            stream = connection.makefile("rwb")
+            answers = []
+            for line in [b"[1]\n", b"not json\n", b'{"build": "Cement"}\n']:
+                stream.write(line)
+                stream.flush()
+                answers.append(json.loads(stream.readline()))
+            stream.close()
+        self.assertEqual([a["ok"] for a in answers], [False, False, True])
+        self.assertIn("should be an object", answers[0]["error"])
+
+    def test_timeout(self) -> None:
+        """Check that the client stops waiting for a stuck daemon"""
+        path = os.path.join(self.directory, "stuck.sock")
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+            server.bind(path)
+            server.listen()
+            with self.assertRaises(TimeoutError):
+                send_request({"build": "Cement"}, path, timeout=0.1)
+
+    def test_stale_socket(self) -> None:
+        """Check that only a stale socket is replaced"""
+        path = os.path.join(self.directory, "results.csv")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("region\n")
+        with self.assertRaises(ValueError):
+            CompileDaemon(self._build).make_server(path)
+        self.assertTrue(os.path.isfile(path))
+
+    def test_stop(self) -> None:
+        """Check that the daemon stops on request"""
+        self.assertTrue(send_request({"stop": True}, self.address)["ok"])
+        self.thread.join(5)
+        self.assertFalse(self.thread.is_alive())
+        self.assertFalse(os.path.exists(self.address))
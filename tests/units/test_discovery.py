@@ -0,0 +1,105 @@
+"""industry discovery testing module"""
+
+import os
+import tempfile
+import unittest
+
+from idr_iisim.utils.discovery import (  # type:ignore # pylint: disable=import-error
+    discover_industries,
+    industry_ids,
+    load_manifest,
+)
+
+MANIFEST = """
+Cement:
+  files: [meta.yaml, pre.yaml]
+Steel:
+  path: steel/v2
+Glass:
+"""
+
+
+class TestDiscovery(unittest.TestCase):
+    """Test the discovery of the industries"""
+
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()  # pylint: disable=R1732
+        self.root = self.tmp_dir.name
+        for path in ["Cement/images", "Cement/old", "Steel", "steel/v2"]:
+            os.makedirs(os.path.join(self.root, path))
+        for path in [
+            "Cement/meta.yaml",
+            "Cement/old/pre.yaml",
+            "Steel/a.yaml",
+        ]:
+            self.write(path, "type: industry\n")
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def write(self, path: str, content: str) -> str:
+        """Write a file under the temporary directory"""
+        path = os.path.join(self.root, path)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(content)
+        return path
+
+    def test_walk(self) -> None:
+        """Check that the directories are the industries without manifest"""
+        sources = discover_industries(self.root)
+        self.assertEqual(set(sources), {"Cement", "Steel", "steel"})
+        self.assertEqual(
+            sorted(sources["Cement"].yaml_files()),
+            [
+                os.path.join(self.root, "Cement", "meta.yaml"),
+                os.path.join(self.root, "Cement", "old", "pre.yaml"),
+            ],
+        )
+
+    def test_manifest(self) -> None:
+        """Check that the manifest lists the industries and their files"""
+        manifest = self.write("industries.yaml", MANIFEST)
+        sources = load_manifest(manifest)
+
+        self.assertEqual(list(sources), ["Cement", "Steel", "Glass"])
+        self.assertEqual(
+            sources["Cement"].files,
+            [
+                os.path.join(self.root, "Cement", "meta.yaml"),
+                os.path.join(self.root, "Cement", "pre.yaml"),
+            ],
+        )
+        self.assertEqual(
+            sources["Steel"].path, os.path.join(self.root, "steel/v2")
+        )
+        self.assertIsNone(sources["Glass"].files)
+        # the default manifest is used without walking the directories
+        self.write("manifest.yaml", MANIFEST)
+        self.assertEqual(
+            set(discover_industries(self.root)), {"Cement", "Steel", "Glass"}
+        )
+
+    def test_only(self) -> None:
+        """Check that the industries are selected by name or pattern"""
+        self.assertEqual(
+            set(discover_industries(self.root, only=["Cem*", "steel"])),
+            {"Cement", "steel"},
+        )
+        manifest = self.write("industries.yaml", MANIFEST)
+        self.assertEqual(
+            set(discover_industries(self.root, manifest, ["Glass"])),
+            {"Glass"},
+        )
+
+    def test_industry_ids(self) -> None:
+        """Check that the industries are found by the id of their meta"""
+        self.write("Cement/meta.yaml", "id: Cement-Meta\ntype: industry\n")
+        self.write("Cement/old/pre.yaml", "id: Cement-pre\ntype: process\n")
+        sources = discover_industries(self.root, only=["Cement"])
+        self.assertEqual(industry_ids(sources), {"Cement-Meta": "Cement"})
+
+    def test_invalid_manifest(self) -> None:
+        """Check that the entries only have a path and files"""
+        manifest = self.write("industries.yaml", "Cement:\n  name: x\n")
+        with self.assertRaises(ValueError):
+            load_manifest(manifest)
@@ -0,0 +1,115 @@
+"""YAML documents loading testing module"""
+
+import os
+import tempfile
+import unittest
+from glob import glob
+from unittest.mock import patch
+
+import yaml
+
+from idr_iisim.utils.documents import (  # type:ignore # pylint: disable=import-error
+    DocumentCache,
+    default_cache,
+    load_documents,
+)
+
+SOURCES_PATH = os.path.join("Sources", "Cement")
+
+
+class TestDocuments(unittest.TestCase):
+    """Test the loading of the YAML files"""
+
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()  # pylint: disable=R1732
+        self.cache_path = os.path.join(self.tmp_dir.name, "cache")
+        self.paths = sorted(
+            glob(os.path.join(SOURCES_PATH, "**", "*.yaml"), recursive=True)
+        )
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def expected(self) -> list[dict[str, object]]:
+        """Documents parsed one at a time with the pure Python loader"""
+        documents = []
+        for path in self.paths:
+            with open(path, encoding="utf-8") as file:
+                documents.append(yaml.safe_load(file))
+        return documents
+
+    def test_load_documents(self) -> None:
+        """The documents are the ones of the safe loader, in order"""
+        self.assertGreater(len(self.paths), 1)
+        self.assertEqual(load_documents(self.paths), self.expected())
+
+    def test_cache(self) -> None:
+        """Unchanged files are taken from the cache"""
+        cache = DocumentCache(self.cache_path)
+        self.assertEqual(load_documents(self.paths, cache), self.expected())
+        self.assertEqual((cache.hits, cache.misses), (0, len(self.paths)))
+
+        cache = DocumentCache(self.cache_path)
+        self.assertEqual(load_documents(self.paths, cache), self.expected())
+        self.assertEqual((cache.hits, cache.misses), (len(self.paths), 0))
+
+    def test_cache_changed_file(self) -> None:
+        """A changed file is parsed again"""
+        path = os.path.join(self.tmp_dir.name, "a.yaml")
+        cache = DocumentCache(self.cache_path)
+        for value in [1, 2, 1]:
+            with open(path, "w", encoding="utf-8") as file:
+                file.write(f"value: {value}\n")
+            self.assertEqual(cache.load(path), {"value": value})
+        self.assertEqual((cache.hits, cache.misses), (1, 2))
+
+    def test_cache_corrupted(self) -> None:
+        """A corrupted document of the cache is parsed again"""
+        path = os.path.join(self.tmp_dir.name, "a.yaml")
+        with open(path, "wb") as file:
+            file.write(b"value: 1\n")
+        cache = DocumentCache(self.cache_path)
+        cache.load(path)
+        for name in os.listdir(self.cache_path):
+            with open(os.path.join(self.cache_path, name), "wb") as file:
+                file.write(b"not a pickle")
+        self.assertEqual(cache.load(path), {"value": 1})
+        self.assertEqual(cache.misses, 2)
+
+    def test_cache_unloadable(self) -> None:
+        """A cached document that fails to load in any way is parsed again"""
+        path = os.path.join(self.tmp_dir.name, "a.yaml")
+        with open(path, "wb") as file:
+            file.write(b"value: 1\n")
+        cache = DocumentCache(self.cache_path)
+        cache.load(path)
+        for name in os.listdir(self.cache_path):
+            with open(os.path.join(self.cache_path, name), "wb") as file:
+                file.write(b"cos\nnot_a_function\n.")
+        self.assertEqual(cache.load(path), {"value": 1})
+        self.assertEqual(cache.misses, 2)
+
+    def test_cache_failed_write(self) -> None:
+        """A document that fails to be stored leaves no file behind"""
+        path = os.path.join(self.tmp_dir.name, "a.yaml")
+        with open(path, "wb") as file:
+            file.write(b"value: 1\n")
+        cache = DocumentCache(self.cache_path)
+        with patch("pickle.dump", side_effect=TypeError("not picklable")):
+            self.assertEqual(cache.load(path), {"value": 1})
+        self.assertEqual(os.listdir(self.cache_path), [])
+
+    def test_default_cache(self) -> None:
+        """The cache is only used if its directory is set"""
+        with patch.dict(os.environ, clear=True):
+            self.assertIsNone(default_cache())
+        with patch.dict(os.environ, {"YAML_CACHE_PATH": ""}):
+            self.assertIsNone(default_cache())
+        with patch.dict(os.environ, {"YAML_CACHE_PATH": self.cache_path}):
+            cache = default_cache()
+        assert cache is not None
+        self.assertEqual(cache.path, self.cache_path)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+"""interpreter testing module"""
+
+import unittest
+
+from idr_iisim.utils.interpreter import (  # type:ignore # pylint: disable=import-error
+    evaluate_industry,
+)
+from main import (  # type:ignore # pylint: disable=import-error
+    load_industry,
+)
+
+# Expected values of the cement industry (taken from its YAML tests)
+CEMENT_TESTS = {
+    5: {
+        "limestone_demand": 5.17,
+        "clay_demand": 1.88,
+        "fuel_demand": 0.65,
+        "water_demand": 1.11,
+        "gypsum_demand": 0.17,
+        "mechanical_energy": 1.61,
+        "co2_overall_emissions": 2.55,
+        "heat_overall_losses": 0,
+        "pm10_overall_emission": 0.19,
+    },
+    137: {
+        "limestone_demand": 141.79,
+        "clay_demand": 51.38,
+        "fuel_demand": 17.81,
+        "water_demand": 30.41,
+        "gypsum_demand": 4.74,
+        "mechanical_energy": 44.01,
+        "co2_overall_emissions": 69.87,
+        "heat_overall_losses": 0.09,
+        "pm10_overall_emission": 5.10,
+    },
+}
+
+
+class TestInterpreter(unittest.TestCase):
+    """Test the reference interpreter"""
+
+    def setUp(self) -> None:
+        self.industry = load_industry("Cement", "Sources/Cement")
+
+    def test_evaluate_industry(self) -> None:
+        """Check the values of the cement industry"""
+        for outcome, expected in CEMENT_TESTS.items():
+            values = evaluate_industry(self.industry, outcome)
+            self.assertEqual(
+                list(values), list(self.industry.meta.get_units())
+            )
+            self.assertEqual(values["total_cement_production"], outcome)
+            for name, value in expected.items():
+                with self.subTest(outcome=outcome, item=name):
+                    self.assertIsInstance(values[name], float)
+                    self.assertEqual(round(values[name], 2), value)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+"""intervals testing module"""
+
+import math
+import unittest
+
+from sympy import parse_expr
+
+from idr_iisim.utils.intervals import (  # type:ignore # pylint: disable=import-error
+    UNBOUNDED,
+    Interval,
+    expression_bounds,
+)
+from main import (  # type:ignore # pylint: disable=import-error
+    load_industry,
+)
+
+BOUNDS = {
+    "x": Interval(-2, 3),
+    "y": Interval(1, 4),
+    "z": Interval(0, math.inf),
+}
+
+
+class TestIntervals(unittest.TestCase):
+    """Test the interval arithmetic"""
+
+    def test_expression_bounds(self) -> None:
+        """Check the bounds of several operations"""
+        cases = {
+            "x * y": Interval(-8, 12),
+            "x - y": Interval(-6, 2),
+            "x**2": Interval(0, 9),
+            "1 / y": Interval(0.25, 1),
+            "sqrt(y)": Interval(1, 2),
+            "2**x": Interval(0.25, 8),
+            "Abs(x)": Interval(0, 3),
+            "Max(x, y)": Interval(1, 4),
+            "y * (1 - 0.5)": Interval(0.5, 2),
+            "y * z": Interval(0, math.inf),
+            "C * y": Interval(-math.inf, math.inf),
+        }
+        for expression, expected in cases.items():
+            with self.subTest(expression=expression):
+                self.assertEqual(
+                    expression_bounds(parse_expr(expression), BOUNDS),
+                    expected,
+                )
+
+    def test_expression_bounds_unbounded(self) -> None:
+        """Check that undefined operations are unbounded"""
+        for expression in ["1 / x", "x**0.5", "log(x - 5)", "sin(x)"]:
+            with self.subTest(expression=expression):
+                self.assertEqual(
+                    expression_bounds(parse_expr(expression), BOUNDS),
+                    UNBOUNDED,
+                )
+
+    def test_compute_bounds(self) -> None:
+        """Check the bounds of the cement industry"""
+        industry = load_industry("Cement", "Sources/Cement")
+        self.assertEqual(
+            industry.compute_bounds()["limestone_demand"], UNBOUNDED
+        )
+
+        industry.meta.config.outcome.range = [5, 137]
+        bounds = industry.compute_bounds()
+        self.assertEqual(list(bounds), list(industry.meta.get_units()))
+        self.assertEqual(bounds["total_cement_production"], Interval(5, 137))
+        limestone = bounds["limestone_demand"]
+        self.assertAlmostEqual(limestone.low, 5 * 1.035)
+        self.assertAlmostEqual(limestone.high, 137 * 1.035)
+        # The tests of the YAML file are inside the bounds
+        emission = bounds["pm10_overall_emission"]
+        self.assertTrue(emission.low <= 0.19 and 5.10 <= emission.high)
+
+
+if __name__ == "__main__":
+    unittest.main()
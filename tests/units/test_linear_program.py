@@ -0,0 +1,91 @@
+"""linear program testing module"""
+
+import unittest
+from unittest.mock import patch
+
+from idr_iisim.models.model import (  # type:ignore # pylint: disable=import-error
+    compile_operation,
+)
+from idr_iisim.utils.interpreter import (  # type:ignore # pylint: disable=import-error
+    evaluate_industry,
+)
+from idr_iisim.utils.linear_program import (  # type:ignore # pylint: disable=import-error
+    affine_relations,
+    lp_generator,
+    mps_generator,
+)
+from main import (  # type:ignore # pylint: disable=import-error
+    load_industry,
+)
+
+
+class TestLinearProgram(unittest.TestCase):
+    """Test the export of the industries as linear constraints"""
+
+    def setUp(self) -> None:
+        self.industry = load_industry("Cement", "Sources/Cement")
+        self.outcome = self.industry.meta.config.outcome.name
+
+    def test_affine_relations(self) -> None:
+        """Check that the relations reproduce the values of the industry"""
+        relations = affine_relations(self.industry)
+        values = evaluate_industry(self.industry, 137)
+
+        self.assertEqual(
+            [r.name for r in relations],
+            list(self.industry.meta.get_units())[1:],
+        )
+        for relation in relations:
+            with self.subTest(item=relation.name):
+                self.assertEqual(list(relation.coefficients), [self.outcome])
+                self.assertAlmostEqual(
+                    relation.coefficients[self.outcome] * 137
+                    + relation.constant,
+                    values[relation.name],
+                )
+
+    def test_not_affine(self) -> None:
+        """Check that the nonlinear expressions are reported"""
+        sequence = self.industry.evaluation_sequence()
+        sequence[0] = (
+            sequence[0][0],
+            compile_operation(f"{self.outcome} ** 2"),
+        )
+        with patch(
+            "idr_iisim.utils.models_dict.Industry.evaluation_sequence",
+            return_value=sequence,
+        ):
+            with self.assertRaises(ValueError) as context:
+                lp_generator(self.industry)
+        self.assertIn(
+            f"{sequence[0][0]} = {self.outcome}**2", str(context.exception)
+        )
+
+    def test_lp_generator(self) -> None:
+        """Check the sections and constraints of the LP file"""
+        lines = lp_generator(self.industry).splitlines()
+
+        for section in ["Minimize", "Subject To", "Bounds", "End"]:
+            self.assertIn(section, lines)
+        self.assertIn(
+            " def_clay_demand: clay_demand - 0.375 "
+            + f"{self.outcome} = 0.0",
+            lines,
+        )
+        self.assertIn(f" {self.outcome} free", lines)
+
+    def test_mps_generator(self) -> None:
+        """Check the sections and columns of the MPS file"""
+        lines = mps_generator(self.industry).splitlines()
+
+        self.assertEqual(lines[0], "NAME Cement")
+        for section in ["ROWS", "COLUMNS", "RHS", "BOUNDS", "ENDATA"]:
+            self.assertIn(section, lines)
+        self.assertIn(" E def_clay_demand", lines)
+        self.assertIn(" clay_demand def_clay_demand 1.0", lines)
+        self.assertIn(f" {self.outcome} def_clay_demand -0.375", lines)
+        self.assertIn(f" FR BND {self.outcome}", lines)
+
+
+if __name__ == "__main__":
+    unittest.main()
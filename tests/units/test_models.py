@@ -1,14 +1,20 @@
 """Test industries and process"""
 
 import unittest
-from functools import partial
 from unittest.mock import MagicMock, patch
 
 import sympy
 
+from idr_iisim.models.model import (  # type:ignore # pylint: disable=import-error
+    CompiledFunction,
+    compile_operation,
+)
 from idr_iisim.models.process import (  # type:ignore # pylint: disable=import-error
     Process,
 )
+from idr_iisim.utils.intervals import (  # type:ignore # pylint: disable=import-error
+    Interval,
+)
 from idr_iisim.utils.models_dict import (  # type:ignore # pylint: disable=import-error
     Industry,
 )
@@ -21,8 +27,11 @@ from idr_iisim.utils.structs import (  # type:ignore # pylint: disable=import-er
 SCRIPT = '''""" A description """
 from math import inf
 
+import numpy as np
+
 # Constants
 NAME = "The Industry"
+VERSION = "1.0"
 # Meta Constants
 # P1 Constants
 
@@ -31,6 +40,65 @@ UNITS = {
     "unit_key": "unit_val"
 }
 
+# guaranteed bounds (min, max) of the values
+BOUNDS = {
+    "unit_key": (0.0, 100.0)
+}
+
+
+def _any(condition) -> bool:
+    """ whether a condition holds for a value or for any value of an array """
+    return bool(condition.any()) if hasattr(condition, "any") else bool(condition)
+
+
+def evaluate(final_output) -> dict:
+    """ evaluate the industry_meta industry without creating an instance
+
+    The arguments can be floats or arrays of the same shape (e.g. NumPy
+    arrays), to evaluate many scenarios in one pass. The constants can be
+    replaced by keyword, also with arrays (e.g. a value per year).
+    """
+    if _any(final_output < 0) or _any(final_output > 100):
+        raise ValueError(
+            "The production should be a value between 0 and 100"
+        )
+    final_output = final_output
+    return {
+        "unit_key": unit_key,
+    }
+
+
+# profile calls the function itself, not the instrumented evaluate
+_evaluate = evaluate
+
+
+def profile(final_output, dtype="float64", axis=-1, **constants) -> dict:
+    """ evaluate the industry_meta industry over time series
+
+    The arguments can be 1-D (e.g. 8760 hours or years) or 2-D (e.g. years
+    by hours) arrays, and every value is computed over the whole arrays at
+    once. With dtype="float32", the memory of the series is halved.
+
+    Returns the series of every value, with the same shape as the
+    arguments, and their totals and peaks along the time axis. The
+    constants can be replaced by keyword, as in evaluate.
+    """
+    args = [np.asarray(arg, dtype=dtype) for arg in (final_output,)]
+    shape = np.broadcast_shapes(*(arg.shape for arg in args))
+    series = {
+        name: np.broadcast_to(np.asarray(value, dtype=dtype), shape)
+        for name, value in _evaluate(*args, **constants).items()
+    }
+    return {
+        "series": series,
+        "totals": {
+            name: value.sum(axis=axis, dtype=dtype)
+            for name, value in series.items()
+        },
+        "peaks": {name: value.max(axis=axis) for name, value in series.items()},
+    }
+
+
 class industry_meta:
     """ industry_meta industry """
 
@@ -44,7 +112,7 @@ P1_call()
 post_constructor
 
     def __validate_total_production(self, final_output) -> None:
-        if final_output < 0 or final_output > 100:
+        if _any(final_output < 0) or _any(final_output > 100):
             raise ValueError(
                 "The production should be a value between 0 and 100"
             )
@@ -121,7 +189,7 @@ class TestModelProcessAndMeta(unittest.TestCase):
     def test_process_init_and_config(
         self, _, mock_json_to_model_struct
     ) -> None:
-        """Check Process initialization and the use of functools.partiall in process_config"""
+        """Check Process initialization and the compiled functions in process_config"""
 
         # 1. Configurar los mocks para devolver los objetos necesarios
         mock_config = ModelStruct(
@@ -154,15 +222,25 @@ class TestModelProcessAndMeta(unittest.TestCase):
             self.minimal_yaml_data
         )
 
-        # Check if the partial function was created
+        # Check if the compiled function was created
         self.assertIn("out1", process.functions_map)
         func_map = process.functions_map["out1"]
-        self.assertIsInstance(func_map["function"], partial)
-        # Check it has the SymPy object in its kwargs
+        self.assertIsInstance(func_map["function"], CompiledFunction)
+        # Check it has the SymPy object as its expression
         self.assertIsInstance(
-            func_map["function"].keywords["op"], sympy.core.expr.Expr
+            func_map["function"].expression, sympy.core.expr.Expr
         )
-        self.assertEqual(str(func_map["function"].keywords["op"]), "a + b")
+        self.assertEqual(str(func_map["function"].expression), "a + b")
+        # Check it evaluates with floats, ignoring extra values
+        self.assertEqual(func_map["function"](a=1.5, b=2.0, c=3.0), 3.5)
+
+    def test_compiled_function_missing_values(self, _, __) -> None:
+        """Check that a compiled function fails if a value is missing"""
+        function = compile_operation("a * b")
+        self.assertIs(function, compile_operation("a * b"))
+        self.assertEqual(function.arguments, ("a", "b"))
+        with self.assertRaises(TypeError):
+            function(a=1.0)
 
     def test_process_operations_generator(
         self, mock_parse_expr, mock_json_to_model_struct
@@ -256,6 +334,7 @@ class TestIndustry(unittest.TestCase):
         mock_meta_config.short_name = "industry_meta"
         mock_meta_config.name = "The Industry"
         mock_meta_config.description = "A description"
+        mock_meta_config.version = "1.0"
         mock_meta_config.outcome.name = "final_output"
         mock_meta_config.outcome.range = [0, 100]
 
@@ -288,6 +367,12 @@ class TestIndustry(unittest.TestCase):
         with patch(
             "idr_iisim.utils.models_dict.Industry.generate_execution_queue",
             return_value=["P1"],
+        ), patch(
+            "idr_iisim.utils.models_dict.Industry.compute_bounds",
+            return_value={"unit_key": Interval(0, 100)},
+        ), patch(
+            "idr_iisim.utils.models_dict.Industry.evaluation_sequence",
+            return_value=[("final_output", compile_operation("final_output"))],
         ):
             script = industry.script_generator()
 
@@ -296,7 +381,7 @@ class TestIndustry(unittest.TestCase):
         mock_process.process_methods_generator.assert_called_once()
         mock_process.constants_generator.assert_called_once()
         mock_meta.constructor_pre_generator.assert_called_once_with(
-            mock_process.config.id
+            mock_process.config.id, set()
         )
         mock_process.process_call_method_generator.assert_called_once()
         mock_meta.constructor_post_generator.assert_called_once()
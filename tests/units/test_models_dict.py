@@ -6,6 +6,7 @@ from unittest.mock import MagicMock
 from idr_iisim.models.meta import Meta
 from idr_iisim.models.process import Process
 from idr_iisim.utils.models_dict import Industry
+from main import load_industry  # pylint: disable=import-error
 
 
 class TestIndustry(unittest.TestCase):
@@ -26,6 +27,7 @@ class TestIndustry(unittest.TestCase):
         meta_mock.demands = (
             {}
         )  # Or mock it according to your test requirements
+        meta_mock.meta_demands = {}
 
         # Pass the 'meta_mock' to the industry constructor
         self.industry = Industry(meta=meta_mock)
@@ -182,5 +184,55 @@ class TestIndustry(unittest.TestCase):
             self.industry.check_types()
 
 
+class TestUnusedItems(unittest.TestCase):
+    """class for testing the elimination of unused items"""
+
+    def setUp(self):
+        """Setup that runs before each test."""
+        self.industry = load_industry("Cement", "Sources/Cement")
+
+    def test_find_unused_items(self):
+        """Test that the outputs never read are found."""
+        self.assertEqual(
+            self.industry.find_unused_items(),
+            {"Cemento-process3-Milling": ["cement_production"]},
+        )
+
+    def test_script_generator_optimize(self):
+        """Test that the unused items are only left out when optimizing."""
+        line = "self.__cement_production ="
+        self.assertIn(line, self.industry.script_generator())
+        script = self.industry.script_generator(optimize=True)
+        self.assertNotIn(line, script)
+        self.assertIn("self.__cement_emission =", script)
+
+    def test_script_generator_instrument(self):
+        """Test that the instrumented class counts the calls of its methods."""
+        self.assertNotIn("_timed", self.industry.script_generator())
+        namespace = {}
+        # pylint: disable-next=exec-used
+        exec(self.industry.script_generator(instrument=True), namespace)
+        industry_class = namespace["Cement"]
+        for _ in range(3):
+            industry_class(10.0)
+        namespace["evaluate"](10.0)
+        namespace["profile"]([10.0, 20.0])
+        stats = industry_class.stats()
+        self.assertEqual(
+            {name: value["calls"] for name, value in stats.items()},
+            {
+                "evaluate": 1,
+                "profile": 1,
+                "__init__": 3,
+                "pre_homogeneization_and_grinding": 3,
+                "oven": 3,
+                "milling": 3,
+            },
+        )
+        self.assertGreater(stats["oven"]["seconds"], 0)
+        industry_class.reset_stats()
+        self.assertEqual(industry_class.stats()["oven"]["calls"], 0)
+
+
 if __name__ == "__main__":
     unittest.main()
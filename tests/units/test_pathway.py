@@ -0,0 +1,117 @@
+"""pathway testing module"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from idr_iisim.utils.pathway import (  # type:ignore # pylint: disable=import-error
+    capacity_stock,
+    simulate_pathways,
+)
+
+MODULE_PATH = "industries/cement.py"
+YEARS = np.arange(2025, 2051)
+
+
+class TestPathway(unittest.TestCase):
+    """Test the multi-year pathway simulation"""
+
+    def test_constant_trajectories(self) -> None:
+        """Check that the constants change every year"""
+        production = np.linspace(100, 150, len(YEARS))
+        co2 = np.linspace(0.51, 0.1, len(YEARS))
+        result = simulate_pathways(
+            MODULE_PATH,
+            YEARS,
+            production,
+            constants={"CO2_EMISSIONS_PROPORTION": co2},
+        )
+
+        self.assertEqual(
+            result.values.shape, (1, len(YEARS), len(result.names))
+        )
+        self.assertTrue(
+            np.allclose(
+                result.value("co2_overall_emissions")[0], production * co2
+            )
+        )
+        self.assertTrue(
+            np.allclose(result.value("clay_demand")[0], production * 0.375)
+        )
+
+    def test_parallel_pathways(self) -> None:
+        """Check that the pathways are the same with a process pool"""
+        rng = np.random.default_rng(0)
+        production = rng.uniform(50, 150, (40, len(YEARS)))
+        co2 = rng.uniform(0.1, 0.5, (40, len(YEARS)))
+        args = (MODULE_PATH, YEARS, production)
+        kwargs = {
+            "constants": {"CO2_EMISSIONS_PROPORTION": co2},
+            "initial_capacity": 10,
+            "retirement_rate": 0.05,
+        }
+
+        serial = simulate_pathways(*args, **kwargs)
+        parallel = simulate_pathways(*args, **kwargs, max_workers=3)
+        self.assertEqual(serial.values.shape, (40, len(YEARS), 10))
+        self.assertTrue(np.array_equal(serial.values, parallel.values))
+        self.assertTrue(np.array_equal(serial.capacity, parallel.capacity))
+
+    def test_rebuilt_module(self) -> None:
+        """Check that a rebuilt module is loaded again"""
+        production = np.full(len(YEARS), 100.0)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "cement.py")
+            shutil.copy(MODULE_PATH, path)
+            result = simulate_pathways(path, YEARS, production)
+            self.assertTrue(
+                np.allclose(result.value("co2_overall_emissions"), 51)
+            )
+
+            with open(path, "r", encoding="utf-8") as f:
+                script = f.read()
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(
+                    script.replace(
+                        "CO2_EMISSIONS_PROPORTION = 0.51",
+                        "CO2_EMISSIONS_PROPORTION = 0.25",
+                    )
+                )
+            mtime = os.path.getmtime(path) + 10
+            os.utime(path, (mtime, mtime))
+            result = simulate_pathways(path, YEARS, production)
+            self.assertTrue(
+                np.allclose(result.value("co2_overall_emissions"), 25)
+            )
+
+    def test_capacity_stock(self) -> None:
+        """Check that the capacity carries from one year to the next"""
+        production = np.array([[10.0, 12.0, 8.0, 8.0]])
+        capacity, additions = capacity_stock(production, 10, 0.1)
+
+        self.assertTrue(np.allclose(capacity, [[10, 12, 10.8, 9.72]]))
+        self.assertTrue(np.allclose(additions, [[1, 3, 0, 0]]))
+
+    def test_wrong_trajectories(self) -> None:
+        """Check that the trajectories are validated"""
+        production = np.ones(len(YEARS))
+        with self.assertRaises(ValueError):
+            simulate_pathways(
+                MODULE_PATH, YEARS, production, constants={"UNKNOWN": 1}
+            )
+        with self.assertRaises(ValueError):
+            simulate_pathways(
+                MODULE_PATH,
+                YEARS,
+                production,
+                constants={"CO2_EMISSIONS_PROPORTION": np.ones(3)},
+            )
+        with self.assertRaises(ValueError):
+            simulate_pathways(MODULE_PATH, YEARS, np.ones(3))
+
+
+if __name__ == "__main__":
+    unittest.main()
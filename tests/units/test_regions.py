@@ -0,0 +1,114 @@
+"""regions testing module"""
+
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from idr_iisim.utils.regions import (  # type:ignore # pylint: disable=import-error
+    ConstantsTable,
+    evaluate_regions,
+)
+from idr_iisim.utils.verification import (  # type:ignore # pylint: disable=import-error
+    load_module,
+)
+
+MODULE_PATH = "industries/cement.py"
+CSV = """region,CO2_EMISSIONS_PROPORTION,CLAY_PROPORTION
+ES300,0.4,0.5
+PT170,,0.25
+FR101,0.6,
+"""
+
+
+class TestRegions(unittest.TestCase):
+    """Test the constants by region"""
+
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()  # pylint: disable=R1732
+        self.module = load_module(MODULE_PATH, "_regions_cement")
+        path = os.path.join(self.tmp_dir.name, "constants.csv")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(CSV)
+        self.table = ConstantsTable.load(path)
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def test_from_csv(self) -> None:
+        """Check the regions and the missing values"""
+        self.assertEqual(self.table.regions, ["ES300", "PT170", "FR101"])
+        co2 = self.table.columns["CO2_EMISSIONS_PROPORTION"]
+        self.assertEqual(co2[0], 0.4)
+        self.assertTrue(np.isnan(co2[1]))
+
+    def test_from_csv_errors(self) -> None:
+        """Check the byte-order mark and the invalid cells"""
+        path = os.path.join(self.tmp_dir.name, "exported.csv")
+        with open(path, "w", encoding="utf-8-sig") as f:
+            f.write(CSV)
+        self.assertEqual(ConstantsTable.load(path).regions, self.table.regions)
+        for content in [
+            "region,CLAY_PROPORTION\nES300, \n",
+            "region,CLAY_PROPORTION\nES300,high\n",
+            "region,CLAY_PROPORTION\n ,0.5\n",
+        ]:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(content)
+            with self.assertRaisesRegex(ValueError, "line 2"):
+                ConstantsTable.load(path)
+
+    def test_from_npz(self) -> None:
+        """Check that NPZ files have the same table"""
+        path = os.path.join(self.tmp_dir.name, "constants.npz")
+        np.savez(
+            path, region=np.array(self.table.regions), **self.table.columns
+        )
+        table = ConstantsTable.load(path)
+        self.assertEqual(table.regions, self.table.regions)
+        for name, column in self.table.columns.items():
+            self.assertTrue(
+                np.array_equal(table.columns[name], column, equal_nan=True)
+            )
+
+    def test_evaluate_regions(self) -> None:
+        """Check the constants of each region and the defaults"""
+        values = evaluate_regions(self.module, self.table, [10, 20, 30])
+        co2 = [0.4, self.module.CO2_EMISSIONS_PROPORTION, 0.6]
+        clay = [0.5, 0.25, self.module.CLAY_PROPORTION]
+        self.assertTrue(
+            np.allclose(
+                values["co2_overall_emissions"], np.array([10, 20, 30]) * co2
+            )
+        )
+        self.assertTrue(
+            np.allclose(values["clay_demand"], np.array([10, 20, 30]) * clay)
+        )
+
+    def test_evaluate_regions_by_year(self) -> None:
+        """Check that the constants are broadcast along the years"""
+        outcomes = np.arange(8).reshape(2, 4)
+        values = evaluate_regions(
+            self.module, self.table, outcomes, ["FR101", "ES300"]
+        )
+        self.assertTrue(
+            np.allclose(
+                values["co2_overall_emissions"],
+                outcomes * np.array([[0.6], [0.4]]),
+            )
+        )
+
+    def test_errors(self) -> None:
+        """Check the unknown regions, constants and shapes"""
+        with self.assertRaises(ValueError):
+            evaluate_regions(self.module, self.table, [1], ["XX000"])
+        with self.assertRaises(ValueError):
+            evaluate_regions(self.module, self.table, [1, 2])
+        table = ConstantsTable(["ES300"], {"UNKNOWN": np.array([1.0])})
+        with self.assertRaises(ValueError):
+            evaluate_regions(self.module, table, [1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+"""result buffer testing module"""
+
+import pickle
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+from idr_iisim.utils.results import (  # type:ignore # pylint: disable=import-error
+    ResultBuffer,
+)
+from idr_iisim.utils.verification import (  # type:ignore # pylint: disable=import-error
+    load_module,
+)
+
+MODULE_PATH = "industries/cement.py"
+
+
+def _attached_total(name: str) -> float:
+    """Sum a column of the results in a shared memory block"""
+    memory = SharedMemory(name=name)
+    result = ResultBuffer.attach(memory.buf)
+    total = float(result.column("clay_demand").sum())
+    result.release()
+    memory.close()
+    return total
+
+
+class TestResults(unittest.TestCase):
+    """Test the result buffers"""
+
+    def setUp(self) -> None:
+        self.cement = load_module(MODULE_PATH, "cement")
+        self.outcomes = np.linspace(10, 100, 12).reshape(3, 4)
+        self.values = self.cement.evaluate(self.outcomes)
+
+    def test_columns(self) -> None:
+        """Check that there is a column per entry in UNITS"""
+        result = ResultBuffer.from_module(self.cement, self.values)
+
+        self.assertEqual(result.header.names, list(self.cement.UNITS))
+        self.assertEqual(result.header.units, list(self.cement.UNITS.values()))
+        self.assertEqual(result.header.version, self.cement.VERSION)
+        self.assertEqual(result.header.shape, [3, 4])
+        for name, value in self.values.items():
+            self.assertTrue(np.array_equal(result.column(name), value))
+        self.assertTrue(result.data[0].flags.c_contiguous)
+
+    def test_attach_without_copy(self) -> None:
+        """Check that the attached results share the buffer"""
+        result = ResultBuffer.from_module(self.cement, self.values)
+        attached = ResultBuffer.attach(memoryview(result.buffer))
+
+        self.assertEqual(attached.header, result.header)
+        self.assertTrue(np.shares_memory(attached.data, result.data))
+        self.assertTrue(
+            np.array_equal(
+                attached.column("fuel_demand"), self.values["fuel_demand"]
+            )
+        )
+        # the whole buffer is smaller than the pickled values
+        self.assertLess(
+            len(result.buffer), len(pickle.dumps(self.values)) + 512
+        )
+
+    def test_shared_memory(self) -> None:
+        """Check that another process reads the results in shared memory"""
+        result = ResultBuffer.from_module(self.cement, self.values)
+        memory = result.to_shared_memory()
+        try:
+            with ProcessPoolExecutor(max_workers=1) as executor:
+                total = executor.submit(_attached_total, memory.name).result()
+        finally:
+            memory.close()
+            memory.unlink()
+        self.assertAlmostEqual(total, self.values["clay_demand"].sum())
+
+    def test_not_results(self) -> None:
+        """Check that a buffer without header is rejected"""
+        with self.assertRaises(ValueError):
+            ResultBuffer.attach(bytearray(64))
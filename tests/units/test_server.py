@@ -0,0 +1,165 @@
+"""evaluation service testing module"""
+
+import json
+import os
+import shutil
+import socket
+import tempfile
+import threading
+import unittest
+import urllib.error
+import urllib.request
+from http.client import HTTPConnection
+from unittest.mock import patch
+
+import numpy as np
+
+from idr_iisim.utils.results import (  # type:ignore # pylint: disable=import-error
+    ResultBuffer,
+)
+from idr_iisim.utils.server import (  # type:ignore # pylint: disable=import-error
+    BINARY_TYPE,
+    EvaluationService,
+    make_server,
+)
+
+MODULE_PATH = "industries/cement.py"
+
+
+class _UnixConnection(HTTPConnection):
+    """HTTP connection over a Unix socket"""
+
+    def __init__(self, path: str):
+        super().__init__("localhost")
+        self.socket_path = path
+
+    def connect(self) -> None:
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(self.socket_path)
+
+
+class TestServer(unittest.TestCase):
+    """Test the evaluation service"""
+
+    def setUp(self) -> None:
+        self.directory = tempfile.mkdtemp()
+        self.source = os.path.join(self.directory, "Cement")
+        os.mkdir(self.source)
+        self.yaml = os.path.join(self.source, "meta.yaml")
+        with open(self.yaml, "w", encoding="utf-8") as f:
+            f.write("version: 1.0.0\n")
+        self.module = os.path.join(self.directory, "cement.py")
+        shutil.copy(MODULE_PATH, self.module)
+        self.builds: list[str] = []
+        self.service = EvaluationService(self._build)
+        self.service.add_industry("Cement", self.source, self.module)
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.directory)
+
+    def _build(self, names: set[str]) -> dict[str, str]:
+        """Generate a new version of the module"""
+        self.builds.extend(sorted(names))
+        with open(self.yaml, "r", encoding="utf-8") as f:
+            version = f.read().split(":")[1].strip()
+        with open(MODULE_PATH, "r", encoding="utf-8") as f:
+            script = f.read()
+        with open(self.module, "w", encoding="utf-8") as f:
+            f.write(
+                script.replace('VERSION = "1.0.0"', f'VERSION = "{version}"')
+            )
+        return {"Cement": self.module}
+
+    def _serve(self, address: str) -> str:
+        """Start a server in a thread"""
+        server = make_server(self.service, address)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        if isinstance(server.server_address, tuple):
+            return f"http://127.0.0.1:{server.server_address[1]}"
+        return address
+
+    def test_json_evaluation(self) -> None:
+        """Check the evaluations in JSON and the counters"""
+        url = self._serve("127.0.0.1:0")
+        request = urllib.request.Request(
+            f"{url}/evaluate/Cement",
+            json.dumps(
+                {
+                    "total_cement_production": [10, 20],
+                    "CO2_EMISSIONS_PROPORTION": 0.25,
+                }
+            ).encode(),
+            {"Content-Type": "application/json"},
+        )
+        with urllib.request.urlopen(request) as response:
+            values = json.load(response)
+        self.assertEqual(values["co2_overall_emissions"], [2.5, 5.0])
+
+        with self.assertRaises(urllib.error.HTTPError) as error:
+            urllib.request.urlopen(f"{url}/evaluate/Steel", b"{}")
+        self.assertEqual(error.exception.code, 404)
+        with urllib.request.urlopen(f"{url}/industries") as response:
+            industries = json.load(response)
+        self.assertEqual(industries["Cement"]["version"], "1.0.0")
+        with urllib.request.urlopen(f"{url}/stats") as response:
+            stats = json.load(response)
+        self.assertEqual(stats["requests"], 2)
+        self.assertEqual(stats["errors"], 1)
+        self.assertEqual(stats["scenarios"], 2)
+
+    def test_evaluation_error(self) -> None:
+        """Check that a failing module is answered with an error"""
+        url = self._serve("127.0.0.1:0")
+        with patch.object(
+            self.service, "evaluate", side_effect=ZeroDivisionError("zero")
+        ), self.assertRaises(urllib.error.HTTPError) as error:
+            urllib.request.urlopen(f"{url}/evaluate/Cement", b"{}")
+        self.assertEqual(error.exception.code, 500)
+        self.assertEqual(
+            json.load(error.exception)["error"], "ZeroDivisionError: zero"
+        )
+        self.assertEqual(self.service.stats.snapshot()["errors"], 1)
+
+    def test_binary_evaluation(self) -> None:
+        """Check the evaluations in binary form over a Unix socket"""
+        path = self._serve(os.path.join(self.directory, "service.sock"))
+        outcomes = np.linspace(10, 100, 7)
+        connection = _UnixConnection(path)
+        connection.request(
+            "POST",
+            "/evaluate/Cement",
+            outcomes.astype("<f8").tobytes(),
+            {"Content-Type": BINARY_TYPE},
+        )
+        response = connection.getresponse()
+        self.assertEqual(response.status, 200)
+        result = ResultBuffer.attach(bytearray(response.read()))
+        connection.close()
+        self.assertEqual(result.header.version, "1.0.0")
+        self.assertTrue(
+            np.allclose(result.column("clay_demand"), outcomes * 0.375)
+        )
+
+    def test_socket_path(self) -> None:
+        """Check that only a stale socket is replaced"""
+        path = self._serve(os.path.join(self.directory, "service.sock"))
+        self.assertEqual(self._serve(path), path)
+        with self.assertRaises(ValueError):
+            make_server(self.service, self.yaml)
+        self.assertTrue(os.path.isfile(self.yaml))
+
+    def test_hot_reload(self) -> None:
+        """Check that the changed industries are built again"""
+        self.assertEqual(self.service.reload_changed(), [])
+        previous = self.service.industry("Cement")
+        with open(self.yaml, "w", encoding="utf-8") as f:
+            f.write("version: 1.1.0\n")
+        os.utime(self.yaml, (0, os.path.getmtime(self.module) + 10))
+
+        self.assertEqual(self.service.reload_changed(), ["Cement"])
+        self.assertEqual(self.builds, ["Cement"])
+        self.assertEqual(self.service.industry("Cement").VERSION, "1.1.0")
+        self.assertEqual(previous.VERSION, "1.0.0")
+        self.assertEqual(self.service.stats.snapshot()["reloads"], 1)
@@ -0,0 +1,104 @@
+"""surrogate testing module"""
+
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+
+from idr_iisim.models.model import (  # type:ignore # pylint: disable=import-error
+    compile_operation,
+)
+from idr_iisim.utils.interpreter import (  # type:ignore # pylint: disable=import-error
+    evaluate_industry,
+)
+from idr_iisim.utils.surrogate import (  # type:ignore # pylint: disable=import-error
+    build_surrogate,
+)
+from main import (  # type:ignore # pylint: disable=import-error
+    load_industry,
+)
+
+RANGE = (1.0, 200.0)
+TOLERANCE = 0.001
+
+
+class TestSurrogate(unittest.TestCase):
+    """Test the piecewise-linear surrogates"""
+
+    def setUp(self) -> None:
+        self.industry = load_industry("Cement", "Sources/Cement")
+        outcome = self.industry.meta.config.outcome.name
+        # Make the limestone demand nonlinear
+        self.sequence = self.industry.evaluation_sequence()
+        self.sequence[0] = (
+            self.sequence[0][0],
+            compile_operation(
+                f"{outcome} ** 2 / 100 + exp({outcome} / 100)"
+            ),
+        )
+
+    def build(self, uniform: bool):  # type: ignore
+        """Build the surrogate of the nonlinear industry"""
+        with patch(
+            "idr_iisim.utils.models_dict.Industry.evaluation_sequence",
+            return_value=self.sequence,
+        ):
+            surrogate = build_surrogate(
+                self.industry, TOLERANCE, uniform, RANGE
+            )
+            expected = evaluate_industry(
+                self.industry, np.linspace(*RANGE, 1000)
+            )
+        return surrogate, expected
+
+    def test_linear_values(self) -> None:
+        """Check that linear values only need their end points"""
+        surrogate = build_surrogate(self.industry, TOLERANCE, False, RANGE)
+        for value in surrogate.values:
+            with self.subTest(item=value.name):
+                self.assertEqual(list(value.breakpoints), list(RANGE))
+                self.assertLess(value.max_error, 1e-9)
+
+    def test_script_generator(self) -> None:
+        """Check the accuracy of the generated modules"""
+        for uniform in [False, True]:
+            surrogate, expected = self.build(uniform)
+            namespace: dict = {}
+            exec(  # pylint: disable=exec-used
+                surrogate.script_generator(), namespace
+            )
+            results = namespace["evaluate"](np.linspace(*RANGE, 1000))
+            for value in surrogate.values:
+                with self.subTest(uniform=uniform, item=value.name):
+                    self.assertLessEqual(value.max_error, TOLERANCE)
+                    error = np.abs(results[value.name] - expected[value.name])
+                    self.assertLessEqual(error.max(), TOLERANCE)
+
+            self.assertEqual(namespace["RANGE"], RANGE)
+            with self.assertRaises(ValueError):
+                namespace["evaluate"](RANGE[1] + 1)
+
+    def test_uniform_breakpoints(self) -> None:
+        """Check that lookup tables have equally spaced breakpoints"""
+        surrogate, _ = self.build(uniform=True)
+        limestone = surrogate.values[0]
+        self.assertGreater(len(limestone.breakpoints), 2)
+        steps = np.diff(limestone.breakpoints)
+        self.assertTrue(np.allclose(steps, steps[0]))
+
+    def test_report(self) -> None:
+        """Check the rows of the accuracy report"""
+        surrogate, _ = self.build(uniform=False)
+        report = surrogate.report()
+        for value in surrogate.values:
+            self.assertIn(value.name, report)
+        self.assertNotIn("> tolerance", report)
+
+    def test_no_range(self) -> None:
+        """Check that the outcome needs a minimum and a maximum"""
+        with self.assertRaises(ValueError):
+            build_surrogate(self.industry, TOLERANCE)
+
+
+if __name__ == "__main__":
+    unittest.main()
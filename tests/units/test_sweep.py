@@ -0,0 +1,81 @@
+"""sweep testing module"""
+
+import unittest
+from unittest.mock import MagicMock
+
+import numpy as np
+
+from idr_iisim.utils.sweep import (  # type:ignore # pylint: disable=import-error
+    _run_unit,
+    sweep,
+)
+from idr_iisim.utils.verification import (  # type:ignore # pylint: disable=import-error
+    load_generated_module,
+)
+
+MODULE_PATH = "industries/cement.py"
+
+
+class TestSweep(unittest.TestCase):
+    """Test the sweeps over grids of scenarios"""
+
+    def setUp(self) -> None:
+        rng = np.random.default_rng(0)
+        self.outcomes = rng.uniform(50, 150, (23, 4, 5))
+        self.co2 = rng.uniform(0.1, 0.5, 23)
+
+    def test_serial_sweep(self) -> None:
+        """Check the values of a sweep against the generated module"""
+        result = sweep(
+            MODULE_PATH,
+            self.outcomes,
+            {"CO2_EMISSIONS_PROPORTION": self.co2},
+            max_workers=1,
+        )
+
+        expected = load_generated_module(MODULE_PATH).evaluate(
+            self.outcomes,
+            CO2_EMISSIONS_PROPORTION=self.co2.reshape(-1, 1, 1),
+        )
+        self.assertEqual(result.names, list(expected))
+        self.assertEqual(result.values.shape, (23, 4, 5, len(expected)))
+        for name, value in expected.items():
+            self.assertTrue(np.allclose(result.value(name), value))
+        self.assertEqual(result.report.evaluations, 23 * 4 * 5)
+        self.assertEqual(result.report.units, 4)
+
+    def test_parallel_sweep(self) -> None:
+        """Check that a process pool writes the same values"""
+        serial = sweep(MODULE_PATH, self.outcomes, max_workers=1)
+        parallel = sweep(MODULE_PATH, self.outcomes, max_workers=3)
+
+        self.assertTrue(np.array_equal(serial.values, parallel.values))
+        self.assertEqual(parallel.report.units, 12)
+        self.assertEqual(sum(parallel.report.units_by_worker.values()), 12)
+        self.assertGreater(parallel.report.throughput, 0)
+
+    def test_unit_cleanup(self) -> None:
+        """Check that the memory blocks are closed when a unit fails"""
+        outcomes, results = MagicMock(), MagicMock()
+        outcomes_memory, results_memory = MagicMock(), MagicMock()
+        outcomes.attach.return_value = (outcomes_memory, self.outcomes)
+        results.attach.side_effect = FileNotFoundError("results")
+        with self.assertRaises(FileNotFoundError):
+            _run_unit(MODULE_PATH, outcomes, results, (0, 6), {})
+        outcomes_memory.close.assert_called_once()
+
+        results.attach.side_effect = None
+        results.attach.return_value = (results_memory, np.zeros((23, 1)))
+        with self.assertRaises(ValueError):
+            _run_unit(MODULE_PATH, outcomes, results, (0, 6), {})
+        self.assertEqual(outcomes_memory.close.call_count, 2)
+        results_memory.close.assert_called_once()
+
+    def test_wrong_constants(self) -> None:
+        """Check that the constants need a value per region"""
+        with self.assertRaises(ValueError):
+            sweep(
+                MODULE_PATH,
+                self.outcomes,
+                {"CO2_EMISSIONS_PROPORTION": np.ones((23, 4))},
+            )
@@ -0,0 +1,95 @@
+"""synthetic industries testing module"""
+
+import os
+import tempfile
+import unittest
+
+from idr_iisim.utils.synthetic import (  # type:ignore # pylint: disable=import-error
+    SyntheticSpec,
+    synthetic_industry,
+    write_synthetic_industry,
+)
+from main import load_industry  # pylint: disable=import-error
+
+
+def longest_chain(documents: dict[str, dict[str, object]]) -> int:
+    """Get the number of processes of the longest chain of an industry"""
+    upstream = {
+        document["id"]: [
+            item["from"]
+            for item in document["inputs"]  # type: ignore
+            if item["from"] is not None
+        ]
+        for name, document in documents.items()
+        if name != "meta.yaml"
+    }
+    lengths: dict[object, int] = {}
+
+    def length(process: object) -> int:
+        if process not in lengths:
+            lengths[process] = 1 + max(
+                (length(source) for source in upstream[process]), default=0
+            )
+        return lengths[process]
+
+    return max(length(process) for process in upstream)
+
+
+class TestSynthetic(unittest.TestCase):
+    """Test the generation of synthetic industries"""
+
+    def test_valid_industry(self) -> None:
+        """The industry passes the validation and the type checks"""
+        spec = SyntheticSpec(
+            processes=40, depth=8, fan_in=3, fan_out=2, complexity=4
+        )
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "Big")
+            write_synthetic_industry(path, "Big", spec)
+            self.assertEqual(len(os.listdir(path)), 41)
+            industry = load_industry("Big", path)
+        self.assertEqual(len(industry.models), 40)
+        namespace: dict[str, object] = {}
+        # pylint: disable-next=exec-used
+        exec(industry.script_generator(), namespace)
+        results = namespace["evaluate"](10.0)  # type: ignore
+        self.assertGreater(results["final_output"], 0)
+
+    def test_shape(self) -> None:
+        """The industry has the depth, fan-in and constants of its spec"""
+        spec = SyntheticSpec(
+            processes=60, depth=6, fan_in=3, fan_out=2, constants=4
+        )
+        documents = synthetic_industry("Shape", spec)
+        self.assertEqual(longest_chain(documents), 6)
+        for name, document in documents.items():
+            if name == "meta.yaml":
+                continue
+            self.assertLessEqual(len(document["inputs"]), 3)
+            self.assertEqual(len(document["constants"]), 4)
+
+    def test_reproducible(self) -> None:
+        """The same seed gives the same industry"""
+        spec = SyntheticSpec(processes=30, depth=5, fan_in=3, complexity=3)
+        self.assertEqual(
+            synthetic_industry("A", spec), synthetic_industry("A", spec)
+        )
+        spec.seed = 1
+        other = synthetic_industry("A", spec)
+        spec.seed = 0
+        self.assertNotEqual(other, synthetic_industry("A", spec))
+
+    def test_invalid_spec(self) -> None:
+        """The shapes that cannot be built are rejected"""
+        for spec in [
+            SyntheticSpec(processes=0),
+            SyntheticSpec(processes=3, depth=4),
+            SyntheticSpec(fan_in=0),
+            SyntheticSpec(constants=0),
+        ]:
+            with self.assertRaises(ValueError):
+                synthetic_industry("Bad", spec)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,10 +1,12 @@
 """templates testing module"""
 
+import os
+import tempfile
 import unittest
 from string import Template
 from unittest.mock import mock_open, patch
 
-from idr_iisim.templates import load_template
+from idr_iisim.templates import get_template, load_template
 
 
 class TestLoadTemplate(unittest.TestCase):
@@ -36,6 +38,22 @@ class TestLoadTemplate(unittest.TestCase):
         with self.assertRaises(Exception):
             load_template(template_path)
 
+    def test_get_template_registry(self) -> None:
+        """Test that the templates are read again only when they change."""
+        with tempfile.TemporaryDirectory() as directory:
+            template_path = os.path.join(directory, "template.txt")
+            with open(template_path, "w", encoding="utf-8") as f:
+                f.write("Test ${name}")
+            template = get_template(template_path)
+            self.assertIs(get_template(template_path), template)
+
+            with open(template_path, "w", encoding="utf-8") as f:
+                f.write("New ${name}")
+            os.utime(template_path, ns=(0, 10**9))
+            self.assertEqual(
+                get_template(template_path).substitute(name="x"), "New x"
+            )
+
 
 if __name__ == "__main__":
     unittest.main()
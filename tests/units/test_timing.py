@@ -0,0 +1,141 @@
+"""compiler timing testing module"""
+
+import json
+import os
+import pstats
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from glob import glob
+
+from idr_iisim.utils.documents import (  # type:ignore # pylint: disable=import-error
+    load_documents,
+)
+from idr_iisim.utils.timing import (  # type:ignore # pylint: disable=import-error
+    PhaseTimer,
+    phase,
+    profiled,
+    timed,
+    timed_phase,
+)
+
+
+@timed_phase("allocate")
+def allocate(size: int) -> int:
+    """Allocate some memory and release it"""
+    return len(bytearray(size))
+
+
+class TestTiming(unittest.TestCase):
+    """Test the timing of the phases"""
+
+    def test_untimed(self) -> None:
+        """The phases are not measured without an active timer"""
+        timer = PhaseTimer()
+        with phase("untimed"):
+            self.assertEqual(allocate(10), 10)
+        with timed(timer):
+            pass
+        with phase("untimed"):
+            allocate(10)
+        self.assertEqual(timer.records, [])
+
+    def test_nested_phases(self) -> None:
+        """The measures of a phase include the nested phases"""
+        timer = PhaseTimer()
+        with timed(timer):
+            with phase("outer", "a.yaml"):
+                allocate(4 * 2**20)
+                with phase("inner"):
+                    allocate(2**20)
+        self.assertEqual(
+            [(r.phase, r.file) for r in timer.records],
+            [
+                ("allocate", None),
+                ("allocate", None),
+                ("inner", None),
+                ("outer", "a.yaml"),
+            ],
+        )
+        allocated, _, inner, outer = timer.records
+        assert allocated.peak_memory is not None
+        assert inner.peak_memory is not None
+        assert outer.peak_memory is not None
+        self.assertGreaterEqual(allocated.peak_memory, 4 * 2**20)
+        self.assertGreaterEqual(outer.peak_memory, allocated.peak_memory)
+        self.assertLess(inner.peak_memory, 4 * 2**20)
+        self.assertGreaterEqual(outer.wall, inner.wall)
+
+    def test_threads(self) -> None:
+        """The phases run in other threads are measured without memory"""
+        timer = PhaseTimer()
+
+        def work(index: int) -> None:
+            with phase("work", str(index)):
+                allocate(2**20)
+
+        with timed(timer):
+            with phase("outer"):
+                with ThreadPoolExecutor(4) as executor:
+                    list(executor.map(work, range(8)))
+        works = [r for r in timer.records if r.phase == "work"]
+        self.assertEqual(
+            sorted(r.file for r in works), [str(i) for i in range(8)]
+        )
+        self.assertTrue(all(r.peak_memory is None for r in works))
+        self.assertIsNotNone(timer.records[-1].peak_memory)
+        self.assertEqual(timer.totals()["allocate"].calls, 8)
+
+    def test_load_yaml(self) -> None:
+        """Every YAML file is measured in the thread that loads it"""
+        paths = sorted(glob(os.path.join("Sources", "Cement", "*.yaml")))
+        timer = PhaseTimer(trace_memory=False)
+        with timed(timer):
+            load_documents(paths)
+        self.assertEqual(
+            sorted(r.file for r in timer.records if r.phase == "load_yaml"),
+            paths,
+        )
+
+    def test_without_memory(self) -> None:
+        """The memory is not traced if not requested"""
+        timer = PhaseTimer(trace_memory=False)
+        with timed(timer):
+            allocate(10)
+        self.assertIsNone(timer.records[0].peak_memory)
+        self.assertIn(" -", timer.summary())
+
+    def test_report(self) -> None:
+        """The report has the totals by phase and every measure"""
+        timer = PhaseTimer()
+        with timed(timer):
+            for _ in range(3):
+                allocate(10)
+            with phase("validate", "a.yaml"):
+                pass
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "timing.json")
+            timer.write_report(path)
+            with open(path, encoding="utf-8") as file:
+                report = json.load(file)
+        self.assertEqual(list(report["phases"]), ["allocate", "validate"])
+        self.assertEqual(report["phases"]["allocate"]["calls"], 3)
+        self.assertEqual(len(report["records"]), 4)
+        summary = timer.summary()
+        self.assertIn("Slowest files:", summary)
+        self.assertIn("a.yaml", summary)
+
+    def test_profiled(self) -> None:
+        """The profile of the code is written"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "build.prof")
+            with profiled(path):
+                allocate(10)
+            stats = pstats.Stats(path)
+        self.assertTrue(
+            any(name == "allocate" for _, _, name in stats.stats)  # type: ignore
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
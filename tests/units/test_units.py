@@ -0,0 +1,109 @@
+"""units testing module"""
+
+import os
+import shutil
+import tempfile
+import unittest
+from fractions import Fraction
+
+import yaml
+
+from idr_iisim.utils.interpreter import (  # type:ignore # pylint: disable=import-error
+    evaluate_industry,
+)
+from idr_iisim.utils.units import (  # type:ignore # pylint: disable=import-error
+    conversion_factor,
+    parse_unit,
+)
+from main import (  # type:ignore # pylint: disable=import-error
+    load_industry,
+)
+
+
+class TestUnits(unittest.TestCase):
+    """Test the units registry"""
+
+    def test_conversion_factor(self) -> None:
+        """Check the factors between compatible units"""
+        cases = [
+            ("kt", "kt", 1),
+            ("kt", "t", 1000),
+            ("MJ", "GJ", Fraction(1, 1000)),
+            ("TJ", "GJ", 1000),
+            ("kWh", "MJ", Fraction(18, 5)),
+            ("m3", "L", 1000),
+            ("MJ/kg", "GJ/t", 1),
+            ("kt/p.u.", "t", 1000),
+            ("p.u.", "%", 100),
+        ]
+        for source, target, expected in cases:
+            with self.subTest(source=source, target=target):
+                self.assertEqual(conversion_factor(source, target), expected)
+
+    def test_conversion_factor_errors(self) -> None:
+        """Check that incompatible or unknown units are rejected"""
+        for source, target in [("kg", "m"), ("kt", "GJ"), ("kt", "foo")]:
+            with self.subTest(source=source, target=target):
+                with self.assertRaises(ValueError):
+                    conversion_factor(source, target)
+
+    def test_parse_unit(self) -> None:
+        """Check the dimensions of parsed units"""
+        self.assertEqual(parse_unit("m3").dimensions, (("length", 3),))
+        self.assertEqual(parse_unit("p.u.").dimensions, ())
+        self.assertEqual(parse_unit("MW"), parse_unit("MJ/s"))
+
+
+class TestIndustryUnits(unittest.TestCase):
+    """Test the conversions between the models of an industry"""
+
+    def setUp(self) -> None:
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "Cement")
+        shutil.copytree("Sources/Cement", self.path)
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.directory)
+
+    def _edit_meta(self, demand: str, units: str) -> None:
+        meta_path = os.path.join(self.path, "meta.yaml")
+        with open(meta_path, encoding="utf-8") as file:
+            data = yaml.safe_load(file)
+        for item in data["demands"]:
+            if item["name"] == demand:
+                item["units"] = units
+        with open(meta_path, "w", encoding="utf-8") as file:
+            yaml.safe_dump(data, file)
+
+    def test_compatible_units(self) -> None:
+        """Check that conversions are folded into the operations"""
+        # The demand is in MJ, but the meta-demand and the process in GJ
+        self._edit_meta("mechanical_energy_pre", "MJ")
+        pre_path = os.path.join(self.path, "pre.yaml")
+        with open(pre_path, encoding="utf-8") as file:
+            data = yaml.safe_load(file)
+        data["inputs"][2]["units"] = "MJ"
+        with open(pre_path, "w", encoding="utf-8") as file:
+            yaml.safe_dump(data, file)
+
+        industry = load_industry("Cement", self.path)
+        values = evaluate_industry(industry, 5)
+        self.assertAlmostEqual(
+            values["mechanical_energy"],
+            5 * (0.11592 / 1000 + 0.069552 + 0.135792),
+        )
+        script = industry.script_generator()
+        self.assertIn("self.__mechanical_energy_pre/1000", script)
+        # checking the types again leaves the operations unchanged
+        industry.check_types()
+        self.assertEqual(industry.script_generator(), script)
+
+    def test_incompatible_units(self) -> None:
+        """Check that incompatible units are rejected"""
+        self._edit_meta("limestone_demand", "m3")
+        with self.assertRaises(ValueError):
+            load_industry("Cement", self.path)
+
+
+if __name__ == "__main__":
+    unittest.main()
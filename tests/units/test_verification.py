@@ -0,0 +1,113 @@
+"""verification testing module"""
+
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from idr_iisim.utils.verification import (  # type:ignore # pylint: disable=import-error
+    TestVector,
+    VerificationError,
+    VerificationJob,
+    collect_test_vectors,
+    verify_industries,
+    verify_module,
+)
+from main import (  # type:ignore # pylint: disable=import-error
+    load_industry,
+    main,
+)
+
+MODULE_PATH = "industries/cement.py"
+
+
+class TestVerification(unittest.TestCase):
+    """Test the verification of the generated industries"""
+
+    def test_collect_test_vectors(self) -> None:
+        """Check that the vectors are collected from the meta"""
+        industry = load_industry("Cement", "Sources/Cement")
+        vectors = collect_test_vectors(industry)
+
+        self.assertEqual([v.outcome for v in vectors], [5, 137])
+        self.assertEqual(vectors[0].expected["limestone_demand"], 5.17)
+        self.assertEqual(vectors[1].expected["limestone_demand"], 141.79)
+        # Meta-demands and outputs are included
+        self.assertIn("mechanical_energy", vectors[0].expected)
+        self.assertIn("pm10_overall_emission", vectors[1].expected)
+
+    def test_verify_module(self) -> None:
+        """Check that a correct module has no mismatches"""
+        job = VerificationJob(
+            name="Cement",
+            module_path=MODULE_PATH,
+            class_name="Cement",
+            vectors=[
+                TestVector(outcome=5, expected={"clay_demand": 1.88}),
+                TestVector(outcome=137, expected={"clay_demand": 51.38}),
+            ],
+        )
+        self.assertEqual(verify_module(job), [])
+
+    def test_verify_module_mismatch(self) -> None:
+        """Check that mismatches are reported"""
+        job = VerificationJob(
+            name="Cement",
+            module_path=MODULE_PATH,
+            class_name="Cement",
+            vectors=[TestVector(outcome=5, expected={"clay_demand": 2})],
+        )
+        errors = verify_module(job)
+        self.assertEqual(len(errors), 1)
+        self.assertIn("clay_demand", errors[0])
+        # A higher tolerance accepts the value
+        self.assertEqual(verify_module(job, tolerance=0.2), [])
+
+    def test_verify_industries(self) -> None:
+        """Check that the industries are verified in parallel"""
+        good = VerificationJob(
+            name="Good",
+            module_path=MODULE_PATH,
+            class_name="Cement",
+            vectors=[TestVector(outcome=5, expected={"clay_demand": 1.88})],
+        )
+        bad = VerificationJob(
+            name="Bad",
+            module_path=MODULE_PATH,
+            class_name="Cement",
+            vectors=[TestVector(outcome=5, expected={"clay_demand": 0})],
+        )
+        verify_industries([good, good])
+        with self.assertRaises(VerificationError) as context:
+            verify_industries([good, bad])
+        self.assertIn("Bad", str(context.exception))
+        self.assertNotIn("Good", str(context.exception))
+        self.assertEqual(context.exception.failed, ["Bad"])
+
+    def test_failed_build(self) -> None:
+        """Check that the build fails and its module is removed"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            sources = os.path.join(tmp_dir, "Sources")
+            shutil.copytree("Sources/Cement", os.path.join(sources, "Cement"))
+            meta_path = os.path.join(sources, "Cement", "meta.yaml")
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = f.read()
+            with open(meta_path, "w", encoding="utf-8") as f:
+                f.write(meta.replace("[1.88, 51.38]", "[1.88, 52.38]"))
+            output = os.path.join(tmp_dir, "industries")
+            os.mkdir(output)
+
+            with patch.dict(
+                os.environ, {"INDUSTRIES_PATH": sources, "YAML_CACHE_PATH": ""}
+            ), patch("main.INDUSTRIES_FINAL_PATH", output), patch(
+                "traceback.print_exc"
+            ):
+                with self.assertRaises(SystemExit) as context:
+                    main([])
+            self.assertEqual(context.exception.code, 1)
+            self.assertEqual(os.listdir(output), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
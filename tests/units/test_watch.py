@@ -0,0 +1,94 @@
+"""watch testing module"""
+
+import os
+import tempfile
+import threading
+import unittest
+
+from idr_iisim.utils.watch import (  # type:ignore # pylint: disable=import-error
+    FileWatcher,
+    affected_industries,
+)
+
+
+class TestWatch(unittest.TestCase):
+    """Test the watch of the source files"""
+
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()  # pylint: disable=R1732
+        self.sources = os.path.join(self.tmp_dir.name, "Sources")
+        os.makedirs(os.path.join(self.sources, "Cement", "images"))
+        self.write(os.path.join(self.sources, "Cement", "meta.yaml"))
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def write(self, path: str, mtime: int = 0) -> None:
+        """Write a file with a modification time"""
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("name: test\n")
+        os.utime(path, ns=(mtime, mtime))
+
+    def test_poll(self) -> None:
+        """Check that the created, modified and removed files are found"""
+        watcher = FileWatcher([(self.sources, "*.yaml")])
+        self.assertEqual(watcher.poll(), set())
+
+        meta = os.path.join(self.sources, "Cement", "meta.yaml")
+        oven = os.path.join(self.sources, "Cement", "oven.yaml")
+        self.write(meta, 10**9)
+        self.write(oven)
+        self.write(os.path.join(self.sources, "Cement", "images", "a.png"))
+        self.assertEqual(watcher.poll(), {meta, oven})
+        os.remove(oven)
+        self.assertEqual(watcher.poll(), {oven})
+
+    def test_wait_debounce(self) -> None:
+        """Check that a burst of changes is reported at once"""
+        watcher = FileWatcher(
+            [(self.sources, "*.yaml")], interval=0.01, debounce=0.05
+        )
+        paths = [
+            os.path.join(self.sources, "Cement", f"{name}.yaml")
+            for name in ["pre", "oven", "milling"]
+        ]
+        for path in paths:
+            self.write(path)
+        self.assertEqual(watcher.wait(), set(paths))
+
+        stop = threading.Event()
+        stop.set()
+        self.assertEqual(watcher.wait(stop), set())
+
+    def test_affected_industries(self) -> None:
+        """Check the industries affected by some changes"""
+        self.directories = {
+            "Cement": os.path.join(self.sources, "Cement"),
+            "Steel": os.path.join(self.sources, "Steel"),
+        }
+        self.assertEqual(
+            affected_industries(
+                {
+                    os.path.join(self.sources, "Cement", "meta.yaml"),
+                    os.path.join(self.sources, "Steel", "oven", "oven.yaml"),
+                },
+                self.directories,
+            ),
+            {"Cement", "Steel"},
+        )
+        # a new industry
+        self.assertIsNone(
+            affected_industries(
+                {os.path.join(self.sources, "Glass", "meta.yaml")},
+                self.directories,
+            )
+        )
+        self.assertIsNone(
+            affected_industries(
+                {
+                    os.path.join(self.sources, "Cement", "meta.yaml"),
+                    "templates/template_generated_getter.txt",
+                },
+                self.directories,
+            )
+        )